@@ -1,4 +1,5 @@
 import os
+import json
 import asyncio
 import uuid
 from datetime import datetime
@@ -7,15 +8,18 @@ from typing import List, Dict, Optional, Any
 from fastapi import FastAPI, HTTPException, Request, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import JSONResponse, FileResponse, StreamingResponse
 from pydantic import BaseModel
 
 # Modül yolunu ekle
 import sys
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+from src.models.errors import LLMError
 from src.models.ollama import OllamaAdapter
 from src.team_manager import TeamManager
+from src.utils import codec
+from src.utils.transfer import gzip_lines
 
 # Kullanılabilir modeller
 AVAILABLE_MODELS = [
@@ -27,12 +31,18 @@ AVAILABLE_MODELS = [
     "llama3.1:latest"
 ]
 
+# Yanıtları JSON_CODEC ile seçilen hızlı kodlayıcıyla (orjson/msgspec, yoksa json) yazar
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return codec.dumps(content)
+
 # API oluştur
 app = FastAPI(
     title="Agentic Team API", 
     version="1.0.0",
     docs_url="/api/docs",
-    redoc_url="/api/redoc"
+    redoc_url="/api/redoc",
+    default_response_class=FastJSONResponse
 )
 
 # CORS ayarları
@@ -51,10 +61,26 @@ app.mount("/favicon.ico", StaticFiles(directory="src/ui/build"), name="favicon")
 app.mount("/logo192.png", StaticFiles(directory="src/ui/build"), name="logo192")
 app.mount("/logo512.png", StaticFiles(directory="src/ui/build"), name="logo512")
 
+# LLM hatalarını türlerine göre HTTP durum koduna çevir (hata sınıfının status_code alanı)
+@app.exception_handler(LLMError)
+async def llm_error_handler(request: Request, exc: LLMError):
+    # Kuyruk dolu (429), devre açık (503), zaman aşımı (504), model yok (404), sunucu hatası (502);
+    # bekleme süresi olan hatalarda Retry-After başlığı eklenir
+    headers = {}
+    retry_after = getattr(exc, "retry_after", None)
+    if retry_after is not None:
+        headers["Retry-After"] = str(int(max(1, retry_after)))
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": str(exc), "model": exc.model, "error_type": type(exc).__name__},
+        headers=headers
+    )
+
 # Global değişkenler
 ollama_adapter = None
 team_manager = None
 available_models = []
+warmup_started = False
 
 # Pydantic modelleri
 class TeamCreate(BaseModel):
@@ -65,6 +91,8 @@ class AgentCreate(BaseModel):
     name: str
     role: str
     model: str
+    # LLM sunucusu adı (boşsa varsayılan Ollama)
+    backend: Optional[str] = None
 
 class TaskCreate(BaseModel):
     name: Optional[str] = None
@@ -84,16 +112,23 @@ class DocumentUpload(BaseModel):
     content: str
     type: str = "text"
 
+class GenerateRequest(BaseModel):
+    model: str
+    prompt: str
+    system_prompt: Optional[str] = None
+    temperature: float = 0.7
+    max_tokens: Optional[int] = None
+    backend: Optional[str] = None
+
 # API başlatma fonksiyonu
 async def initialize_api():
-    global ollama_adapter, team_manager, available_models
+    global ollama_adapter, team_manager, available_models, warmup_started
     
     try:
         if ollama_adapter is None:
             print("Ollama API başlatılıyor...")
-            ollama_base_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
-            ollama_adapter = OllamaAdapter(base_url=ollama_base_url)
-            print(f"Ollama API başlatıldı: {ollama_base_url}")
+            # Adres(ler) OLLAMA_BASE_URL / OLLAMA_BASE_URLS çevre değişkenlerinden okunur
+            ollama_adapter = OllamaAdapter()
             
             # Mevcut modelleri al
             try:
@@ -136,6 +171,28 @@ async def initialize_api():
         available_models = AVAILABLE_MODELS
         print("Varsayılan model listesi kullanılıyor")
 
+    # Takımlarda kullanılan modelleri arka planda ön yükle, yüklü modelleri ve model listesini izle
+    if ollama_adapter is not None and not warmup_started:
+        warmup_started = True
+        ollama_adapter.warmup.start(team_manager.referenced_models())
+        ollama_adapter.registry.start()
+
+# Uygulama açılırken modelleri ön yükle (ilk kullanıcı isteği model yüklemesini beklemesin)
+@app.on_event("startup")
+async def startup_api():
+    await initialize_api()
+
+# Uygulama kapanırken HTTP bağlantı havuzunu kapat
+@app.on_event("shutdown")
+async def shutdown_api():
+    if team_manager is not None:
+        # Bekleyen kayıtları diske yaz
+        await asyncio.to_thread(team_manager.flush)
+    if team_manager is not None and team_manager.backends is not None:
+        await team_manager.backends.aclose()
+    if ollama_adapter is not None:
+        await ollama_adapter.aclose()
+
 # Ana React uygulaması için index.html'i döndür
 @app.get("/", include_in_schema=False)
 async def serve_spa():
@@ -158,11 +215,137 @@ async def check_task_status(task_id: str):
     await initialize_api()
     return team_manager.check_task_status(task_id)
 
+# Görevin log geçmişi: cursor ile sayfa sayfa (ilk sayfa cursor=0, sonraki sayfa yanıttaki next_cursor)
+@app.get("/api/tasks/{task_id}/logs")
+async def get_task_logs(task_id: str, cursor: int = 0, limit: int = 100):
+    await initialize_api()
+    page = await team_manager.get_task_logs(task_id, cursor, limit)
+    if page is None:
+        raise HTTPException(status_code=404, detail="Görev bulunamadı")
+    return FastJSONResponse(page)
+
+# Görevin LLM token/süre kullanımı
+@app.get("/api/tasks/{task_id}/usage")
+async def get_task_usage(task_id: str):
+    await initialize_api()
+    usage = team_manager.get_task_usage(task_id)
+    if usage is None:
+        raise HTTPException(status_code=404, detail="Görev bulunamadı")
+    return usage
+
 # Mevcut modelleri listele
 @app.get("/api/models")
 async def list_models():
     await initialize_api()
-    return {"models": available_models}
+    if ollama_adapter is None:
+        return {"models": available_models}
+    return {"models": await ollama_adapter.list_models()}
+
+# Model indeksi: boyut, aile, bağlam uzunluğu ve bellekte olma durumu
+@app.get("/api/llm/models")
+async def llm_model_registry():
+    await initialize_api()
+    if ollama_adapter is None:
+        return {"ready": False, "models": {}}
+    return ollama_adapter.registry_stats()
+
+# LLM yanıt önbelleği istatistikleri
+@app.get("/api/llm/cache")
+async def llm_cache_stats():
+    await initialize_api()
+    if ollama_adapter is None:
+        return {"enabled": False}
+    return ollama_adapter.cache_stats()
+
+# Bellekte olan modeller ve ön yükleme durumu
+@app.get("/api/llm/residency")
+async def llm_residency_stats():
+    await initialize_api()
+    if ollama_adapter is None:
+        return {}
+    return ollama_adapter.residency_stats()
+
+# Ollama sunucu havuzunun durumu
+@app.get("/api/llm/backends")
+async def llm_backend_stats():
+    await initialize_api()
+    if ollama_adapter is None:
+        return {"backends": []}
+    drivers = [
+        backend.stats() for backend in team_manager.backends.backends.values() if backend is not ollama_adapter
+    ] if team_manager.backends is not None else []
+    return {
+        "backends": ollama_adapter.backend_stats(),
+        "retry_budget": ollama_adapter.retry_stats(),
+        "drivers": drivers,
+    }
+
+# Model başına kuyruk derinliği ve bekleme süreleri
+@app.get("/api/llm/queues")
+async def llm_queue_stats():
+    await initialize_api()
+    if ollama_adapter is None:
+        return {"models": {}}
+    return {"models": ollama_adapter.queue_stats()}
+
+# Embedding isteklerinin ve vektör önbelleğinin istatistikleri
+@app.get("/api/llm/embeddings")
+async def llm_embedding_stats():
+    await initialize_api()
+    if ollama_adapter is None:
+        return {"enabled": False}
+    return ollama_adapter.embedding_stats()
+
+# Model başına token ve süre kullanımı
+@app.get("/api/llm/usage")
+async def llm_usage_stats():
+    await initialize_api()
+    if ollama_adapter is None:
+        return {"models": {}}
+    return {"models": ollama_adapter.usage_stats()}
+
+# Son LLM çağrılarının izleri ve iz istatistikleri
+@app.get("/api/llm/traces")
+async def llm_traces(limit: int = 50):
+    await initialize_api()
+    if ollama_adapter is None:
+        return {"stats": {}, "traces": []}
+    return {"stats": ollama_adapter.trace_stats(), "traces": ollama_adapter.recent_traces(limit)}
+
+# Birleştirilen (single-flight) LLM isteklerinin istatistikleri
+@app.get("/api/llm/inflight")
+async def llm_inflight_stats():
+    await initialize_api()
+    if ollama_adapter is None:
+        return {"enabled": False}
+    return ollama_adapter.inflight_stats()
+
+# Metni token token üret (NDJSON stream)
+@app.post("/api/generate/stream")
+async def generate_stream(request: GenerateRequest):
+    await initialize_api()
+    if ollama_adapter is None:
+        raise HTTPException(status_code=503, detail="Ollama API kullanılamıyor")
+    try:
+        backend = team_manager.backends.get(request.backend) if team_manager.backends is not None else ollama_adapter
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    async def token_stream():
+        try:
+            async for token in backend.generate_stream(
+                model=request.model,
+                prompt=request.prompt,
+                system_prompt=request.system_prompt,
+                temperature=request.temperature,
+                max_tokens=request.max_tokens
+            ):
+                yield json.dumps({"token": token, "done": False}, ensure_ascii=False) + "\n"
+            yield json.dumps({"token": "", "done": True}) + "\n"
+        except Exception as e:
+            yield json.dumps({"error": str(e), "error_type": type(e).__name__, "done": True}, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(token_stream(), media_type="application/x-ndjson")
 
 # Takımları listele
 @app.get("/api/teams")
@@ -174,7 +357,8 @@ async def list_teams():
             team = team_manager.get_team(team_id)
             if team:
                 teams.append(team)
-    return {"teams": teams}
+    # Büyük listeler jsonable_encoder'dan geçmeden doğrudan kodlanır
+    return FastJSONResponse({"teams": teams})
 
 # Yeni takım oluştur
 @app.post("/api/teams/create")
@@ -201,6 +385,21 @@ async def get_team(team_id: str):
         raise HTTPException(status_code=404, detail="Takım bulunamadı")
     return team
 
+# Takımın LLM token/süre kullanımı
+@app.get("/api/teams/{team_id}/usage")
+async def get_team_usage(team_id: str):
+    await initialize_api()
+    usage = team_manager.get_team_usage(team_id)
+    if usage is None:
+        raise HTTPException(status_code=404, detail="Takım bulunamadı")
+    return usage
+
+# Ajanın LLM token/süre kullanımı
+@app.get("/api/agents/{agent_id}/usage")
+async def get_agent_usage(agent_id: str):
+    await initialize_api()
+    return team_manager.get_agent_usage(agent_id)
+
 # Takıma ait görevleri getir 
 @app.get("/api/teams/{team_id}/tasks")
 async def get_team_tasks(team_id: str):
@@ -220,7 +419,7 @@ async def get_team_tasks(team_id: str):
         print(f"Takım görevleri getirilirken hata: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Görevler getirilemedi: {str(e)}")
     
-    return {"tasks": tasks}
+    return FastJSONResponse({"tasks": tasks})
 
 # Takımı sil
 @app.delete("/api/teams/{team_id}")
@@ -242,20 +441,26 @@ async def add_agent(team_id: str, agent: AgentCreate):
     team = team_manager.get_team(team_id)
     if not team:
         raise HTTPException(status_code=404, detail="Takım bulunamadı")
+
+    # Pull edilmemiş model için ModelNotFoundError (404) döner
+    if ollama_adapter is not None and not agent.backend:
+        ollama_adapter.registry.ensure_available(agent.model)
     
     try:
         agent_id = team_manager.add_agent_to_team(
             team_id=team_id, 
             name=agent.name, 
             role=agent.role, 
-            model_name=agent.model
+            model_name=agent.model,
+            backend=agent.backend
         )
         print(f"Ajan başarıyla eklendi: {agent.name} ({agent_id}) -> Takım: {team_id}")
         return {
             "id": agent_id, 
             "name": agent.name, 
             "role": agent.role, 
-            "model": agent.model
+            "model": agent.model,
+            "backend": agent.backend
         }
     except Exception as e:
         print(f"Ajan eklenirken hata: {str(e)}")
@@ -270,7 +475,7 @@ async def list_tasks():
         task = team_manager.get_task(task_id)
         if task:
             tasks.append(task)
-    return {"tasks": tasks}
+    return FastJSONResponse({"tasks": tasks})
 
 # Yeni görev oluştur
 @app.post("/api/tasks/create")
@@ -307,7 +512,7 @@ async def get_task(task_id: str):
     task = team_manager.get_task(task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Görev bulunamadı")
-    return task
+    return FastJSONResponse(task)
 
 # Görevi sil
 @app.delete("/api/tasks/{task_id}")
@@ -380,7 +585,7 @@ async def list_documents(task_id: str):
         raise HTTPException(status_code=404, detail="Görev bulunamadı")
     
     documents = team_manager.list_documents(task_id)
-    return {"documents": documents}
+    return FastJSONResponse({"documents": documents})
 
 # Doküman detayları
 @app.get("/api/tasks/{task_id}/documents/{document_id}")
@@ -576,6 +781,44 @@ async def execute_code(task_id: str, request: Request):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Kod çalıştırılırken hata oluştu: {str(e)}")
 
+# Tüm veriyi NDJSON olarak dışa aktar (görevler tek tek okunup akış halinde yazılır)
+@app.get("/api/data/export")
+async def export_data(compress: bool = True):
+    await initialize_api()
+    # Bekleyen kayıtlar önce diske yazılır
+    lines = await team_manager.export_data()
+    filename = f"agentic-export-{datetime.now().strftime('%Y%m%d-%H%M%S')}.ndjson"
+    if compress:
+        lines = gzip_lines(lines)
+        filename += ".gz"
+    return StreamingResponse(
+        lines,
+        media_type="application/gzip" if compress else "application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+# NDJSON(.gz) dışa aktarımını içe aktar (mevcut verinin yerini alır)
+@app.post("/api/data/import")
+async def import_data(request: Request):
+    await initialize_api()
+    import tempfile
+
+    # Gövde belleğe alınmadan geçici dosyaya yazılır; disk yazımı olay döngüsünü bekletmez
+    f = await asyncio.to_thread(tempfile.NamedTemporaryFile, suffix=".ndjson", delete=False)
+    path = f.name
+    try:
+        try:
+            async for chunk in request.stream():
+                await asyncio.to_thread(f.write, chunk)
+        finally:
+            await asyncio.to_thread(f.close)
+        counts = await team_manager.import_data(path)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        os.remove(path)
+    return {"message": "İçe aktarma tamamlandı", "counts": counts}
+
 # Tüm diğer UI yolları için index.html'i döndür - React routing için
 @app.get("/{full_path:path}", include_in_schema=False)
 async def catch_all(full_path: str):
@@ -241,7 +241,7 @@ async def main():
         print(f"Görev yürütme sırasında hata: {e}")
     
     # Ollama adapter'ı kapat
-    ollama_adapter.close()
+    await ollama_adapter.aclose()
     
     print("\nÖrnek uygulama tamamlandı!")
 
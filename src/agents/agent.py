@@ -3,7 +3,9 @@ import uuid
 from typing import Any, Dict, List, Optional, Set, Tuple, Union
 
 from src.models.base import Conversation, Message, ModelCapability
-from src.models.ollama import OllamaAdapter
+from src.models.continuation import Continuation
+from src.models.llm_backend import LLMBackend
+from src.models.profiles import profile_for_role
 from src.models.team import AgentConfig, AgentRole, Task, SubTask
 
 
@@ -62,7 +64,7 @@ class Agent:
     def __init__(
         self,
         config: AgentConfig,
-        ollama_adapter: OllamaAdapter,
+        llm_backend: LLMBackend,
         conversation: Optional[Conversation] = None
     ):
         self.id = config.id
@@ -71,8 +73,10 @@ class Agent:
         self.model_name = config.model_name
         self.system_prompt = config.system_prompt
         self.required_capabilities = config.required_capabilities
-        self.ollama_adapter = ollama_adapter
+        self.llm_backend = llm_backend
         self.conversation = conversation or Conversation()
+        # Ollama KV bağlamı: sonraki turlar yalnızca yeni mesajın token'larını öder
+        self.continuation = Continuation()
         
         # Rolü belirten sistem mesajını ekle
         self._add_system_prompt()
@@ -81,21 +85,44 @@ class Agent:
         """Sistem komutunu sohbete ekler"""
         self.conversation.clear()
         self.conversation.add_message("system", self.system_prompt)
+        self.continuation.reset()
 
-    async def process_task(self, task: Union[Task, SubTask]) -> str:
-        """Görevi işler ve sonuç döndürür"""
-        prompt = self._create_task_prompt(task)
+    async def respond(self, prompt: str) -> str:
+        """Sohbete yeni bir kullanıcı mesajı ekler ve yanıt üretir
+
+        Sunucu KV bağlamı döndürdüğü sürece yalnızca yeni mesaj önceki
+        turun bağlamıyla gönderilir. Desteklenmiyorsa tüm sohbet, prefix'i
+        değişmeden (sistem komutu başta, geçmiş aynen) /api/chat'e
+        gönderilir; böylece Ollama'nın prompt önbelleği yine isabet eder.
+        """
         self.conversation.add_message("user", prompt)
-        
-        response = await self.ollama_adapter.generate(
-            model_name=self.model_name,
-            prompt="",  # conversation kullanırken boş olabilir
-            conversation=self.conversation,
-            temperature=0.7
-        )
-        
+        try:
+            if self.continuation.supported:
+                response = await self.llm_backend.generate(
+                    model=self.model_name,
+                    prompt=prompt,
+                    system_prompt=self.system_prompt,
+                    profile=profile_for_role(self.role, self.llm_backend.profiles),
+                    continuation=self.continuation
+                )
+            else:
+                response = await self.llm_backend.generate(
+                    model=self.model_name,
+                    prompt=prompt,
+                    conversation=self.conversation,
+                    profile=profile_for_role(self.role, self.llm_backend.profiles)
+                )
+        except Exception:
+            # Yanıtsız kalan mesaj sonraki turların prefix'ini bozmasın
+            self.conversation.messages.pop()
+            raise
+
         self.conversation.add_message("assistant", response)
         return response
+
+    async def process_task(self, task: Union[Task, SubTask]) -> str:
+        """Görevi işler ve sonuç döndürür"""
+        return await self.respond(self._create_task_prompt(task))
     
     def _create_task_prompt(self, task: Union[Task, SubTask]) -> str:
         """Görev için prompt oluşturur"""
@@ -121,6 +148,6 @@ Bu alt görevi kendi rolün çerçevesinde ele al. Belirtilen gereksinimlerine u
 """
 
 
-def create_agent_from_config(config: AgentConfig, ollama_adapter: OllamaAdapter) -> Agent:
+def create_agent_from_config(config: AgentConfig, llm_backend: LLMBackend) -> Agent:
     """Yapılandırmadan bir ajan oluşturur"""
-    return Agent(config, ollama_adapter) 
\ No newline at end of file
+    return Agent(config, llm_backend) 
\ No newline at end of file
@@ -47,7 +47,7 @@ async def get_model_capabilities(
     model_name: str, team_manager: TeamManager = Depends(get_team_manager)
 ):
     """Model yeteneklerini döndürür"""
-    if model_name not in team_manager.available_models:
+    if not team_manager.is_model_available(model_name):
         raise HTTPException(status_code=404, detail=f"Model bulunamadı: {model_name}")
         
     capabilities = await team_manager.get_model_capabilities(model_name)
@@ -126,7 +126,8 @@ async def add_agent_to_team(
             role=request.role,
             model_name=request.model_name,
             system_prompt=request.system_prompt,
-            required_capabilities=request.required_capabilities
+            required_capabilities=request.required_capabilities,
+            backend=request.backend
         )
         return {"agent_id": agent_id}
     except ValueError as e:
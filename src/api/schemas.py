@@ -38,6 +38,7 @@ class AddAgentRequest(BaseModel):
     name: str = Field(..., description="Ajan adı")
     role: AgentRole = Field(..., description="Ajan rolü")
     model_name: str = Field(..., description="Kullanılacak LLM modeli")
+    backend: Optional[str] = Field(None, description="LLM sunucusu adı (boşsa varsayılan Ollama)")
     system_prompt: Optional[str] = Field(None, description="Özel sistem komutu")
     required_capabilities: Optional[Set[ModelCapability]] = Field(
         None, description="Gerekli model yetenekleri"
@@ -8,6 +8,7 @@ from pydantic import BaseModel, Field
 
 from src.agents.agent import Agent, ROLE_SYSTEM_PROMPTS, create_agent_from_config
 from src.models.base import ModelCapability
+from src.models.llm_backend import BackendRouter
 from src.models.ollama import OllamaAdapter, get_model_info_from_map
 from src.models.team import AgentConfig, AgentRole, SubTask, Task, TeamConfig, TeamType
 from src.utils.helpers import generate_id, load_env_models
@@ -16,8 +17,10 @@ from src.utils.helpers import generate_id, load_env_models
 class TeamManager:
     """Ekip yönetimi ve görev atama sınıfı"""
 
-    def __init__(self, ollama_adapter: OllamaAdapter):
+    def __init__(self, ollama_adapter: OllamaAdapter, backends: Optional[BackendRouter] = None):
         self.ollama_adapter = ollama_adapter
+        # Ajan bazlı seçilebilen LLM sunucuları (varsayılan: ollama_adapter)
+        self.backends = backends or BackendRouter.from_env(ollama_adapter)
         self.teams: Dict[str, Dict[str, Any]] = {}  # team_id -> team bilgileri
         self.agents: Dict[str, Agent] = {}  # agent_id -> Agent nesnesi
         self.tasks: Dict[str, Task] = {}  # task_id -> Task nesnesi
@@ -40,6 +43,13 @@ class TeamManager:
             print(f"Modeller yüklenirken hata oluştu: {e}")
             return self.available_models
 
+    def is_model_available(self, model_name: str) -> bool:
+        """Modelin pull edilmiş olup olmadığını HTTP çağrısı yapmadan kontrol eder"""
+        registry = self.ollama_adapter.registry
+        if registry.ready:
+            return registry.has(model_name)
+        return model_name in self.available_models
+
     def create_team(
         self, 
         name: str, 
@@ -71,13 +81,18 @@ class TeamManager:
         role: AgentRole,
         model_name: str,
         system_prompt: Optional[str] = None,
-        required_capabilities: Optional[Set[ModelCapability]] = None
+        required_capabilities: Optional[Set[ModelCapability]] = None,
+        backend: Optional[str] = None
     ) -> str:
-        """Ekibe yeni bir ajan ekler"""
+        """Ekibe yeni bir ajan ekler (backend boşsa varsayılan Ollama sunucusu kullanılır)"""
         if team_id not in self.teams:
             raise ValueError(f"Ekip bulunamadı: {team_id}")
-            
-        if not model_name in self.available_models:
+
+        # Bilinmeyen sunucu adı için ValueError
+        llm_backend = self.backends.get(backend)
+
+        # Model listesi yalnızca Ollama için tutulur
+        if llm_backend is self.ollama_adapter and not self.is_model_available(model_name):
             available_models_str = ", ".join(self.available_models)
             raise ValueError(f"Model mevcut değil. Mevcut modeller: {available_models_str}")
         
@@ -113,11 +128,12 @@ class TeamManager:
             role=role,
             model_name=model_name,
             system_prompt=system_prompt,
-            required_capabilities=required_capabilities
+            required_capabilities=required_capabilities,
+            backend=backend
         )
         
         # Ajan nesnesini oluştur
-        agent = create_agent_from_config(agent_config, self.ollama_adapter)
+        agent = create_agent_from_config(agent_config, llm_backend)
         
         # Ekip yapılandırmasına ekle
         team_config = self.teams[team_id]["config"]
@@ -144,7 +144,7 @@ async def main():
 
     # Temizlik
     print("\nKaynakları temizleme...")
-    ollama_adapter.close()
+    await ollama_adapter.aclose()
     print("Tamamlandı!")
 
 
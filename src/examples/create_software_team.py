@@ -140,7 +140,7 @@ async def main():
 
     # Temizlik
     print("\nKaynakları temizleme...")
-    ollama_adapter.close()
+    await ollama_adapter.aclose()
     print("Tamamlandı!")
 
 
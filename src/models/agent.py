@@ -3,11 +3,12 @@ from typing import Dict, Optional
 import uuid
 
 class Agent:
-    def __init__(self, name: str, role: str, model: str):
+    def __init__(self, name: str, role: str, model: str, backend: Optional[str] = None):
         self.id = str(uuid.uuid4())
         self.name = name
         self.role = role  # developer, tester, product_manager, project_manager
         self.model = model
+        self.backend = backend  # LLM sunucusu adı (None = varsayılan Ollama)
         self.created_at = datetime.now().isoformat()
         self.updated_at = datetime.now().isoformat()
 
@@ -18,6 +19,7 @@ class Agent:
             "name": self.name,
             "role": self.role,
             "model": self.model,
+            "backend": self.backend,
             "created_at": self.created_at,
             "updated_at": self.updated_at
         }
@@ -28,7 +30,8 @@ class Agent:
         agent = cls(
             name=data["name"],
             role=data["role"],
-            model=data["model"]
+            model=data["model"],
+            backend=data.get("backend")
         )
         agent.id = data["id"]
         agent.created_at = data["created_at"]
@@ -0,0 +1,248 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
+
+import httpx
+
+from src.models.errors import CircuitOpenError, LLMConnectionError, LLMError, LLMResponseError, LLMTimeoutError
+from src.models.resilience import CircuitBreaker
+
+
+def normalize_model_name(model: str) -> str:
+    """Etiketsiz model adlarını Ollama'nın kullandığı "ad:latest" biçimine getirir"""
+    return model if ":" in model else f"{model}:latest"
+
+
+class OllamaBackend:
+    """Havuzdaki tek bir Ollama sunucusu"""
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: httpx.Timeout,
+        limits: httpx.Limits,
+        failure_threshold: int = 3,
+        ejection_seconds: float = 30.0,
+        model_failure_threshold: int = 3,
+        model_reset_seconds: float = 30.0
+    ):
+        self.base_url = base_url
+        self.client = httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits)
+        self.outstanding = 0
+        # Bu sunucuda bellekte olduğu bilinen modeller
+        self.loaded_models: Set[str] = set()
+        # Sunucu geneli devre kesici (bağlantı hataları)
+        self.breaker = CircuitBreaker(failure_threshold, ejection_seconds)
+        # Model başına devre kesiciler (zaman aşımı, 5xx, model yükleme hataları)
+        self.model_breakers: Dict[str, CircuitBreaker] = {}
+        self._model_failure_threshold = model_failure_threshold
+        self._model_reset_seconds = model_reset_seconds
+        self.requests = 0
+        self.failures = 0
+
+    def model_breaker(self, model: str) -> CircuitBreaker:
+        model = normalize_model_name(model)
+        breaker = self.model_breakers.get(model)
+        if breaker is None:
+            breaker = CircuitBreaker(self._model_failure_threshold, self._model_reset_seconds)
+            self.model_breakers[model] = breaker
+        return breaker
+
+    def is_healthy(self, now: Optional[float] = None) -> bool:
+        """Sunucunun devresi açık değilse True"""
+        return self.breaker.available(now)
+
+    def accepts(self, model: Optional[str], now: Optional[float] = None) -> bool:
+        """Sunucu ve (verildiyse) model devresi çağrıya izin veriyorsa True"""
+        if not self.breaker.available(now):
+            return False
+        if model:
+            breaker = self.model_breakers.get(normalize_model_name(model))
+            return breaker is None or breaker.available(now)
+        return True
+
+    def retry_after(self, model: Optional[str], now: Optional[float] = None) -> float:
+        """Sunucunun bu model için tekrar çağrı kabul edeceği zamana kalan süre"""
+        wait = self.breaker.retry_after(now)
+        if model:
+            breaker = self.model_breakers.get(normalize_model_name(model))
+            if breaker is not None:
+                wait = max(wait, breaker.retry_after(now))
+        return wait
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "base_url": self.base_url,
+            "healthy": self.is_healthy(now),
+            "ejected_for_seconds": self.breaker.retry_after(now),
+            "outstanding": self.outstanding,
+            "loaded_models": sorted(self.loaded_models),
+            "requests": self.requests,
+            "failures": self.failures,
+            "consecutive_failures": self.breaker.consecutive_failures,
+            "circuit": self.breaker.stats(),
+            "model_circuits": {
+                model: breaker.stats()
+                for model, breaker in self.model_breakers.items()
+                if breaker.consecutive_failures
+            },
+        }
+
+
+def is_backend_failure(error: BaseException) -> bool:
+    """Hatanın sunucunun tamamının erişilemez olduğunu gösterip göstermediğini belirler"""
+    if isinstance(error, LLMTimeoutError):
+        return False
+    if isinstance(error, LLMConnectionError):
+        return True
+    return isinstance(error, httpx.TransportError) and not isinstance(error, httpx.TimeoutException)
+
+
+def is_model_failure(error: BaseException) -> bool:
+    """Hatanın sunucudaki modelin sağlığıyla ilgili olup olmadığını belirler
+
+    Zaman aşımları, 5xx yanıtlar ve stream içinde dönen sunucu hataları
+    model sorunudur; 4xx yanıtlar (ör. model bulunamadı) isteğin
+    kendisiyle ilgilidir ve devreyi açmaz.
+    """
+    if isinstance(error, (LLMTimeoutError, httpx.TimeoutException, asyncio.TimeoutError)):
+        return True
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code >= 500
+    if isinstance(error, LLMResponseError):
+        return error.retryable
+    return False
+
+
+class BackendPool:
+    """Birden fazla Ollama sunucusu arasında model eğilimli yönlendirme
+
+    Seçim sırası: sağlıklı sunucular arasında modeli zaten yüklü olanlar
+    tercih edilir (model değişimi saniyeler sürer), sonra en az bekleyen
+    isteği olan seçilir. Art arda hata veren sunucu bir süre devre dışı
+    bırakılır (pasif sağlık kontrolü).
+    """
+
+    def __init__(
+        self,
+        base_urls: List[str],
+        timeout: httpx.Timeout,
+        limits: httpx.Limits,
+        failure_threshold: int = 3,
+        ejection_seconds: float = 30.0,
+        model_failure_threshold: int = 3,
+        model_reset_seconds: float = 30.0
+    ):
+        if not base_urls:
+            raise ValueError("En az bir Ollama sunucusu gerekli")
+        self.backends = [
+            OllamaBackend(
+                url,
+                timeout,
+                limits,
+                failure_threshold=failure_threshold,
+                ejection_seconds=ejection_seconds,
+                model_failure_threshold=model_failure_threshold,
+                model_reset_seconds=model_reset_seconds,
+            )
+            for url in base_urls
+        ]
+        self.failure_threshold = failure_threshold
+        self.ejection_seconds = ejection_seconds
+        self._round_robin = 0
+
+    def select(self, model: Optional[str] = None) -> OllamaBackend:
+        """İstek için en uygun sunucuyu seçer
+
+        Uygun sunucu kalmadıysa (tüm devreler açık) beklemeden
+        CircuitOpenError fırlatır.
+        """
+        now = time.monotonic()
+        candidates = [b for b in self.backends if b.accepts(model, now)]
+        if not candidates:
+            retry_after = min(b.retry_after(model, now) for b in self.backends)
+            raise CircuitOpenError(
+                f"{model or 'Ollama'} için tüm sunucuların devresi açık, "
+                f"{retry_after:.0f} saniye sonra tekrar denenecek",
+                model=model,
+                retry_after=max(1.0, retry_after)
+            )
+        if len(candidates) == 1:
+            return candidates[0]
+
+        if model:
+            model = normalize_model_name(model)
+            warm = [b for b in candidates if model in b.loaded_models]
+            if warm:
+                candidates = warm
+
+        # Eşitlik durumunda yükü dağıtmak için sırayı döndür
+        self._round_robin = (self._round_robin + 1) % len(candidates)
+        rotated = candidates[self._round_robin:] + candidates[:self._round_robin]
+        return min(rotated, key=lambda b: b.outstanding)
+
+    def record_success(self, backend: OllamaBackend, model: Optional[str] = None) -> None:
+        backend.breaker.record_success()
+        if model:
+            backend.model_breaker(model).record_success()
+            backend.loaded_models.add(normalize_model_name(model))
+
+    def record_failure(self, backend: OllamaBackend, error: BaseException, model: Optional[str] = None) -> None:
+        backend.failures += 1
+        if is_backend_failure(error):
+            if backend.breaker.record_failure():
+                backend.loaded_models.clear()
+                print(f"[WARN] Ollama sunucusu geçici olarak devre dışı: {backend.base_url}")
+        elif is_model_failure(error):
+            if model and backend.model_breaker(model).record_failure():
+                print(f"[WARN] {model} modeli {backend.base_url} üzerinde geçici olarak devre dışı")
+        elif isinstance(error, (httpx.HTTPError, LLMError)):
+            # İstek hatası (ör. 404): sunucu ayakta yanıt veriyor
+            backend.breaker.record_success()
+
+    @asynccontextmanager
+    async def use(self, model: Optional[str] = None) -> AsyncIterator[OllamaBackend]:
+        """Bir sunucu seçer, bekleyen istek sayısını ve devre durumunu izler"""
+        backend = self.select(model)
+        probes = [backend.breaker.on_dispatch()]
+        if model:
+            probes.append(backend.model_breaker(model).on_dispatch())
+        backend.outstanding += 1
+        backend.requests += 1
+        try:
+            yield backend
+        except Exception as e:
+            self.record_failure(backend, e, model)
+            raise
+        else:
+            self.record_success(backend, model)
+        finally:
+            backend.outstanding -= 1
+            if any(probes):
+                # İptal edilen deneme isteği devreyi yarı açık durumda kilitlemesin
+                backend.breaker.release_probe()
+                if model:
+                    backend.model_breaker(model).release_probe()
+
+    async def refresh_loaded_models(self) -> Dict[str, List[str]]:
+        """Her sunucunun /api/ps çıktısından yüklü model listesini günceller"""
+        async def refresh(backend: OllamaBackend) -> None:
+            try:
+                response = await backend.client.get("/api/ps")
+                response.raise_for_status()
+                backend.loaded_models = {m["name"] for m in response.json().get("models", [])}
+                self.record_success(backend)
+            except httpx.HTTPError as e:
+                self.record_failure(backend, e)
+
+        await asyncio.gather(*(refresh(b) for b in self.backends))
+        return {b.base_url: sorted(b.loaded_models) for b in self.backends}
+
+    async def aclose(self) -> None:
+        """Tüm sunucu istemcilerini kapatır"""
+        await asyncio.gather(*(b.client.aclose() for b in self.backends))
+
+    def stats(self) -> List[Dict[str, Any]]:
+        return [b.stats() for b in self.backends]
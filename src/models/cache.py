@@ -0,0 +1,205 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+def make_cache_key(endpoint: str, payload: Dict[str, Any]) -> str:
+    """İstek içeriğinden (model, endpoint, prompt/mesajlar, sistem komutu, örnekleme ayarları) anahtar üretir"""
+    # Stream bayrağı yanıtın içeriğini değiştirmez, anahtara dahil edilmez
+    material = {key: value for key, value in payload.items() if key != "stream"}
+    material["__endpoint__"] = endpoint
+    encoded = json.dumps(material, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """LLM yanıtları için iki katmanlı (bellek LRU + disk) önbellek"""
+
+    def __init__(
+        self,
+        directory: str = "data/llm_cache",
+        max_memory_entries: int = 256,
+        max_disk_bytes: int = 256 * 1024 * 1024,
+        ttl_seconds: Optional[float] = 7 * 24 * 3600,
+    ):
+        self.directory = directory
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.ttl_seconds = ttl_seconds
+
+        self._lock = threading.Lock()
+        # key -> (oluşturulma zamanı, değer)
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        # key -> (oluşturulma zamanı, dosya boyutu); disk katmanının indeksi
+        self._disk_index: "OrderedDict[str, Tuple[float, int]]" = OrderedDict()
+        self._disk_bytes = 0
+        self._disk_loaded = False
+
+        self.counters = {
+            "hits": 0,
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "memory_evictions": 0,
+            "disk_evictions": 0,
+            "expired": 0,
+            "writes": 0,
+        }
+
+    # ----- Yardımcılar -----
+
+    def _is_expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - created_at > self.ttl_seconds
+
+    def _path_for(self, key: str) -> str:
+        # Tek klasörde çok fazla dosya birikmesin diye iki harfli alt klasör kullan
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def _load_disk_index(self) -> None:
+        """Disk katmanındaki kayıtları (eskiden yeniye) indeksler"""
+        if self._disk_loaded:
+            return
+        self._disk_loaded = True
+        if not os.path.isdir(self.directory):
+            return
+
+        entries = []
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if not entry.name.endswith(".json"):
+                    continue
+                stat = entry.stat()
+                entries.append((stat.st_mtime, entry.name[:-5], stat.st_size))
+
+        for mtime, key, size in sorted(entries):
+            self._disk_index[key] = (mtime, size)
+            self._disk_bytes += size
+
+    def _remove_disk_entry(self, key: str) -> None:
+        _, size = self._disk_index.pop(key, (0, 0))
+        self._disk_bytes -= size
+        try:
+            os.remove(self._path_for(key))
+        except OSError:
+            pass
+
+    def _memory_put(self, key: str, created_at: float, value: str) -> None:
+        self._memory[key] = (created_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            self.counters["memory_evictions"] += 1
+
+    # ----- Senkron API -----
+
+    def get(self, key: str) -> Optional[str]:
+        """Önbellekteki yanıtı döndürür, yoksa None"""
+        now = time.time()
+        with self._lock:
+            item = self._memory.get(key)
+            if item is not None:
+                created_at, value = item
+                if not self._is_expired(created_at, now):
+                    self._memory.move_to_end(key)
+                    self.counters["hits"] += 1
+                    self.counters["memory_hits"] += 1
+                    return value
+                del self._memory[key]
+                self.counters["expired"] += 1
+
+            self._load_disk_index()
+            if key not in self._disk_index:
+                self.counters["misses"] += 1
+                return None
+
+            try:
+                with open(self._path_for(key), "r", encoding="utf-8") as f:
+                    record = json.load(f)
+            except (OSError, ValueError):
+                self._remove_disk_entry(key)
+                self.counters["misses"] += 1
+                return None
+
+            created_at = record.get("created_at", 0)
+            if self._is_expired(created_at, now):
+                self._remove_disk_entry(key)
+                self.counters["expired"] += 1
+                self.counters["misses"] += 1
+                return None
+
+            # Disk isabetini belleğe taşı
+            value = record["value"]
+            self._memory_put(key, created_at, value)
+            self.counters["hits"] += 1
+            self.counters["disk_hits"] += 1
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        """Yanıtı her iki katmana yazar"""
+        now = time.time()
+        data = json.dumps({"created_at": now, "value": value}, ensure_ascii=False).encode("utf-8")
+        with self._lock:
+            self._memory_put(key, now, value)
+            self._load_disk_index()
+
+            path = self._path_for(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+            if key in self._disk_index:
+                self._disk_bytes -= self._disk_index.pop(key)[1]
+            self._disk_index[key] = (now, len(data))
+            self._disk_bytes += len(data)
+            self.counters["writes"] += 1
+
+            # Boyut sınırını aşan en eski kayıtları sil
+            while self._disk_bytes > self.max_disk_bytes and len(self._disk_index) > 1:
+                oldest_key = next(iter(self._disk_index))
+                self._remove_disk_entry(oldest_key)
+                self.counters["disk_evictions"] += 1
+
+    def clear(self) -> None:
+        """Tüm önbelleği temizler"""
+        with self._lock:
+            self._memory.clear()
+            self._load_disk_index()
+            for key in list(self._disk_index.keys()):
+                self._remove_disk_entry(key)
+
+    def stats(self) -> Dict[str, Any]:
+        """İsabet/ıska/tahliye sayaçlarını ve doluluk bilgisini döndürür"""
+        with self._lock:
+            self._load_disk_index()
+            lookups = self.counters["hits"] + self.counters["misses"]
+            return {
+                **self.counters,
+                "hit_ratio": self.counters["hits"] / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "disk_entries": len(self._disk_index),
+                "disk_bytes": self._disk_bytes,
+            }
+
+    # ----- Asenkron API -----
+
+    async def aget(self, key: str) -> Optional[str]:
+        """get() işleminin olay döngüsünü bloklamayan sürümü"""
+        with self._lock:
+            item = self._memory.get(key)
+            in_memory = item is not None and not self._is_expired(item[0], time.time())
+        if in_memory:
+            return self.get(key)
+        return await asyncio.to_thread(self.get, key)
+
+    async def aset(self, key: str, value: str) -> None:
+        """set() işleminin olay döngüsünü bloklamayan sürümü"""
+        await asyncio.to_thread(self.set, key, value)
@@ -0,0 +1,54 @@
+from typing import Any, Dict, List, Optional
+
+
+class Continuation:
+    """Çok turlu oturumlar için Ollama KV bağlamı (continuation handle)
+
+    /api/generate yanıtındaki `context` dizisi, önceki turların
+    şablonlanmış prompt ve yanıt token'larını taşır. Sonraki istekte bu
+    dizi geri gönderildiğinde Ollama önbellekteki KV durumunu yeniden
+    kullanır ve yalnızca yeni prompt token'larını değerlendirir. Sistem
+    komutu ilk turda bağlama girdiği için sonraki turlarda tekrar
+    gönderilmez.
+
+    Sunucu `context` döndürmezse (ör. chat tabanlı modeller veya yeni
+    sürümler) supported False olur; çağıran taraf bu durumda tüm sohbeti
+    prefix'i bozmadan /api/chat ile göndermelidir.
+    """
+
+    def __init__(self):
+        self.context: Optional[List[int]] = None
+        self.supported = True
+        self.turns = 0
+        self.last_prompt_tokens = 0
+        self.total_prompt_tokens = 0
+
+    @property
+    def active(self) -> bool:
+        """Sonraki turda geri gönderilecek bir bağlam varsa True"""
+        return bool(self.context)
+
+    def update(self, context: Optional[List[int]], prompt_tokens: int = 0) -> None:
+        """Başarılı turdan dönen bağlamı saklar"""
+        self.turns += 1
+        self.last_prompt_tokens = prompt_tokens
+        self.total_prompt_tokens += prompt_tokens
+        if context:
+            self.context = list(context)
+        else:
+            self.context = None
+            self.supported = False
+
+    def reset(self) -> None:
+        """Bağlamı unutur (ör. sohbet temizlendiğinde)"""
+        self.context = None
+        self.supported = True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "supported": self.supported,
+            "turns": self.turns,
+            "context_tokens": len(self.context) if self.context else 0,
+            "last_prompt_tokens": self.last_prompt_tokens,
+            "total_prompt_tokens": self.total_prompt_tokens,
+        }
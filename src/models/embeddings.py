@@ -0,0 +1,158 @@
+import asyncio
+import hashlib
+import json
+import os
+import re
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+def content_hash(text: str) -> str:
+    """Metnin içerik özeti (vektör önbelleği anahtarı)"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _model_dir_name(model: str) -> str:
+    # "nomic-embed-text:latest" -> "nomic-embed-text_latest"
+    return re.sub(r"[^A-Za-z0-9._-]", "_", model)
+
+
+class _ModelVectors:
+    """Tek bir modelin diskteki vektörleri
+
+    vectors.f32: satır satır eklenen float32 matris (np.memmap ile okunur)
+    index.tsv:   "özet<TAB>satır" kayıtları (yalnızca sona eklenir)
+    meta.json:   vektör boyutu
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.vectors_path = os.path.join(directory, "vectors.f32")
+        self.index_path = os.path.join(directory, "index.tsv")
+        self.meta_path = os.path.join(directory, "meta.json")
+        self.dim: Optional[int] = None
+        self.rows: Dict[str, int] = {}
+        self.count = 0
+        self._mmap: Optional[np.memmap] = None
+        self._load()
+
+    def _load(self) -> None:
+        if not os.path.exists(self.meta_path):
+            return
+        with open(self.meta_path, "r", encoding="utf-8") as f:
+            self.dim = json.load(f)["dim"]
+
+        # Dosyada gerçekten bulunan satır sayısı; yarım kalmış yazımlar yok sayılır
+        row_bytes = self.dim * 4
+        size = os.path.getsize(self.vectors_path) if os.path.exists(self.vectors_path) else 0
+        self.count = size // row_bytes
+
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    parts = line.rstrip("\n").split("\t")
+                    if len(parts) != 2:
+                        continue
+                    row = int(parts[1])
+                    if row < self.count:
+                        self.rows[parts[0]] = row
+
+    def _map(self) -> Optional[np.memmap]:
+        """Vektör dosyasını (gerekirse yeniden) belleğe eşler"""
+        if self.count == 0:
+            return None
+        if self._mmap is None or self._mmap.shape[0] < self.count:
+            self._mmap = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(self.count, self.dim))
+        return self._mmap
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        row = self.rows.get(key)
+        if row is None:
+            return None
+        return np.array(self._map()[row], dtype=np.float32)
+
+    def add(self, items: List[Tuple[str, np.ndarray]]) -> None:
+        """Yeni vektörleri dosyaların sonuna ekler"""
+        items = [(key, vector) for key, vector in items if key not in self.rows]
+        if not items:
+            return
+
+        if self.dim is None:
+            self.dim = int(items[0][1].shape[0])
+            os.makedirs(self.directory, exist_ok=True)
+            with open(self.meta_path, "w", encoding="utf-8") as f:
+                json.dump({"dim": self.dim}, f)
+
+        matrix = np.stack([vector for _, vector in items]).astype(np.float32, copy=False)
+        if matrix.shape[1] != self.dim:
+            raise ValueError(f"Vektör boyutu uyuşmuyor: {matrix.shape[1]} != {self.dim}")
+
+        with open(self.vectors_path, "ab") as f:
+            f.write(matrix.tobytes())
+        lines = []
+        for offset, (key, _) in enumerate(items):
+            self.rows[key] = self.count + offset
+            lines.append(f"{key}\t{self.count + offset}\n")
+        with open(self.index_path, "a", encoding="utf-8") as f:
+            f.write("".join(lines))
+        self.count += len(items)
+
+
+class VectorCache:
+    """İçerik özetine göre anahtarlanan, bellek eşlemeli (memmap) vektör deposu
+
+    Değişmeyen metinler yeniden embed edilmez; vektörler model başına ayrı
+    dosyada tutulur ve diskten kopyalanmadan okunur.
+    """
+
+    def __init__(self, directory: str = "data/embeddings"):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._models: Dict[str, _ModelVectors] = {}
+        self.counters = {"hits": 0, "misses": 0, "writes": 0}
+
+    def _model(self, model: str) -> _ModelVectors:
+        store = self._models.get(model)
+        if store is None:
+            store = _ModelVectors(os.path.join(self.directory, _model_dir_name(model)))
+            self._models[model] = store
+        return store
+
+    def get_many(self, model: str, keys: Iterable[str]) -> Dict[str, np.ndarray]:
+        """Önbellekte bulunan vektörleri döndürür"""
+        found = {}
+        with self._lock:
+            store = self._model(model)
+            for key in keys:
+                vector = store.get(key)
+                if vector is None:
+                    self.counters["misses"] += 1
+                else:
+                    self.counters["hits"] += 1
+                    found[key] = vector
+        return found
+
+    def put_many(self, model: str, items: Dict[str, np.ndarray]) -> None:
+        """Vektörleri diske yazar"""
+        with self._lock:
+            self._model(model).add(list(items.items()))
+            self.counters["writes"] += len(items)
+
+    async def aget_many(self, model: str, keys: Iterable[str]) -> Dict[str, np.ndarray]:
+        return await asyncio.to_thread(self.get_many, model, list(keys))
+
+    async def aput_many(self, model: str, items: Dict[str, np.ndarray]) -> None:
+        await asyncio.to_thread(self.put_many, model, items)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self.counters,
+                "directory": self.directory,
+                "models": {
+                    model: {"dim": store.dim, "vectors": store.count}
+                    for model, store in self._models.items()
+                },
+            }
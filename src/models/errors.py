@@ -0,0 +1,101 @@
+import asyncio
+from typing import Optional
+
+import httpx
+
+
+class LLMError(Exception):
+    """LLM çağrıları için temel hata sınıfı"""
+
+    # API katmanında döndürülecek HTTP durum kodu
+    status_code = 502
+    # Aynı istek tekrar denenirse başarılı olabilir mi
+    retryable = False
+
+    def __init__(self, message: str, model: str = None):
+        super().__init__(message)
+        self.model = model
+
+
+class ModelOverloadedError(LLMError):
+    """Model için bekleme kuyruğu dolu; çağrı hemen reddedildi"""
+
+    status_code = 429
+
+    def __init__(self, message: str, model: str = None, retry_after: float = 1.0):
+        super().__init__(message, model=model)
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(LLMError):
+    """Sunucu veya model art arda hata verdiği için devre açık; çağrı hemen reddedildi"""
+
+    status_code = 503
+
+    def __init__(self, message: str, model: str = None, retry_after: float = 1.0):
+        super().__init__(message, model=model)
+        self.retry_after = retry_after
+
+
+class LLMTimeoutError(LLMError):
+    """Ollama belirlenen süre içinde yanıt vermedi"""
+
+    status_code = 504
+    retryable = True
+
+
+class LLMConnectionError(LLMError):
+    """Ollama sunucusuna bağlanılamadı"""
+
+    status_code = 502
+    retryable = True
+
+
+class ModelNotFoundError(LLMError):
+    """Model sunucuda yüklü (pull edilmiş) değil"""
+
+    status_code = 404
+
+
+class LLMResponseError(LLMError):
+    """Ollama hata yanıtı döndürdü (HTTP hata kodu veya stream içinde hata)"""
+
+    def __init__(self, message: str, model: str = None, upstream_status: Optional[int] = None):
+        super().__init__(message, model=model)
+        self.upstream_status = upstream_status
+        # Sunucu tarafı hatalar geçici olabilir, istek hataları değil
+        self.retryable = upstream_status is None or upstream_status >= 500
+
+
+def _is_model_not_found(message: str) -> bool:
+    return "not found" in message.lower()
+
+
+def error_from_message(message: str, model: str = None, upstream_status: Optional[int] = None) -> LLMError:
+    """Ollama'nın {"error": "..."} mesajını uygun hata tipine çevirir"""
+    if upstream_status == 404 or _is_model_not_found(message):
+        return ModelNotFoundError(message, model=model)
+    return LLMResponseError(message, model=model, upstream_status=upstream_status)
+
+
+def classify_error(error: BaseException, model: str = None) -> BaseException:
+    """httpx/asyncio hatalarını tipli LLM hatalarına çevirir; diğerlerini olduğu gibi döndürür"""
+    if isinstance(error, LLMError):
+        return error
+    if isinstance(error, (httpx.TimeoutException, asyncio.TimeoutError)):
+        return LLMTimeoutError(f"{model or 'Model'} zaman aşımına uğradı ({type(error).__name__})", model=model)
+    if isinstance(error, httpx.TransportError):
+        return LLMConnectionError(f"Ollama sunucusuna bağlanılamadı: {error}", model=model)
+    if isinstance(error, httpx.HTTPStatusError):
+        response = error.response
+        message = str(error)
+        try:
+            body = response.json().get("error") or message
+            # OpenAI uyumlu sunucular: {"error": {"message": "..."}}
+            if isinstance(body, dict):
+                body = body.get("message") or message
+            message = body
+        except (ValueError, AttributeError, httpx.ResponseNotRead):
+            pass
+        return error_from_message(message, model=model, upstream_status=response.status_code)
+    return error
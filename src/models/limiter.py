@@ -0,0 +1,142 @@
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+from src.models.backends import normalize_model_name
+from src.models.errors import ModelOverloadedError
+
+
+def parse_model_limits(value: str) -> Dict[str, int]:
+    """"model=limit,model2=limit" biçimindeki metni sözlüğe çevirir"""
+    limits = {}
+    for item in value.split(","):
+        if "=" not in item:
+            continue
+        name, limit = item.rsplit("=", 1)
+        if name.strip() and limit.strip():
+            limits[name.strip()] = int(limit)
+    return limits
+
+
+class _ModelSlot:
+    """Tek bir modelin eşzamanlılık durumu"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.semaphore = asyncio.Semaphore(limit)
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.last_wait = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "active": self.active,
+            "queue_depth": self.waiting,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "avg_wait_seconds": self.total_wait / self.admitted if self.admitted else 0.0,
+            "max_wait_seconds": self.max_wait,
+            "last_wait_seconds": self.last_wait,
+        }
+
+
+class ModelConcurrencyLimiter:
+    """Model başına eşzamanlı istek sınırı ve sınırlı bekleme kuyruğu
+
+    Ollama her yüklü model için yalnızca OLLAMA_NUM_PARALLEL kadar isteği
+    aynı anda işler. Fazlası burada sırada bekler; kuyruk doluysa çağrı
+    beklemeden ModelOverloadedError ile reddedilir.
+    """
+
+    def __init__(
+        self,
+        default_limit: int = 4,
+        model_limits: Optional[Dict[str, int]] = None,
+        max_queue: int = 32,
+        queue_timeout: Optional[float] = None
+    ):
+        self.default_limit = default_limit
+        self.model_limits = {normalize_model_name(model): limit for model, limit in (model_limits or {}).items()}
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._slots: Dict[str, _ModelSlot] = {}
+
+    @classmethod
+    def from_env(cls, scale: int = 1) -> "ModelConcurrencyLimiter":
+        """Çevre değişkenlerinden sınırlayıcı oluşturur
+
+        scale: sınırlar sunucu başına olduğundan, sunucu sayısı kadar çarpılır.
+        """
+        queue_timeout = os.getenv("OLLAMA_QUEUE_TIMEOUT")
+        model_limits = parse_model_limits(os.getenv("OLLAMA_MODEL_LIMITS", ""))
+        return cls(
+            default_limit=int(os.getenv("OLLAMA_NUM_PARALLEL", "4")) * scale,
+            model_limits={model: limit * scale for model, limit in model_limits.items()},
+            max_queue=int(os.getenv("OLLAMA_MAX_QUEUE", "32")),
+            queue_timeout=float(queue_timeout) if queue_timeout else None,
+        )
+
+    def _slot(self, model: str) -> _ModelSlot:
+        # "llama3" ve "llama3:latest" aynı yüklü model, aynı sınırı paylaşır
+        model = normalize_model_name(model)
+        slot = self._slots.get(model)
+        if slot is None:
+            slot = _ModelSlot(self.model_limits.get(model, self.default_limit))
+            self._slots[model] = slot
+        return slot
+
+    @asynccontextmanager
+    async def acquire(self, model: str) -> AsyncIterator[float]:
+        """Model için bir çalışma hakkı alır; kuyruk doluysa hemen hata verir
+
+        Blok içine kuyrukta beklenen süre (saniye) verilir.
+        """
+        slot = self._slot(model)
+
+        if slot.semaphore.locked() and slot.waiting >= self.max_queue:
+            slot.rejected += 1
+            raise ModelOverloadedError(
+                f"{model} modeli için bekleme kuyruğu dolu ({slot.waiting}/{self.max_queue})",
+                model=model
+            )
+
+        started = time.monotonic()
+        slot.waiting += 1
+        try:
+            if self.queue_timeout is not None:
+                try:
+                    await asyncio.wait_for(slot.semaphore.acquire(), timeout=self.queue_timeout)
+                except asyncio.TimeoutError:
+                    slot.rejected += 1
+                    raise ModelOverloadedError(
+                        f"{model} modeli için {self.queue_timeout} saniye içinde sıra gelmedi",
+                        model=model
+                    )
+            else:
+                await slot.semaphore.acquire()
+        finally:
+            slot.waiting -= 1
+
+        waited = time.monotonic() - started
+        slot.admitted += 1
+        slot.total_wait += waited
+        slot.last_wait = waited
+        slot.max_wait = max(slot.max_wait, waited)
+
+        slot.active += 1
+        try:
+            yield waited
+        finally:
+            slot.active -= 1
+            slot.semaphore.release()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Model başına kuyruk derinliği ve bekleme süresi bilgilerini döndürür"""
+        return {model: slot.stats() for model, slot in self._slots.items()}
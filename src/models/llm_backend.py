@@ -0,0 +1,231 @@
+import asyncio
+import os
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Union
+
+from src.models.base import Conversation
+from src.models.continuation import Continuation
+from src.models.errors import LLMError
+from src.models.profiles import GenerationProfile
+from src.models.usage import USAGE_FIELDS, merge_usage, summarize_usage
+
+# Stream sırasında her token için çağrılan geri bildirim fonksiyonu
+TokenCallback = Callable[[str], Union[None, Awaitable[None]]]
+
+# Çağrı bittiğinde token/süre kullanımıyla çağrılan geri bildirim fonksiyonu
+UsageCallback = Callable[[Dict[str, Any]], None]
+
+
+async def collect_stream(tokens: AsyncIterator[str], on_token: Optional[TokenCallback] = None) -> str:
+    """Token akışını tüketir ve birleştirilmiş son metni döndürür
+
+    Akış on_token'a token ilettikten sonra koparsa hata tekrar denenmez:
+    yeni deneme aynı metni dinleyiciye ikinci kez gönderirdi.
+    """
+    parts: List[str] = []
+    try:
+        async for token in tokens:
+            parts.append(token)
+            if on_token is not None:
+                callback_result = on_token(token)
+                if asyncio.iscoroutine(callback_result):
+                    await callback_result
+    except LLMError as e:
+        if parts and on_token is not None:
+            e.retryable = False
+        raise
+    return "".join(parts)
+
+
+async def single_token(text: str) -> AsyncIterator[str]:
+    """Tek parça metni token akışı olarak sunar (önbellek isabetleri için)"""
+    yield text
+
+
+class LLMBackend(ABC):
+    """TeamManager ve ajanların kullandığı LLM sunucusu arayüzü
+
+    Alt sınıflar config (embed_batch_size, embed_cache_dir alanlarıyla),
+    tracer, profiles, usage_by_model ve _vector_cache özniteliklerini
+    tanımlar. Hatalar tipli LLMError alt sınıfları olarak fırlatılır.
+    """
+
+    # BackendRouter'daki adı
+    name = "llm"
+
+    @abstractmethod
+    async def generate(
+        self,
+        model: str,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        conversation: Optional[Conversation] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        stream: bool = False,
+        on_token: Optional[TokenCallback] = None,
+        seed: Optional[int] = None,
+        on_usage: Optional[UsageCallback] = None,
+        continuation: Optional[Continuation] = None,
+        profile: Optional[GenerationProfile] = None,
+        stop: Optional[List[str]] = None
+    ) -> str:
+        """Metni tamamlar; conversation verilirse sohbet olarak gönderir"""
+
+    @abstractmethod
+    def generate_stream(
+        self,
+        model: str,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        conversation: Optional[Conversation] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        seed: Optional[int] = None,
+        profile: Optional[GenerationProfile] = None,
+        stop: Optional[List[str]] = None
+    ) -> AsyncIterator[str]:
+        """Metni token token üretir"""
+
+    @abstractmethod
+    async def list_models(self) -> List[str]:
+        """Sunucudaki modelleri listeler"""
+
+    @abstractmethod
+    async def _embed_batch(self, model: str, texts: List[str]) -> List[List[float]]:
+        """Tek istekte bir metin grubunu embed eder"""
+
+    @abstractmethod
+    async def aclose(self) -> None:
+        """HTTP bağlantılarını kapatır"""
+
+    def ensure_model(self, model: str) -> None:
+        """Model sunucuda yoksa HTTP çağrısı yapmadan ModelNotFoundError fırlatır (bilinmiyorsa geçer)"""
+
+    def _vector_cache_model(self, model: str) -> str:
+        """Vektör önbelleğinde modelin klasör adı"""
+        return f"{self.name}-{model}"
+
+    @property
+    def vector_cache(self):
+        """İçerik özetine göre vektör önbelleği (kapalıysa None)"""
+        if self._vector_cache is None and self.config.embed_cache_dir:
+            from src.models.embeddings import VectorCache
+            self._vector_cache = VectorCache(self.config.embed_cache_dir)
+        return self._vector_cache
+
+    async def embed(self, model: str, texts: Union[str, List[str]]):
+        """Metinlerin embedding vektörlerini döndürür (numpy float32, şekil: metin sayısı x boyut)
+
+        Daha önce embed edilmiş metinler içerik özetiyle diskteki vektör
+        önbelleğinden okunur; yalnızca yeni metinler embed_batch_size'lık
+        gruplar halinde sunucuya gönderilir. Aynı metin bir çağrıda
+        birden fazla geçse de bir kez embed edilir.
+        """
+        import numpy as np
+        from src.models.embeddings import content_hash
+
+        if isinstance(texts, str):
+            texts = [texts]
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        self.ensure_model(model)
+
+        keys = [content_hash(text) for text in texts]
+        cache = self.vector_cache
+        cache_model = self._vector_cache_model(model)
+        vectors: Dict[str, Any] = await cache.aget_many(cache_model, set(keys)) if cache is not None else {}
+
+        # Eksik metinler (tekrarlar bir kez)
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in vectors and key not in missing:
+                missing[key] = text
+
+        if missing:
+            missing_keys = list(missing)
+            batch_size = max(1, self.config.embed_batch_size)
+            batches = [missing_keys[i:i + batch_size] for i in range(0, len(missing_keys), batch_size)]
+            results = await asyncio.gather(
+                *(self._embed_batch(model, [missing[key] for key in batch]) for batch in batches)
+            )
+            fresh = {}
+            for batch, embeddings in zip(batches, results):
+                if len(embeddings) != len(batch):
+                    raise LLMError(f"Beklenen {len(batch)} vektör yerine {len(embeddings)} döndü", model=model)
+                for key, embedding in zip(batch, embeddings):
+                    fresh[key] = np.asarray(embedding, dtype=np.float32)
+            if cache is not None:
+                await cache.aput_many(cache_model, fresh)
+            vectors.update(fresh)
+
+        return np.stack([vectors[key] for key in keys])
+
+    def embedding_stats(self) -> Dict[str, Any]:
+        """Vektör önbelleğinin sayaçlarını döndürür"""
+        if not self.config.embed_cache_dir:
+            return {"enabled": False}
+        if self._vector_cache is None:
+            return {"enabled": True, "directory": self.config.embed_cache_dir}
+        return {"enabled": True, **self._vector_cache.stats()}
+
+    def _record_usage(self, model: str, record: Dict[str, Any], on_usage: Optional[UsageCallback]) -> None:
+        """Çağrının kullanımını model toplamına ekler ve çağırana bildirir"""
+        usage = {field: record[field] for field in USAGE_FIELDS if field in record}
+        usage["model"] = model
+        if record.get("coalesced"):
+            usage["coalesced"] = True
+        merge_usage(self.usage_by_model.setdefault(model, {}), usage)
+        if on_usage is not None:
+            try:
+                on_usage(usage)
+            except Exception as e:
+                print(f"[WARN] Kullanım bilgisi işlenemedi: {e}")
+
+    def usage_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Model başına token, süre ve token/s bilgilerini döndürür"""
+        return {model: summarize_usage(totals) for model, totals in self.usage_by_model.items()}
+
+
+class BackendRouter:
+    """Adlandırılmış LLM sunucuları arasında ajan bazlı seçim
+
+    Ajanın backend alanı boşsa varsayılan sunucu (Ollama) kullanılır.
+    """
+
+    def __init__(self, default: LLMBackend, backends: Optional[Dict[str, LLMBackend]] = None):
+        self.default = default
+        self.backends: Dict[str, LLMBackend] = {default.name: default}
+        self.backends.update(backends or {})
+
+    @classmethod
+    def from_env(cls, default: LLMBackend) -> "BackendRouter":
+        """OPENAI_COMPAT_BASE_URL tanımlıysa OpenAI uyumlu sunucuyu da ekler"""
+        router = cls(default)
+        if os.getenv("OPENAI_COMPAT_BASE_URL"):
+            from src.models.openai_compat import OpenAICompatAdapter, OpenAICompatConfig
+            config = OpenAICompatConfig.from_env()
+            # Aynı iz dosyasına tek yazıcı thread'i yazsın
+            router.add(OpenAICompatAdapter(config, tracer=getattr(default, "tracer", None)))
+        return router
+
+    def add(self, backend: LLMBackend) -> None:
+        self.backends[backend.name] = backend
+
+    def names(self) -> List[str]:
+        return list(self.backends.keys())
+
+    def get(self, name: Optional[str] = None) -> LLMBackend:
+        """Ada göre sunucuyu döndürür (ad boşsa varsayılan)"""
+        if not name:
+            return self.default
+        backend = self.backends.get(name)
+        if backend is None:
+            raise ValueError(f"LLM sunucusu bulunamadı: {name}. Mevcut sunucular: {', '.join(self.names())}")
+        return backend
+
+    async def aclose(self) -> None:
+        """Varsayılan dışındaki sunucuları kapatır (varsayılanı oluşturan taraf kapatır)"""
+        for backend in self.backends.values():
+            if backend is not self.default:
+                await backend.aclose()
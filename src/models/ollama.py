@@ -1,13 +1,32 @@
 import json
 import os
 import asyncio
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
 
 import httpx
-from pydantic import BaseModel
-from tenacity import retry, stop_after_attempt, wait_exponential
+from pydantic import BaseModel, Field
+from tenacity import retry
 
 from src.models.base import Conversation, Message, ModelCapability, ModelInfo
+from src.models.backends import BackendPool, normalize_model_name
+from src.models.cache import ResponseCache, make_cache_key
+from src.models.continuation import Continuation
+from src.models.errors import (
+    CircuitOpenError,
+    LLMError,
+    ModelOverloadedError,
+    classify_error,
+    error_from_message,
+)
+from src.models.limiter import ModelConcurrencyLimiter
+from src.models.llm_backend import LLMBackend, TokenCallback, UsageCallback, collect_stream, single_token
+from src.models.profiles import DEFAULT_PROFILE, GenerationProfile, estimate_tokens, load_profiles_from_env
+from src.models.registry import ModelRegistry
+from src.models.resilience import RetryBudget, count_request, retry_stop, retry_wait, should_retry
+from src.models.singleflight import SingleFlight
+from src.models.tracing import Tracer, TraceSpan
+from src.models.usage import usage_from_response
+from src.models.warmup import ModelWarmup
 
 # Varsayılan modeller
 DEFAULT_MODELS = [
@@ -22,75 +41,570 @@ DEFAULT_MODELS = [
 class OllamaConfig(BaseModel):
     """Ollama API yapılandırması"""
     base_url: str
+    # Birden fazla sunucu varsa tüm adresler (boşsa yalnızca base_url kullanılır)
+    base_urls: List[str] = Field(default_factory=list)
     timeout: int = 300
+    # Bağlantı havuzu ayarları
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    # Ayrı zaman aşımı değerleri (None ise genel timeout kullanılır)
+    connect_timeout: Optional[float] = 10.0
+    read_timeout: Optional[float] = None
+    write_timeout: Optional[float] = None
+    pool_timeout: Optional[float] = 30.0
+    # Deterministik üretimler için yanıt önbelleği (opsiyonel)
+    cache_enabled: bool = False
+    cache_dir: str = "data/llm_cache"
+    cache_memory_entries: int = 256
+    cache_disk_max_bytes: int = 256 * 1024 * 1024
+    cache_ttl_seconds: Optional[float] = 7 * 24 * 3600
+    # Aynı anda gelen özdeş istekleri tek upstream çağrısında birleştir
+    singleflight_enabled: bool = True
+    # Devre kesiciler: art arda bu kadar bağlantı hatasında sunucu,
+    # zaman aşımı/sunucu hatasında o sunucudaki model devre dışı kalır
+    backend_failure_threshold: int = 3
+    backend_ejection_seconds: float = 30.0
+    model_failure_threshold: int = 3
+    model_circuit_seconds: float = 30.0
+    # Geçici hatalarda yeniden deneme (tam jitter'lı üstel bekleme)
+    retry_attempts: int = 3
+    retry_backoff_base: float = 0.5
+    retry_backoff_max: float = 10.0
+    # Ortak yeniden deneme bütçesi: pencere içindeki isteklerin oranı (en az retry_budget_min)
+    retry_budget_ratio: float = 0.2
+    retry_budget_min: int = 3
+    retry_budget_window: float = 10.0
+    # Modelin istekten sonra bellekte kalma süresi (ör. "30m", "-1" = sürekli)
+    keep_alive: Optional[Union[str, int]] = None
+    # Yüklü modeller için /api/ps sorgu aralığı (saniye, 0 = kapalı)
+    ps_poll_interval: float = 30.0
+    # Embedding istekleri: tek istekte gönderilecek metin sayısı ve vektör önbelleği (boşsa kapalı)
+    embed_batch_size: int = 32
+    embed_cache_dir: Optional[str] = "data/embeddings"
+    # Model listesi (/api/tags, /api/show) önbelleğinin yenilenme aralığı (saniye)
+    registry_ttl_seconds: float = 60.0
 
+    @classmethod
+    def from_env(cls, base_url: Optional[str] = None, timeout: Optional[int] = None) -> "OllamaConfig":
+        """Çevre değişkenlerinden yapılandırma oluşturur"""
+        def _float_env(name: str, default: Optional[float]) -> Optional[float]:
+            value = os.getenv(name)
+            return float(value) if value else default
 
-class OllamaAdapter:
+        def _keep_alive_env() -> Optional[Union[str, int]]:
+            # Ollama birimsiz süreleri sayı olarak bekler ("-1" değil -1)
+            value = os.getenv("OLLAMA_KEEP_ALIVE")
+            if not value:
+                return None
+            return int(value) if value.lstrip("-").isdigit() else value
+
+        base_urls = [url.strip() for url in os.getenv("OLLAMA_BASE_URLS", "").split(",") if url.strip()]
+        return cls(
+            base_url=base_url or (base_urls[0] if base_urls else os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")),
+            base_urls=base_urls if not base_url else [],
+            timeout=timeout if timeout is not None else int(os.getenv("OLLAMA_TIMEOUT", "300")),
+            max_connections=int(os.getenv("OLLAMA_MAX_CONNECTIONS", "100")),
+            max_keepalive_connections=int(os.getenv("OLLAMA_MAX_KEEPALIVE", "20")),
+            keepalive_expiry=float(os.getenv("OLLAMA_KEEPALIVE_EXPIRY", "30")),
+            connect_timeout=_float_env("OLLAMA_CONNECT_TIMEOUT", 10.0),
+            read_timeout=_float_env("OLLAMA_READ_TIMEOUT", None),
+            write_timeout=_float_env("OLLAMA_WRITE_TIMEOUT", None),
+            pool_timeout=_float_env("OLLAMA_POOL_TIMEOUT", 30.0),
+            cache_enabled=os.getenv("OLLAMA_CACHE_ENABLED", "False").lower() == "true",
+            cache_dir=os.getenv("OLLAMA_CACHE_DIR", "data/llm_cache"),
+            cache_memory_entries=int(os.getenv("OLLAMA_CACHE_MEMORY_ENTRIES", "256")),
+            cache_disk_max_bytes=int(os.getenv("OLLAMA_CACHE_DISK_MAX_BYTES", str(256 * 1024 * 1024))),
+            cache_ttl_seconds=_float_env("OLLAMA_CACHE_TTL_SECONDS", 7 * 24 * 3600),
+            singleflight_enabled=os.getenv("OLLAMA_SINGLEFLIGHT_ENABLED", "True").lower() == "true",
+            backend_failure_threshold=int(os.getenv("OLLAMA_BACKEND_FAILURE_THRESHOLD", "3")),
+            backend_ejection_seconds=float(os.getenv("OLLAMA_BACKEND_EJECTION_SECONDS", "30")),
+            model_failure_threshold=int(os.getenv("OLLAMA_MODEL_FAILURE_THRESHOLD", "3")),
+            model_circuit_seconds=float(os.getenv("OLLAMA_MODEL_CIRCUIT_SECONDS", "30")),
+            retry_attempts=int(os.getenv("OLLAMA_RETRY_ATTEMPTS", "3")),
+            retry_backoff_base=float(os.getenv("OLLAMA_RETRY_BACKOFF_BASE", "0.5")),
+            retry_backoff_max=float(os.getenv("OLLAMA_RETRY_BACKOFF_MAX", "10")),
+            retry_budget_ratio=float(os.getenv("OLLAMA_RETRY_BUDGET_RATIO", "0.2")),
+            retry_budget_min=int(os.getenv("OLLAMA_RETRY_BUDGET_MIN", "3")),
+            retry_budget_window=float(os.getenv("OLLAMA_RETRY_BUDGET_WINDOW", "10")),
+            keep_alive=_keep_alive_env(),
+            ps_poll_interval=float(os.getenv("OLLAMA_PS_POLL_INTERVAL", "30")),
+            embed_batch_size=int(os.getenv("OLLAMA_EMBED_BATCH_SIZE", "32")),
+            embed_cache_dir=os.getenv("OLLAMA_EMBED_CACHE_DIR", "data/embeddings") or None,
+            registry_ttl_seconds=float(os.getenv("OLLAMA_REGISTRY_TTL", "60")),
+        )
+
+    def all_base_urls(self) -> List[str]:
+        """Havuzdaki tüm sunucu adreslerini döndürür"""
+        return self.base_urls or [self.base_url]
+
+    def http_timeout(self) -> httpx.Timeout:
+        """httpx için ayrı connect/read/write/pool zaman aşımlarını oluşturur"""
+        return httpx.Timeout(
+            self.timeout,
+            connect=self.connect_timeout if self.connect_timeout is not None else self.timeout,
+            read=self.read_timeout if self.read_timeout is not None else self.timeout,
+            write=self.write_timeout if self.write_timeout is not None else self.timeout,
+            pool=self.pool_timeout if self.pool_timeout is not None else self.timeout,
+        )
+
+    def http_limits(self) -> httpx.Limits:
+        """httpx bağlantı havuzu limitlerini oluşturur"""
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+
+class OllamaAdapter(LLMBackend):
     """Ollama API bağdaştırıcısı"""
 
-    def __init__(self, base_url: str = None, timeout: int = 300, config: Optional[OllamaConfig] = None):
+    name = "ollama"
+
+    def __init__(
+        self,
+        base_url: str = None,
+        timeout: int = None,
+        config: Optional[OllamaConfig] = None,
+        cache: Optional[ResponseCache] = None,
+        limiter: Optional[ModelConcurrencyLimiter] = None,
+        tracer: Optional[Tracer] = None
+    ):
         if config:
             self.config = config
         else:
-            base_url = base_url or os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
-            self.config = OllamaConfig(
-                base_url=base_url,
-                timeout=timeout
+            self.config = OllamaConfig.from_env(base_url=base_url, timeout=timeout)
+
+        # Her sunucu için tek bir asenkron istemci: bağlantılar havuzda tutulur ve
+        # yeniden kullanılır, böylece eşzamanlı çağrılar executor thread'lerine bağımlı olmaz
+        self.pool = BackendPool(
+            self.config.all_base_urls(),
+            timeout=self.config.http_timeout(),
+            limits=self.config.http_limits(),
+            failure_threshold=self.config.backend_failure_threshold,
+            ejection_seconds=self.config.backend_ejection_seconds,
+            model_failure_threshold=self.config.model_failure_threshold,
+            model_reset_seconds=self.config.model_circuit_seconds,
+        )
+        print(f"Ollama API başlatıldı: {', '.join(self.config.all_base_urls())}")
+
+        # Yanıt önbelleği yalnızca açıkça istenirse kullanılır
+        if cache is None and self.config.cache_enabled:
+            cache = ResponseCache(
+                directory=self.config.cache_dir,
+                max_memory_entries=self.config.cache_memory_entries,
+                max_disk_bytes=self.config.cache_disk_max_bytes,
+                ttl_seconds=self.config.cache_ttl_seconds,
             )
+        self.cache = cache
+        self.inflight = SingleFlight()
+        self.retry_budget = RetryBudget(
+            ratio=self.config.retry_budget_ratio,
+            min_retries=self.config.retry_budget_min,
+            window_seconds=self.config.retry_budget_window,
+        )
+        # Model başına sınır, sunucu sayısıyla ölçeklenir
+        self.limiter = limiter or ModelConcurrencyLimiter.from_env(scale=len(self.pool.backends))
+        self.warmup = ModelWarmup(
+            self.pool,
+            self.limiter,
+            keep_alive=self.config.keep_alive,
+            poll_interval=self.config.ps_poll_interval,
+        )
+        # Pull edilmiş modellerin bellek içi indeksi (arka planda TTL ile yenilenir)
+        self.registry = ModelRegistry(self.pool, ttl_seconds=self.config.registry_ttl_seconds)
+        # Rol bazlı üretim profilleri ve modellerin son kullanılan bağlam penceresi
+        self.profiles = load_profiles_from_env()
+        self._num_ctx_by_model: Dict[str, int] = {}
+        # Her çağrı için örneklemeli iz kaydı (stdout yerine arka planda dosyaya)
+        self.tracer = tracer or Tracer.from_env()
+        # Model başına toplam token ve süre kullanımı
+        self.usage_by_model: Dict[str, Dict[str, Any]] = {}
+        # Vektör önbelleği ilk embed çağrısında oluşturulur (numpy gerektirir)
+        self._vector_cache = None
 
-        self.client = httpx.Client(base_url=self.config.base_url, timeout=self.config.timeout)
-        print(f"Ollama API başlatıldı: {self.config.base_url}")
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """İlk sunucunun istemcisi (tek sunuculu kullanım için)"""
+        return self.pool.backends[0].client
 
     def _handle_response(self, response: httpx.Response) -> Dict[str, Any]:
         """HTTP yanıtını işler"""
         response.raise_for_status()
         return response.json()
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=1, max=10)
-    )
     async def list_models(self) -> List[str]:
-        """Mevcut modelleri listeler"""
-        loop = asyncio.get_event_loop()
-        try:
-            # Senkron API çağrısını asenkron olarak çalıştır
-            response = await loop.run_in_executor(
-                None, lambda: self.client.get("/api/tags")
-            )
-            data = self._handle_response(response)
-            models = [model["name"] for model in data.get("models", [])]
-            
-            if not models:
-                print("Ollama API'den model bulunamadı, varsayılan modeller kullanılacak")
-                return DEFAULT_MODELS
-                
-            print(f"Bulunan modeller: {models}")
-            return models
-        except Exception as e:
-            print(f"Modeller listelenirken hata: {e}")
+        """Mevcut modelleri listeler (indeks eskimediyse HTTP çağrısı yapmadan)"""
+        await self.registry.ensure_fresh()
+        models = self.registry.names()
+        if not models:
+            if self.registry.last_error:
+                print(f"Modeller listelenirken hata: {self.registry.last_error}")
             print(f"Varsayılan modeller kullanılıyor: {DEFAULT_MODELS}")
             return DEFAULT_MODELS
+        return models
+
+    async def _embed_batch(self, model: str, texts: List[str]) -> List[List[float]]:
+        """Tek bir /api/embed isteğiyle metin grubunu embed eder"""
+        payload: Dict[str, Any] = {"model": model, "input": texts}
+        if self.config.keep_alive is not None:
+            payload["keep_alive"] = self.config.keep_alive
+        try:
+            async with self.limiter.acquire(model):
+                async with self.pool.use(model) as backend:
+                    response = await backend.client.post("/api/embed", json=payload)
+                    response.raise_for_status()
+        except LLMError:
+            raise
+        except Exception as e:
+            typed = classify_error(e, model)
+            if typed is e:
+                raise
+            raise typed from e
+
+        return self._handle_response(response).get("embeddings") or []
+
+    def ensure_model(self, model: str) -> None:
+        """Model listesinde olmayan modeli HTTP çağrısı yapmadan reddeder"""
+        self.registry.ensure_available(model)
+
+    def _vector_cache_model(self, model: str) -> str:
+        # "ad" ve "ad:latest" aynı vektör dosyasını kullansın
+        return normalize_model_name(model)
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=1, max=10)
-    )
     async def get_model_info(self, model_name: str) -> Dict[str, Any]:
-        """Model hakkında bilgi döndürür"""
-        loop = asyncio.get_event_loop()
+        """Model hakkında bilgi döndürür (/api/show, model değişmedikçe önbellekten)"""
+        return await self.registry.show(model_name)
+
+    def _context_window(self, model: str, num_ctx: int) -> int:
+        """Model bellekteyken daha büyük bir pencereyle yüklüyse onu kullanır
+
+        Ollama num_ctx değiştiğinde modeli yeniden yükler; yüklü pencere
+        isteğe yetiyorsa küçültmek yerine aynen kullanılır.
+        """
+        name = normalize_model_name(model)
+        loaded = self._num_ctx_by_model.get(name)
+        if loaded and loaded >= num_ctx and self.registry.is_loaded(name):
+            return loaded
+        self._num_ctx_by_model[name] = num_ctx
+        return num_ctx
+
+    def _build_options(
+        self,
+        model: str,
+        prompt_tokens: int,
+        profile: Optional[GenerationProfile],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        seed: Optional[int],
+        stop: Optional[List[str]]
+    ) -> Dict[str, Any]:
+        """Profil ve çağrı parametrelerinden Ollama `options` alanını oluşturur"""
+        entry = self.registry.get(model)
+        options = (profile or DEFAULT_PROFILE).options(
+            prompt_tokens=prompt_tokens,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            seed=seed,
+            stop=stop,
+            context_limit=entry.context_length if entry else None,
+        )
+        options["num_ctx"] = self._context_window(model, options["num_ctx"])
+        return options
+
+    def _build_request(
+        self,
+        model: str,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        conversation: Optional[Conversation] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        stream: bool = False,
+        seed: Optional[int] = None,
+        continuation: Optional[Continuation] = None,
+        profile: Optional[GenerationProfile] = None,
+        stop: Optional[List[str]] = None
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Ollama isteği için endpoint ve payload oluşturur
+
+        Üretim ayarları (temperature, num_predict, num_ctx, stop, seed)
+        `options` altında gönderilir; açıkça verilen parametreler profili
+        ezer. num_ctx sabit değilse prompt uzunluğuna göre seçilir.
+
+        continuation verilirse /api/generate kullanılır ve önceki turun
+        KV bağlamı (`context`) eklenir; bu durumda sistem komutu zaten
+        bağlamda olduğundan tekrar gönderilmez.
+        """
+        # Parametreleri doğrula
+        if not model or not isinstance(model, str):
+            raise TypeError(f"Geçersiz model parametresi: {type(model)}")
+        
+        if not prompt or not isinstance(prompt, str):
+            raise TypeError(f"Geçersiz prompt parametresi: {type(prompt)}")
+        
+        if system_prompt is not None and not isinstance(system_prompt, str):
+            raise TypeError(f"Geçersiz system_prompt parametresi: {type(system_prompt)}")
+        
+        # Sohbet geçmişi kullanılıyorsa chat API'ını kullan
+        if conversation and conversation.messages and continuation is None:
+            # Ollama beklediği formatta mesajları oluştur
+            messages = []
+            for msg in conversation.messages:
+                messages.append({
+                    "role": msg.role,
+                    "content": msg.content
+                })
+            
+            prompt_tokens = sum(estimate_tokens(msg["content"]) for msg in messages)
+            payload = {
+                "model": model,
+                "messages": messages,
+                "stream": stream,
+                "options": self._build_options(model, prompt_tokens, profile, temperature, max_tokens, seed, stop)
+            }
+
+            if self.config.keep_alive is not None:
+                payload["keep_alive"] = self.config.keep_alive
+
+            return "/api/chat", payload
+
+        # Doğrudan metin oluşturma API'ını kullan
+        payload = {
+            "model": model,
+            "prompt": prompt,
+            "stream": stream
+        }
+
+        if self.config.keep_alive is not None:
+            payload["keep_alive"] = self.config.keep_alive
+        
+        prompt_tokens = estimate_tokens(prompt)
+        if continuation is not None and continuation.active:
+            # Önceki turların token'ları; Ollama yalnızca yeni prompt'u değerlendirir
+            payload["context"] = continuation.context
+            prompt_tokens += len(continuation.context)
+        elif system_prompt:
+            payload["system"] = system_prompt
+            prompt_tokens += estimate_tokens(system_prompt)
+
+        payload["options"] = self._build_options(model, prompt_tokens, profile, temperature, max_tokens, seed, stop)
+
+        return "/api/generate", payload
+
+    @staticmethod
+    def _extract_text(endpoint: str, data: Dict[str, Any]) -> str:
+        """Yanıttan (veya stream parçasından) metni çıkarır"""
+        # Chat API'ı kullanıldıysa ilgili alanı al
+        if endpoint == "/api/chat":
+            return (data.get("message") or {}).get("content", "")
+        return data.get("response", "")
+
+    async def _stream_request(
+        self,
+        endpoint: str,
+        payload: Dict[str, Any],
+        span: Optional[TraceSpan] = None,
+        continuation: Optional[Continuation] = None
+    ) -> AsyncIterator[str]:
+        """Hazırlanmış isteği gönderir ve NDJSON parçalarından token üretir
+
+        httpx hataları tipli LLM hatalarına (LLMTimeoutError, LLMConnectionError,
+        ModelNotFoundError, ...) çevrilerek fırlatılır.
+        """
         try:
-            response = await loop.run_in_executor(
-                None, lambda: self.client.get(f"/api/show?name={model_name}")
+            async for token in self._stream_tokens(endpoint, payload, span, continuation):
+                yield token
+        except LLMError:
+            raise
+        except Exception as e:
+            typed = classify_error(e, payload["model"])
+            if typed is e:
+                raise
+            raise typed from e
+
+    async def _stream_tokens(
+        self,
+        endpoint: str,
+        payload: Dict[str, Any],
+        span: Optional[TraceSpan] = None,
+        continuation: Optional[Continuation] = None
+    ) -> AsyncIterator[str]:
+        # Model başına sınır: stream boyunca bir çalışma hakkı tutulur
+        async with self.limiter.acquire(payload["model"]) as waited:
+            async with self.pool.use(payload["model"]) as backend:
+                if span is not None:
+                    span.set(backend=backend.base_url, queue_ms=round(waited * 1000, 3))
+                async with backend.client.stream("POST", endpoint, json=payload) as response:
+                    if span is not None:
+                        span.set(http_status=response.status_code)
+                    if response.is_error:
+                        await response.aread()
+                    response.raise_for_status()
+
+                    async for line in response.aiter_lines():
+                        if not line.strip():
+                            continue
+                        chunk = json.loads(line)
+                        if "error" in chunk:
+                            raise error_from_message(chunk["error"], model=payload["model"])
+
+                        token = self._extract_text(endpoint, chunk)
+                        if token:
+                            if span is not None:
+                                span.mark_first_token()
+                            yield token
+                        if chunk.get("done"):
+                            self._handle_final(chunk, span, continuation)
+                            break
+
+    async def _execute_request(
+        self,
+        endpoint: str,
+        payload: Dict[str, Any],
+        on_token: Optional[TokenCallback] = None,
+        span: Optional[TraceSpan] = None,
+        continuation: Optional[Continuation] = None
+    ) -> str:
+        """Hazırlanmış isteği çalıştırır ve metni döndürür; hataları tipli olarak yukarı iletir"""
+        if payload.get("stream"):
+            return await collect_stream(
+                self._stream_request(endpoint, payload, span=span, continuation=continuation),
+                on_token=on_token
             )
-            return self._handle_response(response)
+
+        try:
+            return await self._post_request(endpoint, payload, span, continuation)
+        except LLMError:
+            raise
         except Exception as e:
-            print(f"Model bilgisi alınırken hata: {e}")
-            return {}
+            typed = classify_error(e, payload["model"])
+            if typed is e:
+                raise
+            raise typed from e
+
+    async def _post_request(
+        self,
+        endpoint: str,
+        payload: Dict[str, Any],
+        span: Optional[TraceSpan] = None,
+        continuation: Optional[Continuation] = None
+    ) -> str:
+        async with self.limiter.acquire(payload["model"]) as waited:
+            async with self.pool.use(payload["model"]) as backend:
+                if span is not None:
+                    span.set(backend=backend.base_url, queue_ms=round(waited * 1000, 3))
+                response = await backend.client.post(endpoint, json=payload)
+                if span is not None:
+                    span.set(http_status=response.status_code, response_bytes=len(response.content))
+                response.raise_for_status()
+
+        data = self._handle_response(response)
+        self._handle_final(data, span, continuation)
+        return self._extract_text(endpoint, data)
+
+    @staticmethod
+    def _handle_final(
+        data: Dict[str, Any],
+        span: Optional[TraceSpan],
+        continuation: Optional[Continuation]
+    ) -> None:
+        """Son yanıt parçasındaki sayaçları ve KV bağlamını işler"""
+        if span is not None:
+            span.set(**usage_from_response(data))
+        if continuation is not None:
+            continuation.update(data.get("context"), prompt_tokens=data.get("prompt_eval_count") or 0)
+
+    def _cache_key_for(self, endpoint: str, payload: Dict[str, Any]) -> Optional[str]:
+        """İstek önbelleğe alınabilirse anahtarını döndürür
+
+        Yalnızca deterministik üretimler (temperature 0 veya sabit seed)
+        önbelleğe alınır.
+        """
+        if self.cache is None:
+            return None
+        options = payload.get("options") or {}
+        if options.get("temperature") != 0 and options.get("seed") is None:
+            return None
+        return self._request_key(endpoint, payload)
+
+    @staticmethod
+    def _request_key(endpoint: str, payload: Dict[str, Any]) -> str:
+        """İsteğin anahtarı; bağlam penceresi yanıtı değiştirmediği için num_ctx dahil edilmez"""
+        options = {k: v for k, v in (payload.get("options") or {}).items() if k != "num_ctx"}
+        return make_cache_key(endpoint, {**payload, "options": options})
+
+    def queue_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Model başına kuyruk derinliği ve bekleme süresi bilgilerini döndürür"""
+        return self.limiter.stats()
+
+    async def _shared_request(self, endpoint: str, payload: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        """Birleştirilen çağrıyı yürütür; iz alanlarını ayrı bir kayıtta döndürür"""
+        fields: Dict[str, Any] = {}
+        result = await self._execute_request(endpoint, payload, span=TraceSpan(self.tracer, fields, False, None))
+        return result, fields
+
+    def inflight_stats(self) -> Dict[str, Any]:
+        """Birleştirilen (single-flight) isteklerin sayaçlarını döndürür"""
+        return {"enabled": self.config.singleflight_enabled, **self.inflight.stats()}
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Yanıt önbelleğinin sayaçlarını döndürür"""
+        if self.cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.cache.stats()}
+
+    async def generate_stream(
+        self,
+        model: str,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        conversation: Optional[Conversation] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        seed: Optional[int] = None,
+        profile: Optional[GenerationProfile] = None,
+        stop: Optional[List[str]] = None
+    ) -> AsyncIterator[str]:
+        """Metni token token üretir (Ollama NDJSON stream'ini ayrıştırır)"""
+        self.registry.ensure_available(model)
+        endpoint, payload = self._build_request(
+            model, prompt, system_prompt, conversation, temperature, max_tokens,
+            stream=True, seed=seed, profile=profile, stop=stop
+        )
+
+        span = self.tracer.start(endpoint, payload)
+        cache_key = self._cache_key_for(endpoint, payload)
+        if cache_key:
+            cached = await self.cache.aget(cache_key)
+            if cached is not None:
+                span.finish("cache_hit", response=cached)
+                yield cached
+                return
+
+        parts: List[str] = []
+        try:
+            async for token in self._stream_request(endpoint, payload, span=span):
+                parts.append(token)
+                yield token
+        except BaseException as e:
+            # İstemci bağlantıyı kapattıysa (GeneratorExit/iptal) kayıt "cancelled" olur
+            status = "error" if isinstance(e, Exception) else "cancelled"
+            span.finish(status, response="".join(parts), error=e if status == "error" else None)
+            raise
+
+        result = "".join(parts)
+        span.finish("ok", response=result)
+        if cache_key:
+            await self.cache.aset(cache_key, result)
 
     @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=1, max=10)
+        stop=retry_stop,
+        wait=retry_wait,
+        retry=should_retry,
+        before=count_request,
+        reraise=True
     )
     async def generate(
         self,
@@ -98,121 +612,156 @@ class OllamaAdapter:
         prompt: str,
         system_prompt: Optional[str] = None,
         conversation: Optional[Conversation] = None,
-        temperature: float = 0.7,
+        temperature: Optional[float] = None,
         max_tokens: Optional[int] = None,
-        stream: bool = False
+        stream: bool = False,
+        on_token: Optional[TokenCallback] = None,
+        seed: Optional[int] = None,
+        on_usage: Optional[UsageCallback] = None,
+        continuation: Optional[Continuation] = None,
+        profile: Optional[GenerationProfile] = None,
+        stop: Optional[List[str]] = None
     ) -> str:
-        """Metni tamamlar"""
+        """Metni tamamlar
+
+        stream=True verilirse yanıt parça parça alınır, her token için
+        on_token çağrılır ve sonunda birleştirilmiş metin döndürülür.
+        Başarılı çağrıdan sonra on_usage token sayıları ve sürelerle
+        (prompt_tokens, completion_tokens, load_ms, queue_ms, ...) çağrılır.
+
+        continuation verilirse çağrı önceki turun KV bağlamından devam eder
+        ve dönen yeni bağlam continuation içinde saklanır; böylece çok
+        turlu oturumlarda yalnızca yeni token'lar değerlendirilir. Bu
+        çağrılar önbelleğe alınmaz ve birleştirilmez. on_token verilen
+        çağrılar da token'ları çağırana özel olduğu için birleştirilmez.
+
+        profile üretim ayarlarını (num_predict, num_ctx, temperature, stop,
+        seed) belirler; temperature, max_tokens, seed ve stop verilirse
+        profildeki değerlerin yerine geçer.
+
+        Hatalar metin olarak dönmez, tipli olarak fırlatılır:
+        LLMTimeoutError, LLMConnectionError, ModelNotFoundError,
+        ModelOverloadedError (kuyruk dolu), CircuitOpenError (sunucu/model
+        devre dışı). Zaman aşımı ve bağlantı hataları ortak yeniden deneme
+        bütçesi izin verdikçe jitter'lı beklemeyle tekrar denenir. Model
+        listesinde olmayan modeller sunucuya gitmeden reddedilir.
+        """
+        endpoint, payload = self._build_request(
+            model, prompt, system_prompt, conversation, temperature, max_tokens,
+            stream=stream, seed=seed, continuation=continuation, profile=profile, stop=stop
+        )
+
+        span = self.tracer.start(endpoint, payload)
         try:
-            loop = asyncio.get_event_loop()
-            
-            # Parametreleri doğrula
-            if not model or not isinstance(model, str):
-                raise TypeError(f"Geçersiz model parametresi: {type(model)}")
-            
-            if not prompt or not isinstance(prompt, str):
-                raise TypeError(f"Geçersiz prompt parametresi: {type(prompt)}")
-            
-            if system_prompt is not None and not isinstance(system_prompt, str):
-                raise TypeError(f"Geçersiz system_prompt parametresi: {type(system_prompt)}")
-            
-            # Sohbet geçmişi kullanılıyorsa chat API'ını kullan
-            if conversation and conversation.messages:
-                # İstek içeriği için debug bilgisi yazdır
-                print(f"[DEBUG] Chat API kullanılıyor. Mesaj sayısı: {len(conversation.messages)}")
-                for i, msg in enumerate(conversation.messages):
-                    print(f"[DEBUG] Mesaj {i+1}: {msg.role} - {msg.content[:20]}...")
-                
-                # Ollama beklediği formatta mesajları oluştur
-                messages = []
-                for msg in conversation.messages:
-                    messages.append({
-                        "role": msg.role,
-                        "content": msg.content
-                    })
-                
-                payload = {
-                    "model": model,
-                    "messages": messages,
-                    "temperature": temperature,
-                    "stream": False  # Stream'i her zaman false olarak ayarla
-                }
-                
-                if max_tokens:
-                    payload["max_tokens"] = max_tokens
-                    
-                # İstek içeriğini logla
-                print(f"[DEBUG] Chat API isteği: {model} modeline gönderiliyor")
-                endpoint = "/api/chat"
-            else:
-                # Doğrudan metin oluşturma API'ını kullan
-                print(f"[DEBUG] Generate API kullanılıyor. Prompt uzunluğu: {len(prompt)}")
-                
-                payload = {
-                    "model": model,
-                    "prompt": prompt,
-                    "temperature": temperature,
-                    "stream": False  # Stream'i her zaman false olarak ayarla
-                }
-                
-                if system_prompt:
-                    payload["system"] = system_prompt
-                    
-                if max_tokens:
-                    payload["max_tokens"] = max_tokens
-                    
-                # İstek içeriğini logla
-                print(f"[DEBUG] Generate API isteği: {model} modeline gönderiliyor")
-                endpoint = "/api/generate"
-
-            try:
-                # Senkron API çağrısını asenkron olarak çalıştır
-                # API isteklerini ayrıntılı logla
-                print(f"[DEBUG] API endpoint: {endpoint}")
-                print(f"[DEBUG] Payload: {payload}")
-                
-                response = await loop.run_in_executor(
-                    None, lambda: self.client.post(endpoint, json=payload)
+            self.registry.ensure_available(model)
+        except LLMError as e:
+            span.finish("error", error=e)
+            raise
+        if continuation is not None:
+            span.set(continuation_turn=continuation.turns, context_tokens=len(payload.get("context") or ()))
+
+        # Deterministik istekler için önce önbelleğe bak
+        cache_key = None if continuation is not None else self._cache_key_for(endpoint, payload)
+        if cache_key:
+            cached = await self.cache.aget(cache_key)
+            if cached is not None:
+                span.finish("cache_hit", response=cached)
+                self._record_usage(model, {"cached_calls": 1}, on_usage)
+                if on_token is not None:
+                    await collect_stream(single_token(cached), on_token=on_token)
+                return cached
+
+        try:
+            if self.config.singleflight_enabled and continuation is None and on_token is None:
+                # Özdeş eşzamanlı istekler tek bir upstream çağrısını paylaşır; paylaşılan
+                # çağrı hiçbir çağıranın iz kaydına yazmaz, ilk çağıran vazgeçse de sürer
+                (result, fields), shared = await self.inflight.do(
+                    cache_key or self._request_key(endpoint, payload),
+                    lambda: self._shared_request(endpoint, payload)
                 )
-                # Yanıtı logla
-                print(f"[DEBUG] API yanıt statüsü: {response.status_code}")
-                
-                data = self._handle_response(response)
-                
-                # Yanıt içeriğini logla
-                print(f"[DEBUG] API yanıt içeriği: {data}")
-                
-                # Chat API'ı kullanıldıysa ilgili alanı al
-                if endpoint == "/api/chat":
-                    result = data.get("message", {}).get("content", "")
+                if shared:
+                    span.set(coalesced=True)
                 else:
-                    result = data.get("response", "")
-                
-                # Sonuç uzunluğunu logla
-                print(f"[DEBUG] API yanıtı: {len(result)} karakter uzunluğunda")
-                if result:
-                    print(f"[DEBUG] İlk 100 karakter: {result[:100]}...")
-                
-                return result
-            except TypeError as te:
-                print(f"[ERROR] TypeError: API çağrısında bir tip hatası oluştu: {str(te)}")
-                # Daha tanımlayıcı hata mesajı döndür
-                return f"Üzgünüm, bir tip hatası oluştu: {str(te)}. Lütfen girdi parametrelerini kontrol edin."
-            except Exception as e:
-                print(f"[ERROR] API çağrısı sırasında bir hata oluştu: {str(e)}")
-                error_msg = f"Üzgünüm, API çağrısı sırasında bir hata oluştu: {str(e)}. Lütfen tekrar deneyin."
-                return error_msg
-        except TypeError as te:
-            print(f"[CRITICAL] Temel parametre kontrolü sırasında TypeError: {str(te)}")
-            return f"Kritik bir tip hatası oluştu: {str(te)}. Gerekli parametrelerin doğru tipte olduğundan emin olun."
+                    span.set(**fields)
+            else:
+                result = await self._execute_request(
+                    endpoint, payload, on_token=on_token, span=span, continuation=continuation
+                )
+        except ModelOverloadedError as e:
+            span.finish("overloaded", error=e)
+            raise
+        except CircuitOpenError as e:
+            span.finish("circuit_open", error=e)
+            raise
+        except asyncio.CancelledError:
+            span.finish("cancelled")
+            raise
         except Exception as e:
-            print(f"Metin oluşturulurken beklenmeyen hata: {str(e)}")
-            error_msg = f"Beklenmeyen bir hata oluştu: {str(e)}. Lütfen tekrar deneyin."
-            return error_msg
+            span.finish("error", error=e)
+            print(f"[ERROR] {model} çağrısı başarısız: {type(e).__name__}: {e}")
+            raise
+
+        span.finish("ok", response=result)
+        # Birleştirilen çağrı modele ayrıca yük bindirmez, token harcamaz
+        self._record_usage(model, {"coalesced": True} if span.record.get("coalesced") else span.record, on_usage)
+
+        # Yalnızca başarılı yanıtlar önbelleğe yazılır
+        if cache_key:
+            await self.cache.aset(cache_key, result)
+        return result
+
+    def trace_stats(self) -> Dict[str, Any]:
+        """İz kaydı sayaçlarını ve sink durumunu döndürür"""
+        return self.tracer.stats()
+
+    def recent_traces(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Son kaydedilen çağrı izlerini döndürür"""
+        return self.tracer.recent_traces(limit)
+
+    def is_model_cold(self, model: str) -> bool:
+        """Model hiçbir sunucuda yüklü değilse (çağrı yükleme süresi öderse) True"""
+        return self.warmup.is_cold(model)
+
+    def residency_stats(self) -> Dict[str, Any]:
+        """Ön yükleme ve bellekte olan modeller bilgisini döndürür"""
+        return self.warmup.stats()
+
+    def retry_stats(self) -> Dict[str, Any]:
+        """Ortak yeniden deneme bütçesinin durumunu döndürür"""
+        return self.retry_budget.stats()
+
+    def registry_stats(self) -> Dict[str, Any]:
+        """Model indeksini (boyut, aile, bağlam uzunluğu, yüklü olma) döndürür"""
+        return self.registry.stats()
+
+    def backend_stats(self) -> List[Dict[str, Any]]:
+        """Sunucu havuzunun sağlık ve yük bilgilerini döndürür"""
+        return self.pool.stats()
+
+    async def aclose(self) -> None:
+        """HTTP istemcilerini ve havuzdaki bağlantıları kapatır"""
+        await self.warmup.stop()
+        await self.registry.stop()
+        await self.pool.aclose()
+        self.tracer.close()
 
     def close(self) -> None:
-        """HTTP istemcisini kapatır"""
-        self.client.close()
+        """HTTP istemcisini kapatır (senkron kod için)"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            asyncio.run(self.aclose())
+            return
+        # Çalışan bir döngü içindeysek kapatmayı zamanla
+        loop.create_task(self.aclose())
+
+    async def __aenter__(self):
+        """Asenkron context yöneticisi girişi"""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Asenkron context yöneticisi çıkışı"""
+        await self.aclose()
 
     def __enter__(self):
         """Context yöneticisi girişi"""
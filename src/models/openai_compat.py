@@ -0,0 +1,326 @@
+import asyncio
+import json
+import os
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import httpx
+from pydantic import BaseModel
+from tenacity import retry
+
+from src.models.base import Conversation
+from src.models.continuation import Continuation
+from src.models.errors import LLMError, classify_error, error_from_message
+from src.models.llm_backend import LLMBackend, TokenCallback, UsageCallback, collect_stream
+from src.models.profiles import DEFAULT_PROFILE, GenerationProfile, load_profiles_from_env
+from src.models.resilience import RetryBudget, count_request, retry_stop, retry_wait, should_retry
+from src.models.tracing import Tracer, TraceSpan
+
+
+class OpenAICompatConfig(BaseModel):
+    """OpenAI uyumlu sunucu (llama.cpp server, vLLM vb.) yapılandırması"""
+    # "/v1" dahil temel adres, ör. http://localhost:8080/v1
+    base_url: str
+    api_key: Optional[str] = None
+    # BackendRouter'daki adı (ajanların backend alanında kullanılır)
+    name: str = "openai"
+    timeout: float = 300.0
+    connect_timeout: float = 10.0
+    # Sürekli toplu işleme (continuous batching) yapan sunucular için eşzamanlı istek sınırı yüksek tutulur
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    retry_attempts: int = 3
+    retry_backoff_base: float = 0.5
+    retry_backoff_max: float = 10.0
+    retry_budget_ratio: float = 0.2
+    retry_budget_min: int = 3
+    retry_budget_window: float = 10.0
+    embed_batch_size: int = 32
+    embed_cache_dir: Optional[str] = "data/embeddings"
+
+    @classmethod
+    def from_env(cls) -> "OpenAICompatConfig":
+        """Çevre değişkenlerinden yapılandırma oluşturur"""
+        return cls(
+            base_url=os.getenv("OPENAI_COMPAT_BASE_URL", "http://localhost:8080/v1"),
+            api_key=os.getenv("OPENAI_COMPAT_API_KEY") or None,
+            name=os.getenv("OPENAI_COMPAT_NAME", "openai"),
+            timeout=float(os.getenv("OPENAI_COMPAT_TIMEOUT", "300")),
+            connect_timeout=float(os.getenv("OPENAI_COMPAT_CONNECT_TIMEOUT", "10")),
+            max_connections=int(os.getenv("OPENAI_COMPAT_MAX_CONNECTIONS", "100")),
+            max_keepalive_connections=int(os.getenv("OPENAI_COMPAT_MAX_KEEPALIVE_CONNECTIONS", "20")),
+            retry_attempts=int(os.getenv("OPENAI_COMPAT_RETRY_ATTEMPTS", "3")),
+            embed_batch_size=int(os.getenv("OPENAI_COMPAT_EMBED_BATCH_SIZE", "32")),
+            embed_cache_dir=os.getenv("OLLAMA_EMBED_CACHE_DIR", "data/embeddings") or None,
+        )
+
+
+class OpenAICompatAdapter(LLMBackend):
+    """OpenAI uyumlu /v1 API bağdaştırıcısı (chat, stream, embedding)
+
+    Üretim profilleri OpenAI alanlarına çevrilir: num_predict -> max_tokens,
+    temperature, stop, seed. num_ctx sunucu başlatılırken belirlendiği için
+    gönderilmez. KV bağlamı (continuation) desteklenmez; ajanlar ilk turdan
+    sonra tüm sohbeti gönderir ve sunucunun prompt önbelleği prefix'i
+    yeniden kullanır.
+    """
+
+    def __init__(self, config: Optional[OpenAICompatConfig] = None, tracer: Optional[Tracer] = None):
+        self.config = config or OpenAICompatConfig.from_env()
+        self.name = self.config.name
+        headers = {"Authorization": f"Bearer {self.config.api_key}"} if self.config.api_key else None
+        self.client = httpx.AsyncClient(
+            base_url=self.config.base_url,
+            headers=headers,
+            timeout=httpx.Timeout(self.config.timeout, connect=self.config.connect_timeout),
+            limits=httpx.Limits(
+                max_connections=self.config.max_connections,
+                max_keepalive_connections=self.config.max_keepalive_connections,
+            ),
+        )
+        print(f"OpenAI uyumlu API başlatıldı ({self.name}): {self.config.base_url}")
+        self.retry_budget = RetryBudget(
+            ratio=self.config.retry_budget_ratio,
+            min_retries=self.config.retry_budget_min,
+            window_seconds=self.config.retry_budget_window,
+        )
+        # İz kaydı verilmezse kendi iz kaydını açar ve kapatır
+        self._owns_tracer = tracer is None
+        self.tracer = tracer or Tracer.from_env()
+        self.profiles = load_profiles_from_env()
+        self.usage_by_model: Dict[str, Dict[str, Any]] = {}
+        self._vector_cache = None
+
+    async def list_models(self) -> List[str]:
+        """Sunucudaki modelleri listeler (/v1/models)"""
+        try:
+            response = await self.client.get("/models")
+            response.raise_for_status()
+            return [model["id"] for model in response.json().get("data", [])]
+        except (httpx.HTTPError, ValueError, KeyError) as e:
+            print(f"Modeller listelenirken hata ({self.name}): {e}")
+            return []
+
+    def _build_request(
+        self,
+        model: str,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        conversation: Optional[Conversation] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        stream: bool = False,
+        seed: Optional[int] = None,
+        profile: Optional[GenerationProfile] = None,
+        stop: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """/chat/completions isteğinin gövdesini oluşturur"""
+        if conversation and conversation.messages:
+            messages = [{"role": msg.role, "content": msg.content} for msg in conversation.messages]
+        else:
+            messages = []
+            if system_prompt:
+                messages.append({"role": "system", "content": system_prompt})
+            messages.append({"role": "user", "content": prompt})
+
+        options = (profile or DEFAULT_PROFILE).options(
+            temperature=temperature, max_tokens=max_tokens, seed=seed, stop=stop
+        )
+        payload: Dict[str, Any] = {
+            "model": model,
+            "messages": messages,
+            "temperature": options["temperature"],
+            "stream": stream,
+        }
+        if "num_predict" in options:
+            payload["max_tokens"] = options["num_predict"]
+        if "stop" in options:
+            payload["stop"] = options["stop"]
+        if "seed" in options:
+            payload["seed"] = options["seed"]
+        if stream:
+            # Son parçada token sayılarını da iste
+            payload["stream_options"] = {"include_usage": True}
+        return payload
+
+    @staticmethod
+    def _set_usage(span: Optional[TraceSpan], usage: Optional[Dict[str, Any]]) -> None:
+        if span is not None and usage:
+            span.set(
+                prompt_tokens=usage.get("prompt_tokens") or 0,
+                completion_tokens=usage.get("completion_tokens") or 0,
+            )
+
+    async def _stream_tokens(self, payload: Dict[str, Any], span: Optional[TraceSpan] = None) -> AsyncIterator[str]:
+        """Server-sent events ("data: {...}") akışından token üretir"""
+        try:
+            async with self.client.stream("POST", "/chat/completions", json=payload) as response:
+                if span is not None:
+                    span.set(http_status=response.status_code)
+                if response.is_error:
+                    await response.aread()
+                response.raise_for_status()
+
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        break
+                    chunk = json.loads(data)
+                    if "error" in chunk:
+                        error = chunk["error"]
+                        message = error.get("message") if isinstance(error, dict) else error
+                        raise error_from_message(str(message), model=payload["model"])
+
+                    self._set_usage(span, chunk.get("usage"))
+                    for choice in chunk.get("choices") or []:
+                        token = (choice.get("delta") or {}).get("content")
+                        if token:
+                            if span is not None:
+                                span.mark_first_token()
+                            yield token
+        except LLMError:
+            raise
+        except Exception as e:
+            typed = classify_error(e, payload["model"])
+            if typed is e:
+                raise
+            raise typed from e
+
+    async def _post_request(self, payload: Dict[str, Any], span: Optional[TraceSpan] = None) -> str:
+        try:
+            response = await self.client.post("/chat/completions", json=payload)
+            if span is not None:
+                span.set(http_status=response.status_code, response_bytes=len(response.content))
+            response.raise_for_status()
+            data = response.json()
+        except Exception as e:
+            typed = classify_error(e, payload["model"])
+            if typed is e:
+                raise
+            raise typed from e
+
+        self._set_usage(span, data.get("usage"))
+        choices = data.get("choices") or []
+        if not choices:
+            raise LLMError("Sunucu boş yanıt döndürdü", model=payload["model"])
+        return choices[0].get("message", {}).get("content") or ""
+
+    @retry(
+        stop=retry_stop,
+        wait=retry_wait,
+        retry=should_retry,
+        before=count_request,
+        reraise=True
+    )
+    async def generate(
+        self,
+        model: str,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        conversation: Optional[Conversation] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        stream: bool = False,
+        on_token: Optional[TokenCallback] = None,
+        seed: Optional[int] = None,
+        on_usage: Optional[UsageCallback] = None,
+        continuation: Optional[Continuation] = None,
+        profile: Optional[GenerationProfile] = None,
+        stop: Optional[List[str]] = None
+    ) -> str:
+        """Metni tamamlar (OllamaAdapter.generate ile aynı sözleşme)
+
+        continuation verilirse desteklenmediği işaretlenir; çağıran taraf
+        sonraki turlarda tüm sohbeti göndermelidir.
+        """
+        payload = self._build_request(
+            model, prompt, system_prompt, conversation, temperature, max_tokens,
+            stream=stream, seed=seed, profile=profile, stop=stop
+        )
+        span = self.tracer.start("/v1/chat/completions", payload)
+        span.set(backend=self.config.base_url)
+
+        started = time.perf_counter()
+        try:
+            if stream:
+                result = await collect_stream(self._stream_tokens(payload, span), on_token=on_token)
+            else:
+                result = await self._post_request(payload, span)
+        except asyncio.CancelledError:
+            span.finish("cancelled")
+            raise
+        except Exception as e:
+            span.finish("error", error=e)
+            print(f"[ERROR] {model} çağrısı başarısız ({self.name}): {type(e).__name__}: {e}")
+            raise
+
+        # Sunucu süre bilgisi döndürmediği için istemci tarafında ölçülür
+        span.set(total_ms=round((time.perf_counter() - started) * 1000, 3))
+        if continuation is not None:
+            continuation.update(None, prompt_tokens=span.record.get("prompt_tokens") or 0)
+        span.finish("ok", response=result)
+        self._record_usage(model, span.record, on_usage)
+        return result
+
+    async def generate_stream(
+        self,
+        model: str,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        conversation: Optional[Conversation] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        seed: Optional[int] = None,
+        profile: Optional[GenerationProfile] = None,
+        stop: Optional[List[str]] = None
+    ) -> AsyncIterator[str]:
+        """Metni token token üretir"""
+        payload = self._build_request(
+            model, prompt, system_prompt, conversation, temperature, max_tokens,
+            stream=True, seed=seed, profile=profile, stop=stop
+        )
+        span = self.tracer.start("/v1/chat/completions", payload)
+        span.set(backend=self.config.base_url)
+
+        parts: List[str] = []
+        try:
+            async for token in self._stream_tokens(payload, span):
+                parts.append(token)
+                yield token
+        except BaseException as e:
+            status = "error" if isinstance(e, Exception) else "cancelled"
+            span.finish(status, response="".join(parts), error=e if status == "error" else None)
+            raise
+        span.finish("ok", response="".join(parts))
+
+    async def _embed_batch(self, model: str, texts: List[str]) -> List[List[float]]:
+        """Tek bir /embeddings isteğiyle metin grubunu embed eder"""
+        try:
+            response = await self.client.post("/embeddings", json={"model": model, "input": texts})
+            response.raise_for_status()
+            data = response.json().get("data") or []
+        except Exception as e:
+            typed = classify_error(e, model)
+            if typed is e:
+                raise
+            raise typed from e
+        return [item["embedding"] for item in sorted(data, key=lambda item: item.get("index", 0))]
+
+    def retry_stats(self) -> Dict[str, Any]:
+        return self.retry_budget.stats()
+
+    def stats(self) -> Dict[str, Any]:
+        """Sunucu adı, adresi, kullanım ve yeniden deneme bilgileri"""
+        return {
+            "name": self.name,
+            "base_url": self.config.base_url,
+            "usage": self.usage_stats(),
+            "retry_budget": self.retry_budget.stats(),
+        }
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+        if self._owns_tracer:
+            self.tracer.close()
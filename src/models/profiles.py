@@ -0,0 +1,136 @@
+import json
+import os
+import re
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+# Ollama'nın bağlam penceresi 2'nin kuvvetlerine yuvarlanır; böylece
+# benzer uzunluktaki istekler aynı num_ctx ile gelir ve model yeniden yüklenmez
+_MIN_CONTEXT = 2048
+
+# "ui" rolde ayrı bir kelime olarak geçmeli ("builder", "guide" eşleşmez; "ui_designer", "ux/ui" eşleşir)
+_UI_ROLE = re.compile(r"(?<![a-z])(ui|ux)(?![a-z])")
+
+
+def estimate_tokens(text: Optional[str]) -> int:
+    """Metnin yaklaşık token sayısı (Türkçe ve kod için temkinli: ~3 karakter/token)"""
+    if not text:
+        return 0
+    return len(text) // 3 + 1
+
+
+def context_size(prompt_tokens: int, num_predict: Optional[int], min_ctx: int, max_ctx: int) -> int:
+    """Prompt ve yanıtın sığacağı en küçük 2'nin kuvveti bağlam penceresi"""
+    # Yanıt uzunluğu sınırsızsa en az min_ctx kadar yer bırak
+    needed = prompt_tokens + (num_predict if num_predict and num_predict > 0 else min_ctx)
+    size = max(min_ctx, _MIN_CONTEXT)
+    while size < needed and size < max_ctx:
+        size *= 2
+    return min(size, max_ctx)
+
+
+class GenerationProfile(BaseModel):
+    """Ollama `options` alanına çevrilen üretim ayarları"""
+    name: str = "default"
+    temperature: float = 0.7
+    # Üretilecek en fazla token (None = sınırsız)
+    num_predict: Optional[int] = None
+    # Sabit bağlam penceresi; None ise prompt uzunluğuna göre min_ctx-max_ctx arasında seçilir
+    num_ctx: Optional[int] = None
+    min_ctx: int = 2048
+    max_ctx: int = 16384
+    stop: List[str] = Field(default_factory=list)
+    seed: Optional[int] = None
+
+    def options(
+        self,
+        prompt_tokens: int = 0,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        seed: Optional[int] = None,
+        stop: Optional[List[str]] = None,
+        context_limit: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Ollama istek seçeneklerini oluşturur (açıkça verilen değerler profili ezer)
+
+        context_limit modelin desteklediği en büyük bağlam uzunluğudur.
+        """
+        num_predict = max_tokens if max_tokens else self.num_predict
+        max_ctx = min(self.max_ctx, context_limit) if context_limit else self.max_ctx
+        num_ctx = self.num_ctx or context_size(prompt_tokens, num_predict, self.min_ctx, max_ctx)
+        if context_limit:
+            num_ctx = min(num_ctx, context_limit)
+
+        options: Dict[str, Any] = {
+            "temperature": self.temperature if temperature is None else temperature,
+            "num_ctx": num_ctx,
+        }
+        if num_predict:
+            options["num_predict"] = num_predict
+        stop = self.stop if stop is None else stop
+        if stop:
+            options["stop"] = list(stop)
+        seed = self.seed if seed is None else seed
+        if seed is not None:
+            options["seed"] = seed
+        return options
+
+
+DEFAULT_PROFILE = GenerationProfile()
+
+# Rol bazlı varsayılan profiller: lider tam çözüm yazar, diğerleri
+# değerlendirme ürettiği için yanıtları kısa tutulur
+PROFILES: Dict[str, GenerationProfile] = {
+    "default": DEFAULT_PROFILE,
+    "leader": GenerationProfile(name="leader", temperature=0.7, num_predict=4096, max_ctx=16384),
+    "developer": GenerationProfile(name="developer", temperature=0.7, num_predict=4096, max_ctx=16384),
+    "architect": GenerationProfile(name="architect", temperature=0.5, num_predict=2048, max_ctx=8192),
+    "tester": GenerationProfile(name="tester", temperature=0.3, num_predict=1536, max_ctx=8192),
+    "ui": GenerationProfile(name="ui", temperature=0.6, num_predict=2048, max_ctx=8192),
+    "reviewer": GenerationProfile(name="reviewer", temperature=0.3, num_predict=1024, max_ctx=8192),
+}
+
+
+def load_profiles_from_env() -> Dict[str, GenerationProfile]:
+    """GENERATION_PROFILES çevre değişkenindeki JSON ile profilleri günceller
+
+    Örnek: {"tester": {"num_predict": 800}, "leader": {"num_ctx": 8192}}
+    """
+    profiles = dict(PROFILES)
+    overrides = os.getenv("GENERATION_PROFILES", "")
+    if not overrides:
+        return profiles
+    try:
+        for name, values in json.loads(overrides).items():
+            base = profiles.get(name, DEFAULT_PROFILE)
+            profiles[name] = base.model_copy(update={**values, "name": name})
+    except (ValueError, AttributeError, TypeError) as e:
+        print(f"GENERATION_PROFILES okunamadı, varsayılan profiller kullanılıyor: {e}")
+        return dict(PROFILES)
+    return profiles
+
+
+def is_ui_role(role: Optional[str]) -> bool:
+    """Rolün arayüz tasarımı rolü olup olmadığını döndürür ("ui"/"ux" kelime olarak geçmeli; "build" eşleşmez)"""
+    role = (role or "").lower()
+    return bool(_UI_ROLE.search(role)) or "design" in role
+
+
+def profile_for_role(role: Optional[str], profiles: Optional[Dict[str, GenerationProfile]] = None) -> GenerationProfile:
+    """Ajan rolüne uygun profili döndürür (roller serbest metin olduğu için anahtar kelimeyle eşlenir)"""
+    profiles = profiles or PROFILES
+    role = (role or "").lower()
+    if role in ["lead", "leader", "lead developer", "team lead", "senior"] or "leader" in role:
+        name = "leader"
+    elif "develop" in role:
+        name = "developer"
+    elif "architect" in role:
+        name = "architect"
+    elif "test" in role:
+        name = "tester"
+    elif is_ui_role(role):
+        name = "ui"
+    else:
+        name = "reviewer"
+    return profiles.get(name, profiles.get("default", DEFAULT_PROFILE))
@@ -0,0 +1,221 @@
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+from pydantic import BaseModel, Field
+
+from src.models.backends import BackendPool, normalize_model_name
+from src.models.errors import ModelNotFoundError
+
+
+class RegisteredModel(BaseModel):
+    """Sunucularda pull edilmiş bir modelin özet bilgisi"""
+    name: str
+    size: int = 0
+    digest: Optional[str] = None
+    family: Optional[str] = None
+    parameter_size: Optional[str] = None
+    quantization_level: Optional[str] = None
+    context_length: Optional[int] = None
+    # Modelin pull edildiği sunucular
+    backends: List[str] = Field(default_factory=list)
+
+
+def _context_length(show: Dict[str, Any]) -> Optional[int]:
+    """/api/show çıktısından modelin bağlam uzunluğunu bulur (ör. "llama.context_length")"""
+    for key, value in (show.get("model_info") or {}).items():
+        if key.endswith(".context_length") and isinstance(value, int):
+            return value
+    return None
+
+
+class ModelRegistry:
+    """Ollama modellerinin TTL ile yenilenen bellek içi indeksi
+
+    /api/tags ve /api/show sonuçları arka planda ttl_seconds aralıkla
+    yenilenir; model adı -> boyut, aile, bağlam uzunluğu ve yüklü olma
+    bilgisi her istekte HTTP çağrısı yapmadan okunur. Çekilmemiş (pull
+    edilmemiş) modellere yapılan çağrılar sunucuya gitmeden reddedilir.
+    """
+
+    def __init__(self, pool: BackendPool, ttl_seconds: float = 60.0, miss_refresh_seconds: float = 5.0):
+        self.pool = pool
+        self.ttl_seconds = ttl_seconds
+        # Bilinmeyen model sorulduğunda en fazla bu sıklıkla arka planda yenile
+        self.miss_refresh_seconds = miss_refresh_seconds
+        self.models: Dict[str, RegisteredModel] = {}
+        # digest -> /api/show çıktısı (model değişmedikçe yeniden sorgulanmaz)
+        self._show_cache: Dict[str, Dict[str, Any]] = {}
+        self.last_refresh: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.refreshes = 0
+        self.rejected = 0
+        self._refresh_lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._loop_task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        """En az bir kez başarıyla yenilendiyse True (o zamana kadar hiçbir model reddedilmez)"""
+        return self.last_refresh is not None
+
+    def is_stale(self) -> bool:
+        return self.last_refresh is None or time.monotonic() - self.last_refresh > self.ttl_seconds
+
+    def get(self, model: str) -> Optional[RegisteredModel]:
+        return self.models.get(normalize_model_name(model))
+
+    def has(self, model: str) -> bool:
+        return normalize_model_name(model) in self.models
+
+    def names(self) -> List[str]:
+        return list(self.models.keys())
+
+    def is_loaded(self, model: str) -> bool:
+        """Model herhangi bir sunucuda bellekte mi"""
+        name = normalize_model_name(model)
+        return any(name in backend.loaded_models for backend in self.pool.backends)
+
+    def ensure_available(self, model: str) -> None:
+        """Model pull edilmemişse HTTP çağrısı yapmadan ModelNotFoundError fırlatır"""
+        if not self.ready or self.has(model):
+            return
+        self.rejected += 1
+        # Yeni pull edilmiş olabilir: istek beklemeden indeksi arka planda tazele
+        if time.monotonic() - self.last_refresh > self.miss_refresh_seconds:
+            self.refresh_in_background()
+        raise ModelNotFoundError(
+            f"Model bulunamadı: {model}. Önce 'ollama pull {model}' ile indirin.",
+            model=model
+        )
+
+    async def _fetch_tags(self) -> Dict[str, RegisteredModel]:
+        responses = await asyncio.gather(
+            *(backend.client.get("/api/tags") for backend in self.pool.backends),
+            return_exceptions=True
+        )
+        models: Dict[str, RegisteredModel] = {}
+        errors = []
+        for backend, response in zip(self.pool.backends, responses):
+            if isinstance(response, BaseException):
+                errors.append(response)
+                continue
+            try:
+                response.raise_for_status()
+                tags = response.json().get("models", [])
+            except (httpx.HTTPError, ValueError) as e:
+                errors.append(e)
+                continue
+            for tag in tags:
+                name = normalize_model_name(tag["name"])
+                entry = models.get(name)
+                if entry is None:
+                    details = tag.get("details") or {}
+                    entry = RegisteredModel(
+                        name=name,
+                        size=tag.get("size") or 0,
+                        digest=tag.get("digest"),
+                        family=details.get("family"),
+                        parameter_size=details.get("parameter_size"),
+                        quantization_level=details.get("quantization_level"),
+                    )
+                    models[name] = entry
+                entry.backends.append(backend.base_url)
+        if errors and len(errors) == len(self.pool.backends):
+            raise errors[0]
+        return models
+
+    async def _fetch_show(self, entry: RegisteredModel) -> Optional[Dict[str, Any]]:
+        cache_key = entry.digest or entry.name
+        if cache_key in self._show_cache:
+            return self._show_cache[cache_key]
+        try:
+            async with self.pool.use() as backend:
+                response = await backend.client.post("/api/show", json={"name": entry.name})
+                response.raise_for_status()
+                show = response.json()
+        except (httpx.HTTPError, ValueError):
+            return None
+        self._show_cache[cache_key] = show
+        return show
+
+    async def refresh(self) -> Dict[str, RegisteredModel]:
+        """/api/tags ve (değişen modeller için) /api/show ile indeksi yeniler"""
+        async with self._refresh_lock:
+            try:
+                models = await self._fetch_tags()
+            except (httpx.HTTPError, ValueError) as e:
+                self.last_error = str(e)
+                return self.models
+
+            shows = await asyncio.gather(*(self._fetch_show(entry) for entry in models.values()))
+            for entry, show in zip(models.values(), shows):
+                if show:
+                    entry.context_length = _context_length(show)
+
+            # Silinmiş modellerin /api/show kayıtlarını unut
+            digests = {entry.digest or entry.name for entry in models.values()}
+            self._show_cache = {k: v for k, v in self._show_cache.items() if k in digests}
+
+            self.models = models
+            self.last_refresh = time.monotonic()
+            self.last_error = None
+            self.refreshes += 1
+            return models
+
+    async def ensure_fresh(self) -> Dict[str, RegisteredModel]:
+        """İndeks eskimişse yeniler, değilse bellekteki indeksi döndürür"""
+        if self.is_stale():
+            return await self.refresh()
+        return self.models
+
+    async def show(self, model: str) -> Dict[str, Any]:
+        """Modelin /api/show çıktısı (model değişmedikçe önbellekten)"""
+        await self.ensure_fresh()
+        entry = self.get(model) or RegisteredModel(name=normalize_model_name(model))
+        return await self._fetch_show(entry) or {}
+
+    def refresh_in_background(self) -> None:
+        if self._refresh_task is None or self._refresh_task.done():
+            try:
+                self._refresh_task = asyncio.get_running_loop().create_task(self.refresh())
+            except RuntimeError:
+                pass
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                self.last_error = str(e)
+                print(f"Model listesi yenilenemedi: {e}")
+            await asyncio.sleep(self.ttl_seconds)
+
+    def start(self) -> None:
+        """İndeksi arka planda TTL aralığıyla yenilemeye başlar"""
+        if self.ttl_seconds > 0 and (self._loop_task is None or self._loop_task.done()):
+            self._loop_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        for task in (self._loop_task, self._refresh_task):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "ttl_seconds": self.ttl_seconds,
+            "age_seconds": time.monotonic() - self.last_refresh if self.last_refresh is not None else None,
+            "refreshes": self.refreshes,
+            "rejected": self.rejected,
+            "last_error": self.last_error,
+            "models": {
+                name: {**entry.model_dump(), "loaded": self.is_loaded(name)}
+                for name, entry in self.models.items()
+            },
+        }
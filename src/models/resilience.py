@@ -0,0 +1,172 @@
+import random
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from tenacity import RetryCallState
+
+from src.models.errors import LLMError
+
+
+def jittered_backoff(attempt: int, base: float = 0.5, cap: float = 10.0) -> float:
+    """Tam jitter'lı üstel bekleme süresi (saniye); attempt 1'den başlar"""
+    return random.uniform(0, min(cap, base * (2 ** (attempt - 1))))
+
+
+# tenacity @retry kancaları: ilk argüman (self) config.retry_* alanları ve
+# retry_budget özniteliği olan bir LLM sunucusu bağdaştırıcısıdır
+
+def retry_stop(retry_state: RetryCallState) -> bool:
+    adapter = retry_state.args[0]
+    return retry_state.attempt_number >= adapter.config.retry_attempts
+
+
+def retry_wait(retry_state: RetryCallState) -> float:
+    adapter = retry_state.args[0]
+    return jittered_backoff(
+        retry_state.attempt_number,
+        base=adapter.config.retry_backoff_base,
+        cap=adapter.config.retry_backoff_max,
+    )
+
+
+def should_retry(retry_state: RetryCallState) -> bool:
+    """Yalnızca geçici hatalar ve ortak bütçe izin veriyorsa tekrar dener"""
+    error = retry_state.outcome.exception()
+    if not isinstance(error, LLMError) or not error.retryable:
+        return False
+    # Son denemede bütçe harcanmasın
+    if retry_stop(retry_state):
+        return False
+    return retry_state.args[0].retry_budget.try_spend()
+
+
+def count_request(retry_state: RetryCallState) -> None:
+    if retry_state.attempt_number == 1:
+        retry_state.args[0].retry_budget.record_request()
+
+
+class RetryBudget:
+    """Tüm çağrılar için ortak yeniden deneme bütçesi
+
+    Son window_seconds içindeki yeniden denemeler, aynı süredeki isteklerin
+    ratio oranını (en az min_retries) aşamaz. Ollama çöktüğünde her
+    çağrının kendi başına üç kez denemesi yükü katlamaz.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_retries: int = 3, window_seconds: float = 10.0):
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.window_seconds = window_seconds
+        self._requests: Deque[float] = deque()
+        self._retries: Deque[float] = deque()
+        self.exhausted = 0
+
+    def _trim(self, now: float) -> None:
+        cutoff = now - self.window_seconds
+        for events in (self._requests, self._retries):
+            while events and events[0] < cutoff:
+                events.popleft()
+
+    def record_request(self) -> None:
+        """Yeni bir (ilk deneme) çağrıyı bütçeye işler"""
+        now = time.monotonic()
+        self._trim(now)
+        self._requests.append(now)
+
+    def try_spend(self) -> bool:
+        """Bütçe izin veriyorsa bir yeniden deneme hakkı harcar"""
+        now = time.monotonic()
+        self._trim(now)
+        allowed = max(self.min_retries, int(len(self._requests) * self.ratio))
+        if len(self._retries) >= allowed:
+            self.exhausted += 1
+            return False
+        self._retries.append(now)
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        self._trim(time.monotonic())
+        return {
+            "ratio": self.ratio,
+            "min_retries": self.min_retries,
+            "window_seconds": self.window_seconds,
+            "requests_in_window": len(self._requests),
+            "retries_in_window": len(self._retries),
+            "exhausted": self.exhausted,
+        }
+
+
+class CircuitBreaker:
+    """Kapalı / açık / yarı açık devre kesici
+
+    Art arda failure_threshold hatada devre reset_seconds boyunca açılır ve
+    çağrılar hemen reddedilir. Süre dolunca tek bir deneme isteğine izin
+    verilir (yarı açık); başarılı olursa devre kapanır, başarısız olursa
+    yeniden açılır.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 3, reset_seconds: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        self.probe_in_flight = False
+        self.opened = 0
+
+    def state(self, now: Optional[float] = None) -> str:
+        if self.consecutive_failures < self.failure_threshold:
+            return self.CLOSED
+        if (now or time.monotonic()) < self.open_until:
+            return self.OPEN
+        return self.HALF_OPEN
+
+    def available(self, now: Optional[float] = None) -> bool:
+        """Çağrıya izin verilip verilmeyeceği (durumu değiştirmez)"""
+        state = self.state(now)
+        if state == self.CLOSED:
+            return True
+        return state == self.HALF_OPEN and not self.probe_in_flight
+
+    def retry_after(self, now: Optional[float] = None) -> float:
+        """Devrenin tekrar deneme kabul edeceği zamana kalan süre"""
+        return max(0.0, self.open_until - (now or time.monotonic()))
+
+    def on_dispatch(self) -> bool:
+        """Çağrı gönderilirken çağrılır; yarı açık durumda deneme isteğini işaretler"""
+        if self.state() == self.HALF_OPEN:
+            self.probe_in_flight = True
+            return True
+        return False
+
+    def release_probe(self) -> None:
+        """Sonuçlanmadan biten (ör. iptal edilen) deneme isteğinin işaretini kaldırır"""
+        self.probe_in_flight = False
+
+    def record_success(self) -> None:
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        self.probe_in_flight = False
+
+    def record_failure(self) -> bool:
+        """Hatayı işler; devre bu hatayla açıldıysa True döner"""
+        self.consecutive_failures += 1
+        self.probe_in_flight = False
+        if self.consecutive_failures >= self.failure_threshold:
+            self.open_until = time.monotonic() + self.reset_seconds
+            self.opened += 1
+            return True
+        return False
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "state": self.state(now),
+            "consecutive_failures": self.consecutive_failures,
+            "retry_after": self.retry_after(now),
+            "opened": self.opened,
+        }
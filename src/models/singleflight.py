@@ -0,0 +1,73 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+
+class _Call:
+    """Devam eden paylaşılan çağrı"""
+
+    def __init__(self, task: "asyncio.Task"):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Aynı anahtara sahip eşzamanlı çağrıları tek bir upstream çağrısında birleştirir
+
+    İlk çağıran işi başlatır, aynı anahtarla gelen diğer çağıranlar aynı
+    sonucu bekler. Bir bekleyicinin iptali paylaşılan çağrıyı iptal etmez;
+    paylaşılan çağrı yalnızca son bekleyici de vazgeçtiğinde iptal edilir.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, _Call] = {}
+        self.counters = {
+            "leaders": 0,
+            "coalesced": 0,
+            "abandoned": 0,
+        }
+
+    def _forget(self, key: str, call: _Call) -> None:
+        """Biten çağrıyı tablodan kaldırır"""
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        # Bekleyicisi kalmamış çağrının hatası "retrieve edilmedi" uyarısı üretmesin
+        if not call.task.cancelled():
+            call.task.exception()
+
+    async def do(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """factory() sonucunu döndürür; ikinci değer sonucun paylaşılıp paylaşılmadığıdır"""
+        call = self._calls.get(key)
+        shared = call is not None
+
+        if call is None:
+            call = _Call(asyncio.ensure_future(factory()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _, k=key, c=call: self._forget(k, c))
+            self.counters["leaders"] += 1
+        else:
+            self.counters["coalesced"] += 1
+
+        call.waiters += 1
+        try:
+            # shield: bu bekleyicinin iptali paylaşılan görevi iptal etmesin
+            result = await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            if call.waiters == 1 and not call.task.done():
+                # Son bekleyici de vazgeçti, upstream çağrısını boşuna sürdürme
+                call.task.cancel()
+                # Yeni gelen çağrılar iptal edilmekte olan göreve bağlanmasın
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+                self.counters["abandoned"] += 1
+            raise
+        finally:
+            call.waiters -= 1
+
+        return result, shared
+
+    def stats(self) -> Dict[str, Any]:
+        """Birleştirme sayaçlarını ve devam eden çağrı sayısını döndürür"""
+        return {
+            **self.counters,
+            "in_flight": len(self._calls),
+        }
@@ -2,8 +2,23 @@ from datetime import datetime
 from typing import List, Dict, Optional, Any
 import uuid
 
+from src.utils.frozen import FreezableField, freeze_min_bytes
+from src.utils.task_logs import TaskLog
+
 class Task:
-    """Takım tarafından gerçekleştirilecek görev"""
+    """Takım tarafından gerçekleştirilecek görev
+
+    Tamamlanan görevlerin büyük alanları (sonuç, alt görev sonuçları,
+    iterasyonlar, değerlendirmeler) freeze() ile bellekte sıkıştırılır;
+    öznitelikler okunduğunda açılır.
+    """
+
+    result = FreezableField()
+    subtask_results = FreezableField()
+    team_evaluation = FreezableField()
+    iterations = FreezableField()
+    document_evaluations = FreezableField()
+    FROZEN_FIELDS = ("result", "subtask_results", "team_evaluation", "iterations", "document_evaluations")
     
     def __init__(self, title: str, description: str, team_id: str):
         """
@@ -28,10 +43,12 @@ class Task:
         self.document_evaluations: Dict[str, List[Dict]] = {}
         self.created_at = datetime.now().isoformat()
         self.updated_at = datetime.now().isoformat()
-        self.logs = []  # İşlem logları
+        self.logs = TaskLog()  # İşlem logları (son kayıtlar; tüm geçmiş log deposunda)
         self.progress = 0  # İlerleme yüzdesi
         self.status_message = None  # Durum açıklaması
         self.is_active = False  # Aktif olup olmadığı
+        # LLM token/süre kullanımı: {"total": {...}, "agents": {agent_id: {...}}}
+        self.usage: Dict[str, Dict] = {"total": {}, "agents": {}}
 
     def add_subtask(self, subtask_id: str, title: str, description: str, assigned_agent_id: Optional[str] = None):
         """Alt görev ekle"""
@@ -69,6 +86,24 @@ class Task:
         self.updated_at = datetime.now().isoformat()
         return document_id
 
+    def _field(self, name: str) -> Any:
+        """Alanın değeri (dondurulmuş alan öznitelikte açılmaz)"""
+        return getattr(type(self), name).peek(self)
+
+    def freeze(self, min_bytes: Optional[int] = None) -> int:
+        """Büyük alanları sıkıştırır; dondurulan alan sayısını döndürür"""
+        if min_bytes is None:
+            min_bytes = freeze_min_bytes()
+        return sum(getattr(type(self), name).freeze(self, min_bytes) for name in self.FROZEN_FIELDS)
+
+    def frozen_stats(self) -> Dict[str, int]:
+        """Dondurulmuş alan sayısı, açık ve sıkıştırılmış boyutları"""
+        stats = {"fields": 0, "raw_bytes": 0, "bytes": 0}
+        for name in self.FROZEN_FIELDS:
+            for key, value in getattr(type(self), name).stats(self).items():
+                stats[key] += value
+        return stats
+
     def to_dict(self) -> Dict:
         """Nesneyi sözlüğe dönüştür"""
         return {
@@ -78,18 +113,19 @@ class Task:
             "team_id": self.team_id,
             "status": self.status,
             "subtasks": self.subtasks,
-            "result": self.result,
-            "subtask_results": self.subtask_results,
-            "team_evaluation": self.team_evaluation,
-            "iterations": self.iterations,
+            "result": self._field("result"),
+            "subtask_results": self._field("subtask_results"),
+            "team_evaluation": self._field("team_evaluation"),
+            "iterations": self._field("iterations"),
             "documents": self.documents,
-            "document_evaluations": self.document_evaluations,
+            "document_evaluations": self._field("document_evaluations"),
             "created_at": self.created_at,
             "updated_at": self.updated_at,
-            "logs": self.logs,
+            "log_count": self.logs.total,
             "progress": self.progress,
             "status_message": self.status_message,
-            "is_active": self.is_active
+            "is_active": self.is_active,
+            "usage": self.usage
         }
 
     @classmethod
@@ -111,8 +147,9 @@ class Task:
         task.document_evaluations = data["document_evaluations"]
         task.created_at = data["created_at"]
         task.updated_at = data["updated_at"]
-        task.logs = data["logs"]
+        task.logs = TaskLog(data.get("logs", []), data.get("log_count"))
         task.progress = data["progress"]
         task.status_message = data["status_message"]
         task.is_active = data["is_active"]
+        task.usage = data.get("usage", {"total": {}, "agents": {}})
         return task 
\ No newline at end of file
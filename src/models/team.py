@@ -42,6 +42,7 @@ class AgentConfig(BaseModel):
     name: str = Field(..., description="Ajan adı")
     role: AgentRole = Field(..., description="Ajan rolü")
     model_name: str = Field(..., description="Kullanılan LLM modeli")
+    backend: Optional[str] = Field(None, description="LLM sunucusu adı (boşsa varsayılan Ollama)")
     system_prompt: str = Field(..., description="Sistem komutu")
     required_capabilities: Set[ModelCapability] = Field(
         default_factory=set, description="Gerekli model yetenekleri"
@@ -0,0 +1,220 @@
+import contextvars
+import json
+import os
+import queue
+import random
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+# Çağrıyı başlatan görev/ajan gibi bilgiler; iz kayıtlarına otomatik eklenir
+_trace_context: contextvars.ContextVar[Dict[str, Any]] = contextvars.ContextVar("llm_trace_context", default={})
+
+
+@contextmanager
+def trace_context(**fields: Any) -> Iterator[None]:
+    """Bu blok içindeki LLM çağrılarının iz kayıtlarına alan ekler (ör. task_id, agent_id)"""
+    token = _trace_context.set({**_trace_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _trace_context.reset(token)
+
+
+def _truncate(text: Optional[str], limit: int) -> Optional[str]:
+    if text is None or limit <= 0:
+        return None
+    return text if len(text) <= limit else text[:limit] + "…"
+
+
+class JsonlTraceSink:
+    """İz kayıtlarını arka plan thread'inde JSONL dosyasına yazar
+
+    emit() yalnızca kuyruğa ekler ve olay döngüsünü hiç bloklamaz; kuyruk
+    doluysa kayıt düşürülür ve sayılır.
+    """
+
+    def __init__(self, path: str, max_queue: int = 10000):
+        self.path = path
+        self.dropped = 0
+        self.written = 0
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, name="llm-trace-writer", daemon=True)
+        self._thread.start()
+
+    def emit(self, record: Dict[str, Any]) -> None:
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            while True:
+                record = self._queue.get()
+                if record is None:
+                    break
+                f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+                self.written += 1
+                # Kuyrukta bekleyen yoksa diske aktar
+                if self._queue.empty():
+                    f.flush()
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Bekleyen kayıtları yazar ve thread'i durdurur"""
+        if not self._thread.is_alive():
+            return
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "queued": self._queue.qsize(),
+            "written": self.written,
+            "dropped": self.dropped,
+        }
+
+
+class TraceSpan:
+    """Tek bir LLM çağrısının iz kaydı"""
+
+    __slots__ = ("tracer", "record", "sampled", "_started", "_prompt")
+
+    def __init__(self, tracer: "Tracer", record: Dict[str, Any], sampled: bool, prompt: Optional[str]):
+        self.tracer = tracer
+        self.record = record
+        self.sampled = sampled
+        self._started = time.perf_counter()
+        self._prompt = prompt
+
+    def set(self, **fields: Any) -> None:
+        """Kayda alan ekler (ör. backend, http_status)"""
+        self.record.update(fields)
+
+    def mark_first_token(self) -> None:
+        """İlk token zamanını bir kez kaydeder"""
+        if "first_token_ms" not in self.record:
+            self.record["first_token_ms"] = round((time.perf_counter() - self._started) * 1000, 2)
+
+    def finish(self, status: str = "ok", response: Optional[str] = None, error: Optional[BaseException] = None) -> None:
+        """Kaydı tamamlar ve (örneklendiyse veya hata varsa) sink'e gönderir"""
+        if "duration_ms" in self.record:
+            return
+        record = self.record
+        record["status"] = status
+        record["duration_ms"] = round((time.perf_counter() - self._started) * 1000, 2)
+        if response is not None:
+            record["response_chars"] = len(response)
+        if error is not None:
+            record["error_type"] = type(error).__name__
+            record["error"] = _truncate(str(error), 500)
+        self.tracer._finish(self, response)
+
+
+class Tracer:
+    """Örneklemeli, yapılandırılmış LLM çağrı izleri
+
+    Her çağrı için kimlik, model, boyut, süre ve durum içeren bir kayıt
+    oluşturur. Başarılı çağrılar sample_rate oranında örneklenir, hatalar
+    her zaman kaydedilir. Prompt/yanıt metni yalnızca capture_chars > 0
+    ise ve en fazla o kadar karakter saklanır.
+    """
+
+    def __init__(
+        self,
+        sample_rate: float = 1.0,
+        capture_chars: int = 0,
+        sink: Optional[JsonlTraceSink] = None,
+        recent_size: int = 100
+    ):
+        self.sample_rate = sample_rate
+        self.capture_chars = capture_chars
+        self.sink = sink
+        self.recent: Deque[Dict[str, Any]] = deque(maxlen=recent_size)
+        self.counters = {
+            "started": 0,
+            "recorded": 0,
+            "sampled_out": 0,
+            "errors": 0,
+        }
+
+    @classmethod
+    def from_env(cls) -> "Tracer":
+        """OLLAMA_TRACE_* çevre değişkenlerinden izleyici oluşturur"""
+        path = os.getenv("OLLAMA_TRACE_FILE", "logs/llm_traces.jsonl")
+        return cls(
+            sample_rate=float(os.getenv("OLLAMA_TRACE_SAMPLE_RATE") or "1.0"),
+            capture_chars=int(os.getenv("OLLAMA_TRACE_CAPTURE_CHARS") or "0"),
+            sink=JsonlTraceSink(path) if path else None,
+            recent_size=int(os.getenv("OLLAMA_TRACE_RECENT") or "100"),
+        )
+
+    def start(self, endpoint: str, payload: Dict[str, Any]) -> TraceSpan:
+        """İstek için yeni bir iz kaydı başlatır"""
+        self.counters["started"] += 1
+        sampled = self.sample_rate >= 1.0 or random.random() < self.sample_rate
+
+        if "messages" in payload:
+            messages = payload.get("messages") or []
+            prompt = messages[-1].get("content", "") if messages else ""
+            prompt_chars = sum(len(m.get("content", "")) for m in messages)
+        else:
+            prompt = payload.get("prompt", "")
+            prompt_chars = len(prompt) + len(payload.get("system", ""))
+
+        record: Dict[str, Any] = {
+            "trace_id": uuid.uuid4().hex,
+            "timestamp": time.time(),
+            "endpoint": endpoint,
+            "model": payload.get("model"),
+            "stream": bool(payload.get("stream")),
+            "prompt_chars": prompt_chars,
+            **_trace_context.get(),
+        }
+        if "messages" in payload:
+            record["messages"] = len(payload.get("messages") or [])
+        return TraceSpan(self, record, sampled, prompt)
+
+    def _finish(self, span: TraceSpan, response: Optional[str]) -> None:
+        record = span.record
+        is_error = record["status"] == "error"
+        if is_error:
+            self.counters["errors"] += 1
+        if not span.sampled and not is_error:
+            self.counters["sampled_out"] += 1
+            return
+
+        if self.capture_chars > 0:
+            record["prompt"] = _truncate(span._prompt, self.capture_chars)
+            record["response"] = _truncate(response, self.capture_chars)
+
+        self.counters["recorded"] += 1
+        self.recent.append(record)
+        if self.sink is not None:
+            self.sink.emit(record)
+
+    def recent_traces(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Son kaydedilen izleri (yeniden eskiye) döndürür"""
+        return list(self.recent)[-limit:][::-1]
+
+    def close(self) -> None:
+        if self.sink is not None:
+            self.sink.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "sample_rate": self.sample_rate,
+            "capture_chars": self.capture_chars,
+            **self.counters,
+            "sink": self.sink.stats() if self.sink is not None else None,
+        }
@@ -0,0 +1,70 @@
+from typing import Any, Dict, Iterable, Optional
+
+# Ollama yanıtındaki süre alanları (nanosaniye) -> kullanım kaydındaki adları (milisaniye)
+_DURATION_FIELDS = {
+    "prompt_eval_duration": "prompt_eval_ms",
+    "eval_duration": "eval_ms",
+    "load_duration": "load_ms",
+    "total_duration": "total_ms",
+}
+
+# Toplanabilir kullanım alanları
+USAGE_FIELDS = (
+    "calls",
+    "prompt_tokens",
+    "completion_tokens",
+    "prompt_eval_ms",
+    "eval_ms",
+    "load_ms",
+    "total_ms",
+    "queue_ms",
+    "cached_calls",
+)
+
+
+def usage_from_response(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Ollama'nın son yanıt parçasındaki sayaç ve süreleri kullanım kaydına çevirir"""
+    usage: Dict[str, Any] = {
+        "prompt_tokens": data.get("prompt_eval_count") or 0,
+        "completion_tokens": data.get("eval_count") or 0,
+    }
+    for source, target in _DURATION_FIELDS.items():
+        usage[target] = round((data.get(source) or 0) / 1_000_000, 3)
+    return usage
+
+
+def merge_usage(target: Dict[str, Any], usage: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Bir çağrının (veya bir toplamın) kullanımını hedef toplama ekler"""
+    if not usage:
+        return target
+    for field in USAGE_FIELDS:
+        value = usage.get(field)
+        if value is None and field == "calls":
+            # Tekil çağrı kaydında "calls" alanı yoktur
+            value = 1
+        if value:
+            target[field] = round(target.get(field, 0) + value, 3)
+    return target
+
+
+def sum_usage(items: Iterable[Optional[Dict[str, Any]]]) -> Dict[str, Any]:
+    """Birden fazla kullanım toplamını birleştirir"""
+    total: Dict[str, Any] = {}
+    for usage in items:
+        merge_usage(total, usage)
+    return total
+
+
+def summarize_usage(totals: Dict[str, Any]) -> Dict[str, Any]:
+    """Toplamlara türetilmiş değerleri (token/s, ortalama yükleme ve kuyruk süresi) ekler"""
+    summary = {field: totals.get(field, 0) for field in USAGE_FIELDS}
+    calls = summary["calls"]
+    summary["tokens_per_second"] = (
+        round(summary["completion_tokens"] / (summary["eval_ms"] / 1000), 2) if summary["eval_ms"] else 0.0
+    )
+    summary["prompt_tokens_per_second"] = (
+        round(summary["prompt_tokens"] / (summary["prompt_eval_ms"] / 1000), 2) if summary["prompt_eval_ms"] else 0.0
+    )
+    summary["avg_load_ms"] = round(summary["load_ms"] / calls, 3) if calls else 0.0
+    summary["avg_queue_ms"] = round(summary["queue_ms"] / calls, 3) if calls else 0.0
+    return summary
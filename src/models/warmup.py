@@ -0,0 +1,132 @@
+import asyncio
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Union
+
+from src.models.backends import BackendPool, normalize_model_name
+from src.models.limiter import ModelConcurrencyLimiter
+
+
+class ModelWarmup:
+    """Model ön yükleme ve bellekte kalma (keep-alive) yönetimi
+
+    Başlangıçta ajanların kullandığı modelleri Ollama'ya yükletir ve
+    /api/ps sorgusuyla hangi modellerin hangi sunucuda bellekte olduğunu
+    izler; böylece bir çağrının soğuk (model yüklemesi gerektiren) olup
+    olmayacağı önceden bilinir.
+    """
+
+    def __init__(
+        self,
+        pool: BackendPool,
+        limiter: ModelConcurrencyLimiter,
+        keep_alive: Optional[Union[str, int]] = None,
+        poll_interval: float = 30.0
+    ):
+        self.pool = pool
+        self.limiter = limiter
+        self.keep_alive = keep_alive
+        self.poll_interval = poll_interval
+        self.last_poll: Optional[float] = None
+        # model -> son ön yükleme sonucu
+        self.warmup_results: Dict[str, Dict[str, Any]] = {}
+        self._poll_task: Optional[asyncio.Task] = None
+        self._warmup_task: Optional[asyncio.Task] = None
+
+    async def warm_model(self, model: str) -> bool:
+        """Modeli boş bir istekle belleğe yükletir"""
+        payload: Dict[str, Any] = {"model": model}
+        if self.keep_alive is not None:
+            payload["keep_alive"] = self.keep_alive
+
+        started = time.monotonic()
+        try:
+            async with self.limiter.acquire(model):
+                async with self.pool.use(model) as backend:
+                    response = await backend.client.post("/api/generate", json=payload)
+                    response.raise_for_status()
+            self.warmup_results[model] = {
+                "ok": True,
+                "backend": backend.base_url,
+                "seconds": time.monotonic() - started,
+            }
+            print(f"Model ön yüklendi: {model} ({backend.base_url})")
+            return True
+        except Exception as e:
+            self.warmup_results[model] = {"ok": False, "error": str(e)}
+            print(f"Model ön yüklenemedi: {model} - {e}")
+            return False
+
+    async def warm_up(self, models: Iterable[str]) -> Dict[str, bool]:
+        """Verilen modelleri sırayla ön yükler
+
+        Sıralı yükleme, CPU üzerinde aynı anda birden fazla modelin
+        yüklenip belleği zorlamasını önler.
+        """
+        results = {}
+        for model in models:
+            if not self.is_cold(model):
+                results[model] = True
+                continue
+            results[model] = await self.warm_model(model)
+        return results
+
+    async def refresh(self) -> Dict[str, List[str]]:
+        """Sunuculardaki yüklü modelleri /api/ps ile günceller"""
+        resident = await self.pool.refresh_loaded_models()
+        self.last_poll = time.time()
+        return resident
+
+    async def _poll_loop(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                print(f"Yüklü modeller sorgulanamadı: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    def start(self, models: Iterable[str] = ()) -> None:
+        """Ön yüklemeyi ve periyodik /api/ps sorgusunu arka planda başlatır"""
+        models = list(models)
+
+        async def run_warmup() -> None:
+            # Önce zaten yüklü olanları öğren, yalnızca soğuk modelleri yükle
+            await self.refresh()
+            await self.warm_up(models)
+
+        if models and (self._warmup_task is None or self._warmup_task.done()):
+            self._warmup_task = asyncio.create_task(run_warmup())
+        if self.poll_interval > 0 and (self._poll_task is None or self._poll_task.done()):
+            self._poll_task = asyncio.create_task(self._poll_loop())
+
+    async def stop(self) -> None:
+        """Arka plan görevlerini durdurur"""
+        for task in (self._warmup_task, self._poll_task):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+
+    def resident_models(self) -> Set[str]:
+        """Sağlıklı herhangi bir sunucuda bellekte olan modeller"""
+        now = time.monotonic()
+        resident: Set[str] = set()
+        for backend in self.pool.backends:
+            if backend.is_healthy(now):
+                resident |= backend.loaded_models
+        return resident
+
+    def is_cold(self, model: str) -> bool:
+        """Model hiçbir sağlıklı sunucuda yüklü değilse True (çağrı yükleme süresi öder)"""
+        return normalize_model_name(model) not in self.resident_models()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "keep_alive": self.keep_alive,
+            "poll_interval": self.poll_interval,
+            "last_poll": self.last_poll,
+            "resident_models": sorted(self.resident_models()),
+            "backends": {b.base_url: sorted(b.loaded_models) for b in self.pool.backends},
+            "warmup": self.warmup_results,
+        }
@@ -1,14 +1,31 @@
 import uuid
 import asyncio
+import contextlib
+import functools
+import itertools
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, Iterator, List, Optional, Any, Tuple
+import atexit
+import threading
 import json
 import os
 
+from src.models.errors import CircuitOpenError, LLMError
+from src.models.llm_backend import BackendRouter, LLMBackend
 from src.models.ollama import OllamaAdapter
+from src.models.profiles import is_ui_role, profile_for_role
+from src.models.tracing import trace_context
+from src.models.usage import merge_usage, sum_usage, summarize_usage
 from src.models.agent import Agent
 from src.models.task import Task
 from src.models.team import Team
+from src.utils import codec
+from src.utils.blobs import BLOB_SUFFIX, DOCUMENT_BLOB_FIELDS, SUBTASK_BLOB_FIELDS, BlobStore
+from src.utils.persistence import DebouncedWriter, Snapshot, copy_json
+from src.utils.storage import Storage, create_storage
+from src.utils.task_cache import LazyTaskMap
+from src.utils.task_logs import MAX_PAGE_SIZE, TaskLog, buffer_size
+from src.utils.transfer import export_lines, import_from
 from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -23,15 +40,51 @@ TASK_STATUS = {
     "cancelled": "İptal Edildi"
 }
 
+# Bellekten atılabilen (bir daha değişmesi beklenmeyen) görev durumları
+COLD_TASK_STATUSES = ("completed", "failed", "cancelled")
+
+
+def pins_task(method):
+    """Görev nesnesini await'ler boyunca tutan metotlarda görevi bellekte sabitler
+
+    Tembel yüklemede metot çalışırken görev bellekten atılmaz; atılsaydı
+    metodun elindeki nesneye yapılan sonraki değişiklikler kaybolurdu.
+    """
+    @functools.wraps(method)
+    async def wrapper(self, task_id, *args, **kwargs):
+        with self._pin_task(task_id):
+            return await method(self, task_id, *args, **kwargs)
+    return wrapper
+
+
+class _TaskChanges:
+    """Bir yazımda diske aktarılacak görev değişiklikleri
+
+    tasks: değişen görevlerin kopyaları, sizes: tahmini bellek boyutları,
+    deleted: silinen görev id'leri, marks: kopyalanan işaretler (görev id
+    -> işaret sırası).
+    """
+
+    __slots__ = ("tasks", "sizes", "deleted", "marks")
+
+    def __init__(self, marks: Dict[str, int]):
+        self.tasks: Dict[str, Snapshot] = {}
+        self.sizes: Dict[str, int] = {}
+        self.deleted: List[str] = []
+        self.marks = marks
+
+
 class TeamManager:
     """Takım yönetim sınıfı"""
     
-    def __init__(self, ollama_adapter=None):
+    def __init__(self, ollama_adapter=None, backends: Optional[BackendRouter] = None, storage: Optional[Storage] = None):
         """
         TeamManager sınıfının yapıcı metodu
         
         Args:
-            ollama_adapter: OllamaAdapter nesnesi
+            ollama_adapter: Varsayılan LLM sunucusu (OllamaAdapter)
+            backends: Ajan bazlı seçilebilen LLM sunucuları (verilmezse çevre değişkenlerinden)
+            storage: Veri deposu (verilmezse çevre değişkenlerinden)
         """
         self.teams = {}
         self.tasks = {}
@@ -40,129 +93,504 @@ class TeamManager:
         self.bugs = []
         self.messages = []
         self.ollama_adapter = ollama_adapter
+        if backends is None and ollama_adapter is not None:
+            backends = BackendRouter.from_env(ollama_adapter)
+        self.backends = backends
         self.available_models = []
         
         # Aktif görevler için izleme sistemi
         self.active_tasks = {}
         
+        # Kalıcı depolama (STORAGE_BACKEND: json, sharded veya sqlite)
+        self.storage = storage or create_storage()
+        # Doküman içerikleri ve alt görev sonuçları içerik özetiyle ayrı saklanır
+        self.blobs = BlobStore.from_env()
+        # Yeni log kayıtları olan görevler (görev id -> log); arka planda log deposuna eklenir
+        self._unsaved_logs: Dict[str, TaskLog] = {}
+        self._log_lock = threading.Lock()
+        # Son yazımdan bu yana değişen veya silinen görevler (görev id -> işaret sırası);
+        # yazıcı yalnızca bunları kopyalar, kayıt yazılınca işaret değişmediyse silinir
+        self._dirty_tasks: Dict[str, int] = {}
+        self._dirty_marks = itertools.count()
+        self._dirty_lock = threading.Lock()
+
+        # Tembel yükleme: açılışta yalnızca görev özetleri okunur, gövdeler ilk erişimde yüklenir
+        if os.getenv("TASK_LAZY_LOAD", "False").lower() == "true":
+            if self.storage.supports_lazy:
+                self.tasks = LazyTaskMap(
+                    self._hydrate_task,
+                    self._task_size,
+                    max_bytes=int(os.getenv("TASK_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+                    idle_seconds=float(os.getenv("TASK_CACHE_IDLE_SECONDS", "60")),
+                )
+            else:
+                logger.warning(f"{self.storage.name} deposu tembel yüklemeyi desteklemiyor, tüm görevler yükleniyor")
+
         # Verileri yükle
         self.load_data()
+
+        # Değişen dosyalar arka planda toplu yazılır; çıkışta bekleyenler diske yazılır.
+        # Yazılacak veri olay döngüsünde kopyalanır, yazıcı thread'i canlı nesneleri gezmez.
+        self._persistence = DebouncedWriter.from_env({
+            "teams": self._write_teams,
+            "tasks": self._write_tasks,
+            "bugs": self._write_bugs,
+            "messages": self._write_messages,
+            "logs": self._write_logs,
+        }, {
+            "teams": self._snapshot_teams,
+            "tasks": self._snapshot_tasks,
+            "bugs": self._snapshot_bugs,
+            "messages": self._snapshot_messages,
+        })
+        # atexit ters sırada çalışır: önce bekleyenler yazılır, sonra depo kapanır
+        atexit.register(self.storage.close)
+        atexit.register(self._persistence.close)
+
+        self._externalize_loaded_tasks()
         
         logger.info("TeamManager başlatıldı")
 
     def load_data(self):
         """Kayıtlı verileri yükle"""
         try:
-            # Veri klasörünü oluştur
-            os.makedirs('data', exist_ok=True)
-            
-            # Takımları yükle
-            if os.path.exists('data/teams.json'):
-                try:
-                    with open('data/teams.json', 'r') as f:
-                        teams_data = json.load(f)
-                        for team_id, team_data in teams_data.items():
-                            try:
-                                team = Team(
-                                    name=team_data["name"], 
-                                    description=team_data.get("description", "")
-                                )
-                                team.id = team_id
-                                team.task_ids = team_data.get("task_ids", [])
-                                team.created_at = team_data.get("created_at", datetime.now().isoformat())
-                                team.updated_at = team_data.get("updated_at", datetime.now().isoformat())
-                                
-                                # Ajanları ekle
-                                if "agents" in team_data and team_data["agents"]:
-                                    for agent_data in team_data["agents"]:
-                                        try:
-                                            agent = Agent(
-                                                name=agent_data["name"],
-                                                role=agent_data["role"],
-                                                model=agent_data["model"]
-                                            )
-                                            agent.id = agent_data["id"]
-                                            team.agents.append(agent)
-                                        except Exception as e:
-                                            logger.error(f"Ajan yüklenirken hata: {str(e)}")
-                                        
-                                self.teams[team_id] = team
-                            except Exception as e:
-                                logger.error(f"Takım {team_id} yüklenirken hata: {str(e)}")
-                except Exception as e:
-                    logger.error(f"Takımlar dosyası okuma hatası: {str(e)}")
-            
-            # Görevleri yükle
-            if os.path.exists('data/tasks.json'):
-                try:
-                    with open('data/tasks.json', 'r') as f:
-                        tasks_data = json.load(f)
-                        for task_id, task_data in tasks_data.items():
-                            try:
-                                task = Task(
-                                    title=task_data["title"],
-                                    description=task_data["description"],
-                                    team_id=task_data["team_id"]
-                                )
-                                task.id = task_id
-                                task.status = task_data.get("status", "new")
-                                task.subtasks = task_data.get("subtasks", [])
-                                task.result = task_data.get("result")
-                                task.created_at = task_data.get("created_at", datetime.now().isoformat())
-                                task.updated_at = task_data.get("updated_at", datetime.now().isoformat())
-                                
-                                self.tasks[task_id] = task
-                            except Exception as e:
-                                logger.error(f"Görev {task_id} yüklenirken hata: {str(e)}")
-                except Exception as e:
-                    logger.error(f"Görevler dosyası okuma hatası: {str(e)}")
-            
-            # Hataları yükle
-            if os.path.exists('data/bugs.json'):
-                try:
-                    with open('data/bugs.json', 'r') as f:
-                        self.bugs = json.load(f)
-                except Exception as e:
-                    logger.error(f"Hatalar dosyası okuma hatası: {str(e)}")
-                    self.bugs = []
-            
-            # Mesajları yükle
-            if os.path.exists('data/messages.json'):
-                try:
-                    with open('data/messages.json', 'r') as f:
-                        self.messages = json.load(f)
-                except Exception as e:
-                    logger.error(f"Mesajlar dosyası okuma hatası: {str(e)}")
-                    self.messages = []
-            
+            self.teams, self.tasks, self.bugs, self.messages = self._read_data()
             logger.info(f"Veri yükleme tamamlandı: {len(self.teams)} takım, {len(self.tasks)} görev, {len(self.bugs)} hata, {len(self.messages)} mesaj")
         
         except Exception as e:
             logger.error(f"Veri yükleme hatası: {str(e)}")
             # Başlangıç değerlerini ayarla
             self.teams = {}
-            self.tasks = {}
+            self.tasks = self._new_task_map()
             self.bugs = []
             self.messages = []
 
-    def save_data(self):
-        """Verileri kaydet"""
+    def _new_task_map(self):
+        """Boş görev sözlüğü (tembel yüklemede aynı ayarlarla yeni LazyTaskMap)"""
+        if self._lazy:
+            return LazyTaskMap(self._hydrate_task, self._task_size, self.tasks.max_bytes, self.tasks.idle_seconds)
+        return {}
+
+    def _read_data(self) -> Tuple[Dict[str, Team], Any, List[Dict], List[Dict]]:
+        """Kayıtlı verileri yeni nesnelere okur: (takımlar, görevler, hatalar, mesajlar)
+
+        Mevcut verilere dokunmaz; böylece içe aktarmada okuma bir worker
+        thread'inde yapılıp sonuç olay döngüsünde yerine konabilir.
+        """
+        teams: Dict[str, Team] = {}
+        tasks = self._new_task_map()
+        lazy = isinstance(tasks, LazyTaskMap)
+        data = self.storage.load(include_tasks=not lazy)
+
+        # Takımları yükle
+        for team_id, team_data in data["teams"].items():
+            try:
+                team = Team(
+                    name=team_data["name"], 
+                    description=team_data.get("description", "")
+                )
+                team.id = team_id
+                team.task_ids = team_data.get("task_ids", [])
+                team.created_at = team_data.get("created_at", datetime.now().isoformat())
+                team.updated_at = team_data.get("updated_at", datetime.now().isoformat())
+                
+                # Ajanları ekle
+                if "agents" in team_data and team_data["agents"]:
+                    for agent_data in team_data["agents"]:
+                        try:
+                            agent = Agent(
+                                name=agent_data["name"],
+                                role=agent_data["role"],
+                                model=agent_data["model"],
+                                backend=agent_data.get("backend")
+                            )
+                            agent.id = agent_data["id"]
+                            team.agents.append(agent)
+                        except Exception as e:
+                            logger.error(f"Ajan yüklenirken hata: {str(e)}")
+                            
+                teams[team_id] = team
+            except Exception as e:
+                logger.error(f"Takım {team_id} yüklenirken hata: {str(e)}")
+        
+        # Görevleri yükle
+        if lazy:
+            tasks.set_index(self.storage.load_index())
+        for task_id, task_data in data["tasks"].items():
+            try:
+                tasks[task_id] = self._task_from_data(task_id, task_data)
+            except Exception as e:
+                logger.error(f"Görev {task_id} yüklenirken hata: {str(e)}")
+
+        # Yüklenen hal yazılmış kabul edilir; yalnızca sonraki değişiklikler yazılır
+        self.storage.prime(teams, tasks.resident() if lazy else tasks, data["bugs"], data["messages"])
+        return teams, tasks, data["bugs"], data["messages"]
+
+    @property
+    def _lazy(self) -> bool:
+        return isinstance(self.tasks, LazyTaskMap)
+
+    def _task_from_data(self, task_id: str, task_data: Dict[str, Any]) -> Task:
+        """Depodan okunan görev verisinden Task nesnesi oluşturur"""
+        task = Task(
+            title=task_data["title"],
+            description=task_data["description"],
+            team_id=task_data["team_id"]
+        )
+        task.id = task_id
+        task.status = task_data.get("status", "new")
+        task.subtasks = task_data.get("subtasks", [])
+        task.result = task_data.get("result")
+        task.created_at = task_data.get("created_at", datetime.now().isoformat())
+        task.updated_at = task_data.get("updated_at", datetime.now().isoformat())
+        task.usage = task_data.get("usage", {"total": {}, "agents": {}})
+        task.logs = self._task_log(task_id, task_data)
+        task.documents = task_data.get("documents", [])
+        task.iterations = task_data.get("iterations", [])
+        task.progress = task_data.get("progress", 0)
+        task.status_message = task_data.get("status_message")
+        task.subtask_results = task_data.get("subtask_results", {})
+        task.team_evaluation = task_data.get("team_evaluation")
+        task.document_evaluations = task_data.get("document_evaluations", {})
+        return task
+
+    def _task_log(self, task_id: str, task_data: Dict[str, Any]) -> TaskLog:
+        """Görevin son log kayıtlarını log deposundan okur
+
+        Eski kayıtlarda görev içinde tutulan loglar (log_count alanı yoksa)
+        depo boşsa log deposuna taşınır.
+        """
+        total = task_data.get("log_count")
+        legacy = task_data.get("logs")
+        if total is None:
+            if legacy and not self.storage.tail_logs(task_id, 1):
+                self.storage.append_logs(task_id, list(legacy))
+            total = self.storage.count_logs(task_id)
+        log = TaskLog(self.storage.tail_logs(task_id, buffer_size()), total)
+        log.bind(task_id, self._log_appended)
+        return log
+
+    def _log_appended(self, task_id: str, log: TaskLog) -> None:
+        with self._log_lock:
+            self._unsaved_logs[task_id] = log
+        # Görev kaydındaki log_count da değişir
+        self.save_data("logs", "tasks", task_id=task_id)
+
+    def _hydrate_task(self, task_id: str):
+        """Tembel yüklemede görev gövdesini depodan okur: (görev, tahmini bayt) veya None"""
         try:
-            os.makedirs('data', exist_ok=True)
-            
-            with open('data/teams.json', 'w') as f:
-                json.dump({team_id: team.to_dict() for team_id, team in self.teams.items()}, f)
-            
-            with open('data/tasks.json', 'w') as f:
-                json.dump({task_id: task.to_dict() for task_id, task in self.tasks.items()}, f)
-            
-            with open('data/bugs.json', 'w') as f:
-                json.dump(self.bugs, f)
-            
-            with open('data/messages.json', 'w') as f:
-                json.dump(self.messages, f)
+            task_data = self.storage.load_task(task_id)
+            if task_data is None:
+                return None
+            task = self._task_from_data(task_id, task_data)
         except Exception as e:
-            logger.error(f"Veri kaydetme hatası: {str(e)}")
+            logger.error(f"Görev {task_id} yüklenirken hata: {str(e)}")
+            return None
+        if task_id not in self.active_tasks and self._externalize_task(task):
+            # Satır içi içerik blob deposuna taşındı; yeni hal yazılsın
+            self.save_data("tasks", task_id=task_id)
+        else:
+            self.storage.prime_task(task_id, task)
+        self._freeze_task(task_id, task)
+        frozen = task.frozen_stats()
+        return task, len(codec.dumps(task_data)) - frozen["raw_bytes"] + frozen["bytes"]
+
+    @staticmethod
+    def _task_size(task: Task) -> int:
+        frozen = task.frozen_stats()
+        return len(codec.dumps(task.to_dict())) - frozen["raw_bytes"] + frozen["bytes"]
+
+    def _freeze_task(self, task_id: str, task: Task) -> None:
+        """Çalışmayan tamamlanmış görevin büyük alanlarını bellekte sıkıştırır
+
+        Alanlar okunduğunda açılır; liste ve sözlükler değiştirilebilmeleri
+        için açık kalır ve görev yeniden soğuduğunda tekrar sıkıştırılır.
+        Görevi değiştiren kodla aynı thread'den çağrılmalıdır.
+        """
+        if self._is_cold(task_id, task):
+            task.freeze()
+
+    def _resident_tasks(self) -> Dict[str, Task]:
+        """Bellekteki görevler (tembel yükleme kapalıysa tümü)"""
+        if self._lazy:
+            return self.tasks.resident()
+        return dict(list(self.tasks.items()))
+
+    def _team_task_ids(self, team_id: str) -> List[str]:
+        """Takımın görev id'leri (tembel yüklemede gövde yüklemeden)"""
+        if self._lazy:
+            return self.tasks.ids_for_team(team_id)
+        return [task_id for task_id, task in list(self.tasks.items()) if task.team_id == team_id]
+
+    def _pin_task(self, task_id: str):
+        """Blok süresince görevin bellekten atılmasını engeller"""
+        if self._lazy:
+            return self.tasks.pinned(task_id)
+        return contextlib.nullcontext()
+
+    def _is_cold(self, task_id: str, task: Task) -> bool:
+        return task_id not in self.active_tasks and task.status in COLD_TASK_STATUSES
+
+    def save_data(self, *parts: str, task_id: Optional[str] = None):
+        """Verileri kaydedilmek üzere işaretler
+
+        parts: değişen dosyalar ("teams", "tasks", "bugs", "messages");
+        verilmezse tümü. task_id: değişen veya silinen görev; yalnızca
+        işaretlenen görevler kopyalanıp yazılır ("tasks" görev verilmeden
+        işaretlenirse bellekteki tüm görevler). Yazım arka planda
+        birleştirilerek yapılır, hemen diske yazılması gerekiyorsa flush()
+        çağrılmalıdır.
+        """
+        if task_id is not None:
+            task_ids = [task_id]
+        elif not parts or "tasks" in parts:
+            task_ids = list(self._resident_tasks())
+        else:
+            task_ids = []
+        if task_ids:
+            with self._dirty_lock:
+                for dirty_id in task_ids:
+                    self._dirty_tasks[dirty_id] = next(self._dirty_marks)
+        self._persistence.mark_dirty(*parts)
+
+    def flush(self, timeout: Optional[float] = 30.0) -> bool:
+        """Bekleyen tüm kayıtları diske yazar"""
+        return self._persistence.flush(timeout)
+
+    def persistence_stats(self) -> Dict[str, Any]:
+        stats = {**self._persistence.stats(), "storage": self.storage.stats(), "blobs": self.blobs.stats()}
+        frozen = {"tasks": 0, "fields": 0, "raw_bytes": 0, "bytes": 0}
+        for task in self._resident_tasks().values():
+            task_frozen = task.frozen_stats()
+            frozen["tasks"] += task_frozen["fields"] > 0
+            for key, value in task_frozen.items():
+                frozen[key] += value
+        stats["frozen_tasks"] = frozen
+        if self._lazy:
+            stats["task_cache"] = self.tasks.stats()
+        return stats
+
+    def compact_tasks(self) -> None:
+        """Bekleyenleri yazar ve depoyu sıkıştırır (JSON: görev günlüğünü anlık görüntüye aktarır)"""
+        self.flush()
+        self.storage.compact(self.tasks)
+
+    # Yazılacak verinin kopyaları (veriyi değiştiren olay döngüsü thread'inde alınır)
+    def _snapshot_teams(self) -> Dict[str, Snapshot]:
+        return {team_id: Snapshot(team) for team_id, team in self.teams.items()}
+
+    def _snapshot_tasks(self) -> "_TaskChanges":
+        """Son yazımdan bu yana işaretlenen görevlerin kopyaları (diğer görevlere dokunulmaz)"""
+        with self._dirty_lock:
+            marks = dict(self._dirty_tasks)
+        changes = _TaskChanges(marks)
+        for task_id in marks:
+            if task_id not in self.tasks:
+                changes.deleted.append(task_id)
+                continue
+            task = self.tasks.peek(task_id) if self._lazy else self.tasks.get(task_id)
+            if task is None:
+                # Bellekten atılmış görevin son hali yazılmıştır
+                continue
+            changes.tasks[task_id] = snapshot = Snapshot(task)
+            frozen = task.frozen_stats()
+            changes.sizes[task_id] = snapshot.size - frozen["raw_bytes"] + frozen["bytes"]
+        return changes
+
+    def _snapshot_bugs(self) -> List[Dict]:
+        return copy_json(self.bugs)
+
+    def _snapshot_messages(self) -> List[Dict]:
+        return copy_json(self.messages)
+
+    # Depo yazıcıları (arka plan thread'inde kopyaları yazar)
+    def _write_teams(self, teams: Dict[str, Snapshot]):
+        self.storage.write_teams(teams)
+
+    def _write_tasks(self, changes: "_TaskChanges"):
+        if changes.deleted:
+            self.storage.delete_tasks(changes.deleted)
+        self.storage.write_tasks(changes.tasks, complete=False)
+        self._sync_blob_refs(changes.tasks, changes.deleted)
+        # Yazılamayan görevlerin işaretleri kalır, bir sonraki kopyada yeniden yazılır
+        with self._dirty_lock:
+            for task_id, mark in changes.marks.items():
+                if self._dirty_tasks.get(task_id) == mark:
+                    del self._dirty_tasks[task_id]
+        if self._lazy:
+            for task_id in self.tasks.evict_cold(self._is_evictable, changes.sizes):
+                self.storage.evict_task(task_id)
+
+    def _is_evictable(self, task_id: str, task: Task) -> bool:
+        # Yazım sırasında yeniden değişen görevler yazılana kadar bellekte kalır
+        with self._dirty_lock:
+            if task_id in self._dirty_tasks:
+                return False
+        return self._is_cold(task_id, task)
+
+    def _externalize_task(self, task: Task) -> bool:
+        """Tamamlanan görevin uzun metinlerini blob referanslarına çevirir; değişiklik olduysa True
+
+        Kayıtlar yerinde değiştirilmez, yeni listeler atanır; böylece depolar
+        değişikliği görür. Yalnızca çalışmayan görevler için çağrılmalıdır.
+        """
+        changed = False
+        documents = [self.blobs.externalize(document, DOCUMENT_BLOB_FIELDS) for document in task.documents]
+        if any(new is not old for new, old in zip(documents, task.documents)):
+            task.documents = documents
+            changed = True
+        subtasks = [self.blobs.externalize(subtask, SUBTASK_BLOB_FIELDS) for subtask in task.subtasks]
+        if any(new is not old for new, old in zip(subtasks, task.subtasks)):
+            task.subtasks = subtasks
+            changed = True
+        return changed
+
+    @staticmethod
+    def _blob_hashes(task: Task) -> List[str]:
+        hashes = []
+        for records, fields in ((task.documents, DOCUMENT_BLOB_FIELDS), (task.subtasks, SUBTASK_BLOB_FIELDS)):
+            for record in list(records):
+                for field in fields:
+                    ref = record.get(field + BLOB_SUFFIX)
+                    if ref:
+                        hashes.append(ref["hash"])
+        return hashes
+
+    def _sync_blob_refs(self, tasks: Optional[Dict[str, Any]] = None, deleted: Iterable[str] = ()):
+        """Görevlerin blob referanslarını sayımlara yansıtır (silinen görevlerinkiler düşülür)
+
+        tasks: yazılan görev kopyaları, deleted: silinen görevler; tasks
+        verilmezse bellekteki görevler ve tüm referans sahipleri taranır.
+        """
+        # Tembel yüklemede bellekte olmayan görevlerin referansları değişmemiştir
+        for task_id, task in (self._resident_tasks() if tasks is None else tasks).items():
+            self.blobs.set_refs(task_id, self._blob_hashes(task))
+        for task_id in deleted:
+            self.blobs.set_refs(task_id, [])
+        if tasks is None:
+            for owner in self.blobs.owners():
+                if owner not in self.tasks:
+                    self.blobs.set_refs(owner, [])
+        self.blobs.save_refs()
+
+    def _externalize_loaded_tasks(self):
+        """Eski kayıtlardaki satır içi içerikleri blob deposuna taşır ve referanssız blobları temizler
+
+        Tembel yüklemede bellekte olmayan görevler yüklenirken taşınır.
+        """
+        resident = self._resident_tasks()
+        for task_id, task in resident.items():
+            if self._externalize_task(task):
+                self.save_data("tasks", task_id=task_id)
+        for task_id, task in resident.items():
+            self._freeze_task(task_id, task)
+        self._sync_blob_refs()
+        self.blobs.gc()
+
+    async def export_data(self) -> Iterator[bytes]:
+        """Tüm veriyi NDJSON satırları olarak üretir; blob içerikleri satır içi yazılır
+
+        Bekleyen kayıtlar önce yazılır. Görev listesi olay döngüsünde alınır;
+        satırlar depodan okunarak üretildiği için üretici worker thread'inde
+        gezilebilir.
+        """
+        await asyncio.to_thread(self.flush)
+        task_ids = list(self.tasks)
+        return export_lines(self.storage.iter_records(task_ids), self.blobs.resolve_task)
+
+    async def import_data(self, path: str) -> Dict[str, int]:
+        """NDJSON dışa aktarımını veya eski JSON veri klasörünü içe aktarır (mevcut verinin yerini alır)
+
+        Görevler depoya tek tek yazılır ve veriler depodan yeni nesnelere
+        okunur (worker thread'inde); yeni veriler olay döngüsünde yerine
+        konur. Bu sürede arka plan yazıcısı durdurulur, eski verinin
+        bekleyen değişiklikleri atılır.
+        """
+        if self.active_tasks:
+            raise ValueError("Çalışan görevler varken içe aktarma yapılamaz")
+        await asyncio.to_thread(self.flush)
+        await asyncio.to_thread(self._persistence.pause)
+        try:
+            counts = await asyncio.to_thread(import_from, self.storage, path)
+            teams, tasks, bugs, messages = await asyncio.to_thread(self._read_data)
+            self._persistence.discard()
+            with self._dirty_lock:
+                self._dirty_tasks.clear()
+            with self._log_lock:
+                self._unsaved_logs = {}
+            self.teams, self.tasks, self.bugs, self.messages = teams, tasks, bugs, messages
+        finally:
+            self._persistence.resume()
+        self._externalize_loaded_tasks()
+        logger.info(f"İçe aktarma tamamlandı: {counts}")
+        return counts
+
+    def gc_blobs(self) -> int:
+        """Bekleyenleri yazar ve hiçbir görevin referans vermediği blobları siler"""
+        self.flush()
+        self._sync_blob_refs()
+        return self.blobs.gc()
+
+    def _write_logs(self):
+        with self._log_lock:
+            pending, self._unsaved_logs = self._unsaved_logs, {}
+        items = list(pending.items())
+        for position, (task_id, log) in enumerate(items):
+            entries = log.take_unsaved()
+            try:
+                self.storage.append_logs(task_id, entries)
+            except Exception:
+                # Yazılamayan ve sırası gelmeyen loglar bir sonraki yazımda yeniden denenir
+                log.restore_unsaved(entries)
+                with self._log_lock:
+                    for retry_id, retry_log in items[position:]:
+                        self._unsaved_logs.setdefault(retry_id, retry_log)
+                raise
+
+    def _discard_logs(self, task_ids: List[str]) -> None:
+        """Silinen görevlerin bekleyen ve kayıtlı loglarını siler"""
+        with self._log_lock:
+            for task_id in task_ids:
+                self._unsaved_logs.pop(task_id, None)
+        self.storage.delete_logs(task_ids)
+
+    def _write_bugs(self, bugs: List[Dict]):
+        self.storage.write_bugs(bugs)
+
+    def _write_messages(self, messages: List[Dict]):
+        self.storage.write_messages(messages)
+
+    def _query(self, part: str, method: str, *args):
+        """Depo indeksli sorguyu destekliyorsa sonucunu döndürür, desteklemiyorsa None
+
+        Sorgu diskteki veriyi okuduğu için parçada yazılmamış değişiklik
+        varsa da None döner; çağıran bellekteki veriyi tarar (olay
+        döngüsünde yazımı beklemek yerine).
+        """
+        query = getattr(self.storage, method)
+        if getattr(type(self.storage), method) is getattr(Storage, method):
+            return None
+        if self._persistence.is_pending(part):
+            return None
+        return query(*args)
+
+    def referenced_models(self) -> List[str]:
+        """Takımlardaki ajanların kullandığı modelleri döndürür (ön yükleme için)"""
+        models = []
+        for team in self.teams.values():
+            for agent in team.agents:
+                # Yalnızca Ollama üzerinde çalışan ajanların modelleri ön yüklenir
+                if agent.backend:
+                    continue
+                if agent.model and agent.model not in models:
+                    models.append(agent.model)
+        return models
+
+    def backend_for(self, agent: Agent) -> LLMBackend:
+        """Ajanın kullandığı LLM sunucusunu döndürür"""
+        if self.backends is None:
+            return self.model_adapter
+        return self.backends.get(agent.backend)
 
     def create_team(self, name: str, description: str = None) -> str:
         """Yeni takım oluştur"""
@@ -171,10 +599,12 @@ class TeamManager:
         
         team = Team(name=name, description=description)
         self.teams[team.id] = team
-        self.save_data()
+        self.save_data("teams")
         return team.id
 
-    def add_agent_to_team(self, team_id: str, name: str, role: str, model_name: str, system_prompt: str = None) -> str:
+    def add_agent_to_team(
+        self, team_id: str, name: str, role: str, model_name: str, system_prompt: str = None, backend: str = None
+    ) -> str:
         """Takıma yeni ajan ekle"""
         if team_id not in self.teams:
             logger.error(f"Ajan eklenirken hata: Takım bulunamadı (ID: {team_id})")
@@ -189,15 +619,20 @@ class TeamManager:
         if not model_name or not model_name.strip():
             logger.error("Ajan eklenirken hata: Model adı boş olamaz")
             raise ValueError("Model adı boş olamaz")
+
+        # LLM sunucusu kontrolü
+        if backend and (self.backends is None or backend not in self.backends.names()):
+            logger.error(f"Ajan eklenirken hata: LLM sunucusu bulunamadı ({backend})")
+            raise ValueError(f"LLM sunucusu bulunamadı: {backend}")
         
         # Varsayılan bir sistem prompt oluştur
         if not system_prompt:
             system_prompt = f"Sen bir {role} olarak görev yapıyorsun. Bu role uygun şekilde davran."
         
         try:
-            agent = Agent(name=name.strip(), role=role, model=model_name.strip())
+            agent = Agent(name=name.strip(), role=role, model=model_name.strip(), backend=backend or None)
             self.teams[team_id].add_agent(agent)
-            self.save_data()
+            self.save_data("teams")
             
             logger.info(f"Ajan {name} ({agent.id}) takıma eklendi: {team_id}")
             return agent.id
@@ -211,11 +646,13 @@ class TeamManager:
             raise ValueError("Takım bulunamadı")
         
         task = Task(title=title, description=description, team_id=team_id)
+        task.logs.bind(task.id, self._log_appended)
         self.tasks[task.id] = task
         self.teams[team_id].add_task(task.id)
-        self.save_data()
+        self.save_data("tasks", "teams", task_id=task.id)
         return task.id
 
+    @pins_task
     async def execute_task(self, task_id: str):
         """Görevi çalıştırır ve sonuçları döndürür"""
         try:
@@ -287,7 +724,7 @@ class TeamManager:
                     team_members["developer"] = agent
                 elif "test" in role or "qa" in role:
                     team_members["tester"] = agent
-                elif "ui" in role or "design" in role or "ux" in role:
+                elif is_ui_role(role):
                     team_members["ui_designer"] = agent
             
             # İlerleme log kaydı
@@ -312,6 +749,10 @@ class TeamManager:
                     if 'result' in subtask:
                         subtask['previous_result'] = subtask['result']
                         subtask.pop('result', None)
+                        subtask.pop('previous_result' + BLOB_SUFFIX, None)
+                    elif 'result' + BLOB_SUFFIX in subtask:
+                        subtask['previous_result' + BLOB_SUFFIX] = subtask.pop('result' + BLOB_SUFFIX)
+                        subtask.pop('previous_result', None)
                     subtask['updated_at'] = datetime.now().isoformat()
             
             # Alt görevler mevcut değilse, rollere göre oluştur
@@ -416,7 +857,7 @@ class TeamManager:
                 
                 # Alt görevleri task'a ekleyelim
                 task.subtasks = subtasks
-                self.save_data()
+                self.save_data("tasks", task_id=task_id)
             else:
                 # Mevcut alt görevleri kullan
                 subtasks = existing_subtasks
@@ -427,7 +868,7 @@ class TeamManager:
             
             # Görev durumunu güncelle
             self.update_task_progress(task_id, 20, "Alt görevler hazırlandı, ajanlar çalışmaya başlıyor")
-            self.save_data()
+            self.save_data("tasks", task_id=task_id)
             
             # ----- ANA ÇALIŞMA SÜRECİ -----
             
@@ -453,7 +894,7 @@ class TeamManager:
                     "updated_at": datetime.now().isoformat()
                 }
                 task.subtasks.append(leader_subtask)
-                self.save_data()
+                self.save_data("tasks", task_id=task_id)
                 
                 task.logs.append({
                     'timestamp': datetime.now().isoformat(),
@@ -467,7 +908,7 @@ class TeamManager:
                 'timestamp': datetime.now().isoformat(),
                 'message': f'Takım lideri ({team_leader.name}) görev üzerinde çalışmaya başladı'
             })
-            self.save_data()
+            self.save_data("tasks", task_id=task_id)
             
             # Görev durumunu güncelle
             self.update_task_progress(task_id, 30, f"Takım lideri ({team_leader.name}) görev analizi yapıyor")
@@ -505,18 +946,22 @@ class TeamManager:
                 'timestamp': datetime.now().isoformat(),
                 'message': f'"{team_leader.model}" modeli kullanılarak görev analizi yapılıyor'
             })
-            self.save_data()
+            self.save_data("tasks", task_id=task_id)
             
             try:
                 # Takım liderinin yanıtını al
                 self.update_task_progress(task_id, 35, "AI modeli yanıt üretiyor...")
-                leader_response = await self.ollama_adapter.generate(
-                    model=team_leader.model,
-                    prompt=prompt,
-                    system_prompt=system_prompt,
-                    temperature=0.7,
-                    stream=False
-                )
+                with trace_context(task_id=task_id, team_id=task.team_id, agent_id=team_leader.id):
+                    leader_backend = self.backend_for(team_leader)
+                    leader_response = await leader_backend.generate(
+                        model=team_leader.model,
+                        prompt=prompt,
+                        system_prompt=system_prompt,
+                        profile=leader_backend.profiles["leader"],
+                        stream=True,
+                        on_token=self._stream_progress_callback(task_id, f"Takım lideri ({team_leader.name})"),
+                        on_usage=self._usage_callback(task_id, team_leader.id, leader_subtask)
+                    )
                 
                 # Yanıt kontrolü
                 if not leader_response or isinstance(leader_response, dict) and "error" in leader_response:
@@ -590,7 +1035,7 @@ class TeamManager:
                 
                 # İlerleme güncellemesi
                 self.update_task_progress(task_id, 70, "Kod dosyaları oluşturuldu, diğer ekip üyeleri görevlere başlıyor")
-                self.save_data()
+                self.save_data("tasks", task_id=task_id)
                 
                 # 2. Diğer ekip üyelerinin görevlerini işle
                 remaining_subtasks = [s for s in task.subtasks if s["status"] != "completed"]
@@ -618,7 +1063,7 @@ class TeamManager:
                             'timestamp': datetime.now().isoformat(),
                             'message': f'"{subtask["title"]}" alt görevi başlatıldı - Ajan: {agent.name} ({agent.role})'
                         })
-                        self.save_data()
+                        self.save_data("tasks", task_id=task_id)
                         
                         # Her role özel prompt oluştur
                         role_prompt = ""
@@ -663,7 +1108,7 @@ class TeamManager:
                             5. Performans Testleri
                             6. Örnek Test Kodları
                             """
-                        elif "ui" in agent.role.lower() or "design" in agent.role.lower():
+                        elif is_ui_role(agent.role):
                             role_prompt = f"""
                             # KULLANICI ARAYÜZÜ TASARIMI
                             
@@ -709,16 +1154,37 @@ class TeamManager:
                             'timestamp': datetime.now().isoformat(),
                             'message': f'"{agent.name}" için prompt oluşturuldu, "{agent.model}" modeli yanıt üretiyor'
                         })
-                        self.save_data()
+                        self.save_data("tasks", task_id=task_id)
                         
                         # Ajan model yanıtı
-                        agent_response = await self.ollama_adapter.generate(
-                            model=agent.model,
-                            prompt=role_prompt,
-                            system_prompt=f"Sen bir {agent.role} olarak görevlendirildin. Bu rolde verilen görevi en iyi şekilde yapman gerekiyor.",
-                            temperature=0.7,
-                            stream=False
-                        )
+                        try:
+                            with trace_context(task_id=task_id, team_id=task.team_id, agent_id=agent.id):
+                                agent_backend = self.backend_for(agent)
+                                agent_response = await agent_backend.generate(
+                                    model=agent.model,
+                                    prompt=role_prompt,
+                                    system_prompt=f"Sen bir {agent.role} olarak görevlendirildin. Bu rolde verilen görevi en iyi şekilde yapman gerekiyor.",
+                                    profile=profile_for_role(agent.role, agent_backend.profiles),
+                                    stream=True,
+                                    on_token=self._stream_progress_callback(task_id, agent.name),
+                                    on_usage=self._usage_callback(task_id, agent.id, subtask)
+                                )
+                        except CircuitOpenError:
+                            # Ollama erişilemez: kalan alt görevleri boşuna denemeden görevi sonlandır
+                            subtask["status"] = "failed"
+                            subtask["updated_at"] = datetime.now().isoformat()
+                            raise
+                        except LLMError as e:
+                            # Hata metni belge olarak kaydedilmez, alt görev başarısız sayılır
+                            subtask["status"] = "failed"
+                            subtask["error"] = str(e)
+                            subtask["updated_at"] = datetime.now().isoformat()
+                            task.logs.append({
+                                'timestamp': datetime.now().isoformat(),
+                                'message': f'HATA: "{agent.name}" yanıt üretemedi ({type(e).__name__}): {str(e)}'
+                            })
+                            self.save_data("tasks", task_id=task_id)
+                            continue
                         
                         # Yanıtı alt göreve ekle
                         subtask["result"] = agent_response
@@ -740,7 +1206,7 @@ class TeamManager:
                             'timestamp': datetime.now().isoformat(),
                             'message': f'"{agent.name}" yanıt üretti ve doküman oluşturuldu'
                         })
-                        self.save_data()
+                        self.save_data("tasks", task_id=task_id)
                         
                         # Biraz bekle
                         await asyncio.sleep(0.2)
@@ -793,7 +1259,7 @@ class TeamManager:
                     'timestamp': datetime.now().isoformat(),
                     'message': 'Tüm alt görevler tamamlandı, görev başarıyla sonuçlandı'
                 })
-                self.save_data()
+                self.save_data("tasks", task_id=task_id)
                 
                 return {
                     "success": True,
@@ -806,7 +1272,7 @@ class TeamManager:
                     'message': f'HATA: {str(e)}'
                 })
                 self.fail_task(task_id, f"Görev çalıştırılırken hata: {str(e)}")
-                self.save_data()
+                self.save_data("tasks", task_id=task_id)
                 return {"error": f"Görev çalıştırılırken hata: {str(e)}"}
                 
         except Exception as e:
@@ -864,7 +1330,7 @@ class TeamManager:
         
         # İterasyon yap ve sonuçları kaydet
         result = task.iterate(team, feedback)
-        self.save_data()
+        self.save_data("tasks", task_id=task_id)
         return result
 
     def add_bug(self, bug_data: Dict) -> Dict:
@@ -872,7 +1338,7 @@ class TeamManager:
         bug_data['id'] = str(len(self.bugs) + 1)
         bug_data['created_at'] = datetime.now().isoformat()
         self.bugs.append(bug_data)
-        self.save_data()
+        self.save_data("bugs")
         return bug_data
 
     def update_bug_status(self, bug_id: str, status: str) -> Dict:
@@ -881,7 +1347,7 @@ class TeamManager:
             if bug['id'] == bug_id:
                 bug['status'] = status
                 bug['updated_at'] = datetime.now().isoformat()
-                self.save_data()
+                self.save_data("bugs")
                 return bug
         raise ValueError("Hata bulunamadı")
 
@@ -890,7 +1356,7 @@ class TeamManager:
         message_data['id'] = str(len(self.messages) + 1)
         message_data['timestamp'] = datetime.now().isoformat()
         self.messages.append(message_data)
-        self.save_data()
+        self.save_data("messages")
         return message_data
 
     def get_team_tasks(self, team_id: str) -> list:
@@ -901,8 +1367,11 @@ class TeamManager:
         team = self.teams[team_id]
         tasks = []
         
-        if hasattr(team, 'task_ids') and team.task_ids:
-            for task_id in team.task_ids:
+        task_ids = self._query("tasks", "team_task_ids", team_id)
+        if task_ids is None:
+            task_ids = getattr(team, 'task_ids', None) or []
+        if task_ids:
+            for task_id in task_ids:
                 task = self.get_task(task_id)
                 if task:
                     tasks.append(task)
@@ -917,10 +1386,16 @@ class TeamManager:
 
     def get_team_bugs(self, team_id: str) -> List[Dict]:
         """Takımın hatalarını getir"""
+        bugs = self._query("bugs", "team_bugs", team_id)
+        if bugs is not None:
+            return bugs
         return [bug for bug in self.bugs if bug.get('team_id') == team_id]
 
     def get_team_messages(self, team_id: str) -> List[Dict]:
         """Takımın mesajlarını getir"""
+        messages = self._query("messages", "team_messages", team_id)
+        if messages is not None:
+            return messages
         return [msg for msg in self.messages if msg.get('team_id') == team_id]
 
     def execute_code(self, task_id: str, code: str) -> Dict:
@@ -933,7 +1408,7 @@ class TeamManager:
         
         # Kodu çalıştır ve sonuçları kaydet
         result = task.execute_code(team, code)
-        self.save_data()
+        self.save_data("tasks", task_id=task_id)
         return result
 
     def get_team(self, team_id):
@@ -967,17 +1442,17 @@ class TeamManager:
         self.teams[team_id].agents = []
         
         # Takıma ait görevleri temizle
-        tasks_to_remove = [tid for tid, task in self.tasks.items() if task.team_id == team_id]
+        tasks_to_remove = self._team_task_ids(team_id)
         for task_id in tasks_to_remove:
-            # Göreve ait alt görevleri temizle
-            self.tasks = {sid: subtask for sid, subtask in self.tasks.items() if subtask.task_id != task_id}
-            # Görevi sil
+            # Görevi sil (alt görevler görev kaydının içinde tutulur)
             if task_id in self.tasks:
                 del self.tasks[task_id]
+                self.save_data("tasks", task_id=task_id)
+        self._discard_logs(tasks_to_remove)
         
         # Takımı sil
         del self.teams[team_id]
-        self.save_data()
+        self.save_data("teams")
         return True
     
     def get_agent(self, agent_id):
@@ -999,7 +1474,12 @@ class TeamManager:
         if task_id not in self.tasks:
             return None
         
-        task_data = self.tasks[task_id].to_dict()
+        task = self.tasks[task_id]
+        task_data = task.to_dict()
+        # Alt görev sonuçları blob deposundan okunur; doküman içerikleri dokümanlar istendiğinde okunur
+        task_data["subtasks"] = [self.blobs.resolve(subtask, SUBTASK_BLOB_FIELDS) for subtask in task_data["subtasks"]]
+        # Son loglar; tüm geçmiş get_task_logs() ile sayfa sayfa okunur
+        task_data["logs"] = task.logs.recent()
         
         # Görevin aktif olup olmadığını ekle
         task_data["is_active"] = task_id in self.active_tasks
@@ -1021,12 +1501,10 @@ class TeamManager:
         if task_id not in self.tasks:
             return False
         
-        # Göreve ait alt görevleri temizle
-        self.tasks = {sid: subtask for sid, subtask in self.tasks.items() if subtask.task_id != task_id}
-        
-        # Görevi sil
+        # Görevi sil (alt görevler görev kaydının içinde tutulur)
         del self.tasks[task_id]
-        self.save_data()
+        self._discard_logs([task_id])
+        self.save_data("tasks", task_id=task_id)
         return True
     
     def add_subtask(self, task_id, description, title=None, assigned_agent_id=None):
@@ -1045,7 +1523,7 @@ class TeamManager:
             "created_at": datetime.now().isoformat()
         }
         self.tasks[task_id].add_subtask(subtask_id, subtask["title"], subtask["description"], subtask["assigned_agent_id"])
-        self.save_data()
+        self.save_data("tasks", task_id=task_id)
         
         return subtask_id
     
@@ -1055,7 +1533,7 @@ class TeamManager:
             return False
         
         self.tasks[subtask_id].completed = True
-        self.save_data()
+        self.save_data("tasks", task_id=subtask_id)
         
         return True
     
@@ -1068,7 +1546,7 @@ class TeamManager:
         task = self.tasks[task_id]
         
         # Dokümantasyon sistemini hazırla
-        if "documents" not in task:
+        if getattr(task, "documents", None) is None:
             task.documents = []
             
         document_id = str(uuid.uuid4())
@@ -1080,8 +1558,9 @@ class TeamManager:
             "uploaded_at": datetime.now().isoformat()
         }
         
-        task.documents.append(document)
+        task.documents.append(self.blobs.externalize(document, DOCUMENT_BLOB_FIELDS))
         task.updated_at = datetime.now().isoformat()
+        self.save_data("tasks", task_id=task_id)
         
         return document_id
     
@@ -1093,12 +1572,12 @@ class TeamManager:
             
         task = self.tasks[task_id]
         
-        if "documents" not in task:
+        if not getattr(task, "documents", None):
             return None
             
         for document in task.documents:
             if document["id"] == document_id:
-                return document
+                return self.blobs.resolve(document, DOCUMENT_BLOB_FIELDS)
                 
         return None
         
@@ -1106,20 +1585,24 @@ class TeamManager:
     def list_documents(self, task_id):
         """Görev için belgelerin listesini döndürür"""
         try:
-            task = self.get_task(task_id)
+            task = self.tasks.get(task_id)
             if task is None:
                 return []
             
-            # Görev nesnesinde documents özelliği yoksa veya boş ise boş liste döndür
-            if not hasattr(task, 'documents') or task.documents is None:
-                return []
+            documents = self._query("tasks", "task_documents", task_id)
+            if documents is None:
+                # Görev nesnesinde documents özelliği yoksa veya boş ise boş liste döndür
+                if not hasattr(task, 'documents') or task.documents is None:
+                    return []
+                documents = task.documents
             
-            return task.documents
+            return [self.blobs.resolve(document, DOCUMENT_BLOB_FIELDS) for document in documents]
         except Exception as e:
-            self.logger.error(f"Doküman listeleme hatası: {e}")
+            logger.error(f"Doküman listeleme hatası: {e}")
             return []
             
     # Dokümanı değerlendir
+    @pins_task
     async def evaluate_document(self, task_id, document_id):
         """Bir dokümanı takım üyeleri tarafından değerlendirir"""
         if task_id not in self.tasks:
@@ -1129,18 +1612,13 @@ class TeamManager:
         team = self.teams[task.team_id]
         
         # Dokümanı al
-        document = None
-        if "documents" in task:
-            for doc in task.documents:
-                if doc["id"] == document_id:
-                    document = doc
-                    break
+        document = self.get_document(task_id, document_id)
         
         if not document:
             return {"error": "Doküman bulunamadı"}
             
         # Takım üyelerini al
-        agents = [agent for agent in self.get_team_agents(task.team_id)]
+        agents = list(team.agents)
         
         if not agents:
             return {"error": "Takımda ajan yok"}
@@ -1164,10 +1642,12 @@ class TeamManager:
             """
             
             # Ajanın modeli ile değerlendirme yap
-            evaluation_result = await self.model_adapter.generate(
+            backend = self.backend_for(agent)
+            evaluation_result = await backend.generate(
                 model=agent.model,
                 prompt=prompt,
-                system_prompt=f"Sen {agent.role} rolünde bir uzmansın. Bu dokümanı kendi uzmanlık alanın perspektifinden değerlendir."
+                system_prompt=f"Sen {agent.role} rolünde bir uzmansın. Bu dokümanı kendi uzmanlık alanın perspektifinden değerlendir.",
+                profile=backend.profiles["reviewer"]
             )
             
             # Değerlendirmeyi kaydet
@@ -1180,11 +1660,13 @@ class TeamManager:
             })
         
         # Değerlendirmeleri kaydet
-        if "document_evaluations" not in task:
+        if not hasattr(task, "document_evaluations"):
             task.document_evaluations = {}
             
         task.document_evaluations[document_id] = evaluations
         task.updated_at = datetime.now().isoformat()
+        self._freeze_task(task_id, task)
+        self.save_data("tasks", task_id=task_id)
         
         # Tüm değerlendirmeleri birleştir
         consolidated_evaluation = ""
@@ -1203,6 +1685,7 @@ class TeamManager:
             "consolidated_evaluation": consolidated_evaluation
         }
     
+    @pins_task
     async def iterate_task(self, task_id, feedback=None):
         """Görev üzerinde yineleme yapar ve geri bildirim ekler"""
         if task_id not in self.tasks:
@@ -1234,11 +1717,12 @@ class TeamManager:
         task.iterations.append(iteration)
         task.status = "in_progress"
         task.updated_at = datetime.now().isoformat()
+        self.save_data("tasks", task_id=task_id)
         
         try:
             # Takımdaki ilk ajanı al
             team = self.teams[task.team_id]
-            agents = [agent for agent in self.get_team_agents(task.team_id)]
+            agents = list(team.agents)
             
             if not agents:
                 return {"error": "Takımda ajan yok"}
@@ -1261,10 +1745,12 @@ class TeamManager:
             """
             
             # Ajanın modeli ile metin üret
-            result = await self.model_adapter.generate(
+            backend = self.backend_for(agent)
+            result = await backend.generate(
                 model=agent.model,
                 prompt=prompt,
-                system_prompt=f"Sen {agent.role} rolünde bir uzmansın. Önceki çözümü geri bildirim doğrultusunda geliştir."
+                system_prompt=f"Sen {agent.role} rolünde bir uzmansın. Önceki çözümü geri bildirim doğrultusunda geliştir.",
+                profile=profile_for_role(agent.role, backend.profiles)
             )
             
             # Sonucu kaydet
@@ -1272,6 +1758,8 @@ class TeamManager:
             task.result = result  # En son sonucu ana sonuç olarak güncelle
             task.status = "completed"
             task.updated_at = datetime.now().isoformat()
+            self._freeze_task(task_id, task)
+            self.save_data("tasks", task_id=task_id)
             
             return {
                 "success": True,
@@ -1279,10 +1767,18 @@ class TeamManager:
                 "result": result
             }
             
+        except LLMError:
+            # Model meşgul/erişilemez: iterasyonu geri al, görev önceki sonucuyla tamamlanmış kalsın
+            task.iterations.remove(iteration)
+            task.status = "completed"
+            task.updated_at = datetime.now().isoformat()
+            self.save_data("tasks", task_id=task_id)
+            raise
         except Exception as e:
             # Hata durumunda
             task.status = "failed"
             task.updated_at = datetime.now().isoformat()
+            self.save_data("tasks", task_id=task_id)
             
             return {
                 "success": False,
@@ -1298,6 +1794,7 @@ class TeamManager:
         raise ValueError("Model adapter not initialized")
 
     # Görev izleme metodu ekle
+    @pins_task
     async def _task_monitor(self, task_id: str, interval_seconds: int = 10, timeout_minutes: int = 30) -> None:
         """Görevi belirli aralıklarla kontrol eder ve hala çalışıp çalışmadığını doğrular"""
         if task_id not in self.tasks:
@@ -1342,7 +1839,7 @@ class TeamManager:
                                 'timestamp': datetime.now().isoformat(),
                                 'message': 'HATA: Görev yanıt vermiyor, otomatik olarak durduruldu.'
                             })
-                            self.save_data()
+                            self.save_data("tasks", task_id=task_id)
                             
                             # Aktif görevlerden kaldır
                             if task_id in self.active_tasks:
@@ -1374,7 +1871,7 @@ class TeamManager:
                             'timestamp': datetime.now().isoformat(),
                             'message': f'HATA: Görev {timeout_minutes} dakika içinde tamamlanamadı ve zaman aşımına uğradı.'
                         })
-                        self.save_data()
+                        self.save_data("tasks", task_id=task_id)
                     
                     # Aktif görevlerden kaldır
                     if task_id in self.active_tasks:
@@ -1390,6 +1887,95 @@ class TeamManager:
             except:
                 pass
 
+    def _stream_progress_callback(self, task_id: str, label: str, interval_seconds: float = 1.0):
+        """Stream edilen her token'da görevin canlı durumunu güncelleyen callback döndürür
+
+        Dosyaya yazmaz; yalnızca bellekteki durum mesajını ve heartbeat'i
+        günceller, böylece durum sorguları üretim sürerken ilerlemeyi görür.
+        """
+        state = {"chars": 0, "last": 0.0}
+        loop = asyncio.get_running_loop()
+
+        def on_token(token: str) -> None:
+            state["chars"] += len(token)
+            now = loop.time()
+            if now - state["last"] < interval_seconds:
+                return
+            state["last"] = now
+
+            task = self.tasks.get(task_id)
+            if task is None:
+                return
+            task.status_message = f"{label} yanıt üretiyor... ({state['chars']} karakter)"
+            if task_id in self.active_tasks:
+                self.active_tasks[task_id]["last_update"] = datetime.now().isoformat()
+                self.active_tasks[task_id]["heartbeat"] = True
+
+        return on_token
+
+    def _usage_callback(self, task_id: str, agent_id: str, subtask: Optional[Dict] = None):
+        """LLM çağrısının token/süre kullanımını göreve, ajana ve alt göreve işleyen callback döndürür"""
+        def on_usage(usage: Dict[str, Any]) -> None:
+            task = self.tasks.get(task_id)
+            if task is None:
+                return
+            if not getattr(task, "usage", None):
+                task.usage = {"total": {}, "agents": {}}
+            merge_usage(task.usage.setdefault("total", {}), usage)
+            merge_usage(task.usage.setdefault("agents", {}).setdefault(agent_id, {}), usage)
+            if subtask is not None:
+                merge_usage(subtask.setdefault("usage", {}), usage)
+
+        return on_usage
+
+    def get_task_usage(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Görevin toplam, ajan ve alt görev bazında LLM kullanımını döndürür"""
+        task = self.tasks.get(task_id)
+        if task is None:
+            return None
+        usage = getattr(task, "usage", None) or {}
+        return {
+            "task_id": task_id,
+            "total": summarize_usage(usage.get("total", {})),
+            "agents": {agent_id: summarize_usage(totals) for agent_id, totals in usage.get("agents", {}).items()},
+            "subtasks": {
+                subtask["id"]: summarize_usage(subtask["usage"])
+                for subtask in task.subtasks if subtask.get("usage")
+            },
+        }
+
+    def get_team_usage(self, team_id: str) -> Optional[Dict[str, Any]]:
+        """Takımın tüm görevlerindeki LLM kullanımını görev ve ajan bazında toplar"""
+        if team_id not in self.teams:
+            return None
+        tasks = [self.tasks[task_id] for task_id in self._team_task_ids(team_id) if task_id in self.tasks]
+        agents: Dict[str, Dict[str, Any]] = {}
+        for task in tasks:
+            for agent_id, totals in (getattr(task, "usage", None) or {}).get("agents", {}).items():
+                merge_usage(agents.setdefault(agent_id, {}), totals)
+        return {
+            "team_id": team_id,
+            "total": summarize_usage(sum_usage((getattr(t, "usage", None) or {}).get("total") for t in tasks)),
+            "agents": {agent_id: summarize_usage(totals) for agent_id, totals in agents.items()},
+            "tasks": {
+                task.id: summarize_usage(task.usage.get("total", {}))
+                for task in tasks if (getattr(task, "usage", None) or {}).get("total")
+            },
+        }
+
+    def get_agent_usage(self, agent_id: str) -> Dict[str, Any]:
+        """Ajanın tüm görevlerdeki LLM kullanımını toplar"""
+        per_task = {
+            task.id: task.usage["agents"][agent_id]
+            for task in self.tasks.values()
+            if agent_id in (getattr(task, "usage", None) or {}).get("agents", {})
+        }
+        return {
+            "agent_id": agent_id,
+            "total": summarize_usage(sum_usage(per_task.values())),
+            "tasks": {task_id: summarize_usage(totals) for task_id, totals in per_task.items()},
+        }
+
     # Görev durumu güncelleme metodu
     def update_task_progress(self, task_id: str, progress: int, status_message: str) -> bool:
         """Görevin ilerleme durumunu günceller ve son güncelleme zamanını yeniler"""
@@ -1413,7 +1999,7 @@ class TeamManager:
         self.active_tasks[task_id]["last_update"] = datetime.now().isoformat()
         self.active_tasks[task_id]["heartbeat"] = True
         
-        self.save_data()
+        self.save_data("tasks", task_id=task_id)
         return True
 
     # Görev tamamlama metodu
@@ -1431,6 +2017,7 @@ class TeamManager:
         task.status_message = "Tamamlandı"
         task.updated_at = datetime.now().isoformat()
         task.is_active = False  # Görev artık aktif değil
+        self._externalize_task(task)
         
         # Log ekle - tamamlandı bildirimini kaldırdık
         task.logs.append({
@@ -1441,8 +2028,9 @@ class TeamManager:
         # Aktif görevlerden kaldır
         if task_id in self.active_tasks:
             del self.active_tasks[task_id]
+        self._freeze_task(task_id, task)
         
-        self.save_data()
+        self.save_data("tasks", task_id=task_id)
         return True
 
     # Görev başarısız olarak işaretleme metodu
@@ -1458,6 +2046,7 @@ class TeamManager:
         task.status_message = "Başarısız: " + error_message
         task.updated_at = datetime.now().isoformat()
         task.is_active = False  # Görev artık aktif değil
+        self._externalize_task(task)
         
         # Log ekle
         task.logs.append({
@@ -1468,8 +2057,9 @@ class TeamManager:
         # Aktif görevlerden kaldır
         if task_id in self.active_tasks:
             del self.active_tasks[task_id]
+        self._freeze_task(task_id, task)
         
-        self.save_data()
+        self.save_data("tasks", task_id=task_id)
         return True
 
     # Görev durum kontrolü
@@ -1494,10 +2084,27 @@ class TeamManager:
             "progress": task.progress if hasattr(task, "progress") else 0,
             "status_message": task.status_message if hasattr(task, "status_message") else "",
             "is_active": is_active,
-            "logs": task.logs,
+            "logs": task.logs.recent(),
+            "log_count": len(task.logs),
             "last_update": task.updated_at
         }
 
+    async def get_task_logs(self, task_id: str, cursor: int = 0, limit: int = 100) -> Optional[Dict[str, Any]]:
+        """Görevin tüm log geçmişini imleçle sayfa sayfa döndürür (görev yoksa None)
+
+        İlk sayfa için cursor=0 verilir; yanıttaki next_cursor sonraki sayfayı
+        okur. Son sayfada next_cursor, sonradan eklenen logları okumak için
+        tekrar kullanılabilir. Loglar diskten okunduğu için bekleyen loglar
+        önce yazılır; bekleme ve okuma olay döngüsünü bloklamaz.
+        """
+        if task_id not in self.tasks:
+            return None
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        if self._persistence.is_pending("logs"):
+            await asyncio.to_thread(self.flush)
+        logs, next_cursor = await asyncio.to_thread(self.storage.read_logs, task_id, cursor, limit)
+        return {"logs": logs, "next_cursor": next_cursor, "has_more": len(logs) == limit}
+
     # Aktif görevleri listele
     def list_active_tasks(self) -> List[Dict]:
         """Sistemdeki aktif görevleri listeler"""
@@ -1548,7 +2155,7 @@ class TeamManager:
             if task_id in self.active_tasks:
                 del self.active_tasks[task_id]
             
-            self.save_data()
+            self.save_data("tasks", task_id=task_id)
             return True
         
         return False 
\ No newline at end of file
@@ -8,6 +8,7 @@ from pydantic import BaseModel, Field
 
 from src.agents.agent import Agent, ROLE_SYSTEM_PROMPTS, create_agent_from_config, generate_agent_id
 from src.models.base import ModelCapability
+from src.models.llm_backend import BackendRouter
 from src.models.ollama import OllamaAdapter, get_model_info_from_map
 from src.models.team import AgentConfig, AgentRole, SubTask, Task, TeamConfig, TeamType, TaskStatus
 
@@ -15,8 +16,10 @@ from src.models.team import AgentConfig, AgentRole, SubTask, Task, TeamConfig, T
 class TeamManager:
     """Ekip yönetimi ve görev atama sınıfı"""
 
-    def __init__(self, ollama_adapter: OllamaAdapter):
+    def __init__(self, ollama_adapter: OllamaAdapter, backends: Optional[BackendRouter] = None):
         self.ollama_adapter = ollama_adapter
+        # Ajan bazlı seçilebilen LLM sunucuları (varsayılan: ollama_adapter)
+        self.backends = backends or BackendRouter.from_env(ollama_adapter)
         self.teams: Dict[str, Dict[str, Any]] = {}  # team_id -> team bilgileri
         self.agents: Dict[str, Agent] = {}  # agent_id -> Agent nesnesi
         self.tasks: Dict[str, Task] = {}  # task_id -> Task nesnesi
@@ -41,6 +44,13 @@ class TeamManager:
             print(f"Modeller yüklenirken hata oluştu: {e}")
             return self.available_models
 
+    def is_model_available(self, model_name: str) -> bool:
+        """Modelin pull edilmiş olup olmadığını HTTP çağrısı yapmadan kontrol eder"""
+        registry = self.ollama_adapter.registry
+        if registry.ready:
+            return registry.has(model_name)
+        return model_name in self.available_models
+
     def create_team(
         self, 
         name: str, 
@@ -72,13 +82,18 @@ class TeamManager:
         role: AgentRole,
         model_name: str,
         system_prompt: Optional[str] = None,
-        required_capabilities: Optional[Set[ModelCapability]] = None
+        required_capabilities: Optional[Set[ModelCapability]] = None,
+        backend: Optional[str] = None
     ) -> str:
-        """Ekibe yeni bir ajan ekler"""
+        """Ekibe yeni bir ajan ekler (backend boşsa varsayılan Ollama sunucusu kullanılır)"""
         if team_id not in self.teams:
             raise ValueError(f"Ekip bulunamadı: {team_id}")
-            
-        if model_name not in self.available_models:
+
+        # Bilinmeyen sunucu adı için ValueError
+        llm_backend = self.backends.get(backend)
+
+        # Model listesi yalnızca Ollama için tutulur
+        if llm_backend is self.ollama_adapter and not self.is_model_available(model_name):
             available_models_str = ", ".join(self.available_models)
             raise ValueError(f"Model mevcut değil. Mevcut modeller: {available_models_str}")
         
@@ -114,11 +129,12 @@ class TeamManager:
             role=role,
             model_name=model_name,
             system_prompt=system_prompt,
-            required_capabilities=required_capabilities
+            required_capabilities=required_capabilities,
+            backend=backend
         )
         
         # Ajan nesnesini oluştur
-        agent = create_agent_from_config(agent_config, self.ollama_adapter)
+        agent = create_agent_from_config(agent_config, llm_backend)
         
         # Ekip yapılandırmasına ekle
         team_config = self.teams[team_id]["config"]
@@ -388,17 +404,8 @@ Lütfen geri bildirimi dikkate alarak mevcut çözümü iyileştir ve güncellen
         if not selected_agent:
             raise ValueError("Ekipte iyileştirme yapabilecek ajan bulunamadı.")
             
-        # İyileştirme isteğini işle
-        selected_agent.conversation.add_message("user", improvement_prompt)
-        
-        improved_result = await selected_agent.ollama_adapter.generate(
-            model_name=selected_agent.model_name,
-            prompt="",
-            conversation=selected_agent.conversation,
-            temperature=0.7
-        )
-        
-        selected_agent.conversation.add_message("assistant", improved_result)
+        # İyileştirme isteğini ajanın mevcut oturumunda işle (önceki turların KV bağlamı korunur)
+        improved_result = await selected_agent.respond(improvement_prompt)
         
         # Görevi güncelle
         task.result = improved_result
@@ -0,0 +1,266 @@
+import hashlib
+import os
+import threading
+import time
+import zlib
+from collections import Counter, OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.utils import codec as json_codec
+from src.utils.persistence import atomic_write_json
+
+try:
+    import zstandard
+except ImportError:  # zstd isteğe bağlı; yoksa zlib kullanılır
+    zstandard = None
+
+CODECS = ("zst", "zz")
+
+# Kaydın içinde blob referansını tutan anahtar: "content" -> "content_blob"
+BLOB_SUFFIX = "_blob"
+
+# Görev kayıtlarında blob deposuna taşınan alanlar
+DOCUMENT_BLOB_FIELDS = ("content",)
+SUBTASK_BLOB_FIELDS = ("result", "previous_result")
+
+
+class BlobStore:
+    """İçerik özetiyle (SHA-256) adreslenen, sıkıştırılmış metin deposu
+
+    Aynı metin bir kez saklanır: data/blobs/<ilk 2 hane>/<özet>.<zst|zz>.
+    Kayıtlar içerik yerine {"hash", "size"} referansı tutar ve içerik
+    istendiğinde okunur (son okunanlar bellekte önbelleklenir).
+
+    Referans sayımı sahip (görev id) bazında tutulur: set_refs() sahibin
+    güncel referanslarını bildirir, sayımlar data/blobs/refs.json'a yazılır.
+    gc() hiçbir sahibin referans vermediği ve gc_grace_seconds'tan eski
+    blobları siler.
+    """
+
+    def __init__(
+        self,
+        directory: str = "data/blobs",
+        codec: Optional[str] = None,
+        min_bytes: int = 1024,
+        cache_size: int = 64,
+        gc_grace_seconds: float = 300.0
+    ):
+        if codec is None:
+            codec = "zst" if zstandard is not None else "zz"
+        if codec == "zst" and zstandard is None:
+            print("[WARN] zstandard kurulu değil, blob sıkıştırması için zlib kullanılıyor")
+            codec = "zz"
+        if codec not in CODECS:
+            raise ValueError(f"Bilinmeyen blob sıkıştırması: {codec}. Geçerli değerler: {', '.join(CODECS)}")
+        self.directory = directory
+        self.codec = codec
+        self.min_bytes = min_bytes
+        self.cache_size = cache_size
+        self.gc_grace_seconds = gc_grace_seconds
+        self.refs_path = os.path.join(directory, "refs.json")
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._owners: Dict[str, List[str]] = {}
+        self._counts: Counter = Counter()
+        self._refs_dirty = False
+        self.counters = {"puts": 0, "dedup": 0, "reads": 0, "cache_hits": 0, "bytes_in": 0, "bytes_stored": 0, "collected": 0}
+        self._load_refs()
+
+    @classmethod
+    def from_env(cls, directory: str = "data") -> "BlobStore":
+        codec = os.getenv("BLOB_CODEC", "").lower() or None
+        return cls(
+            os.path.join(directory, "blobs"),
+            codec={"zstd": "zst", "zlib": "zz"}.get(codec, codec),
+            min_bytes=int(os.getenv("BLOB_MIN_BYTES", "1024")),
+            cache_size=int(os.getenv("BLOB_CACHE_SIZE", "64")),
+            gc_grace_seconds=float(os.getenv("BLOB_GC_GRACE_SECONDS", "300")),
+        )
+
+    def _load_refs(self) -> None:
+        if not os.path.exists(self.refs_path):
+            return
+        try:
+            self._owners = json_codec.load_file(self.refs_path)
+        except Exception as e:
+            print(f"[WARN] Blob referansları okunamadı: {e}")
+            self._owners = {}
+        for hashes in self._owners.values():
+            self._counts.update(hashes)
+
+    def _path(self, digest: str, codec: str) -> str:
+        return os.path.join(self.directory, digest[:2], f"{digest}.{codec}")
+
+    def _find(self, digest: str) -> Optional[Tuple[str, str]]:
+        for codec in CODECS:
+            path = self._path(digest, codec)
+            if os.path.exists(path):
+                return path, codec
+        return None
+
+    def _compress(self, data: bytes) -> bytes:
+        if self.codec == "zst":
+            return zstandard.ZstdCompressor(level=3).compress(data)
+        return zlib.compress(data, 6)
+
+    @staticmethod
+    def _decompress(data: bytes, codec: str) -> bytes:
+        if codec == "zst":
+            if zstandard is None:
+                raise RuntimeError("zstd ile sıkıştırılmış blob okumak için zstandard paketi gerekli")
+            return zstandard.ZstdDecompressor().decompress(data)
+        return zlib.decompress(data)
+
+    def put(self, text: str) -> Dict[str, Any]:
+        """Metni saklar ve referansını döndürür (aynı içerik tekrar yazılmaz)"""
+        data = text.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        self.counters["puts"] += 1
+        self.counters["bytes_in"] += len(data)
+        if self._find(digest) is not None:
+            self.counters["dedup"] += 1
+        else:
+            path = self._path(digest, self.codec)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            compressed = self._compress(data)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(compressed)
+            os.replace(tmp_path, path)
+            self.counters["bytes_stored"] += len(compressed)
+        self._remember(digest, text)
+        return {"hash": digest, "size": len(data)}
+
+    def _remember(self, digest: str, text: str) -> None:
+        with self._lock:
+            self._cache[digest] = text
+            self._cache.move_to_end(digest)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def get(self, ref: Any) -> str:
+        """Referansın (veya özetin) içeriğini döndürür"""
+        digest = ref["hash"] if isinstance(ref, dict) else ref
+        with self._lock:
+            text = self._cache.get(digest)
+            if text is not None:
+                self._cache.move_to_end(digest)
+                self.counters["cache_hits"] += 1
+                return text
+        found = self._find(digest)
+        if found is None:
+            raise KeyError(f"Blob bulunamadı: {digest}")
+        path, codec = found
+        with open(path, "rb") as f:
+            text = self._decompress(f.read(), codec).decode("utf-8")
+        self.counters["reads"] += 1
+        self._remember(digest, text)
+        return text
+
+    def externalize(self, record: Dict[str, Any], fields: Iterable[str]) -> Dict[str, Any]:
+        """min_bytes'tan uzun metin alanlarını blob referansına çevirilmiş yeni kayıt döndürür
+
+        Değişecek alan yoksa kaydın kendisi döner.
+        """
+        updated = None
+        for field in fields:
+            value = record.get(field)
+            if isinstance(value, str) and len(value) >= self.min_bytes:
+                if updated is None:
+                    updated = dict(record)
+                updated[field + BLOB_SUFFIX] = self.put(value)
+                del updated[field]
+        return record if updated is None else updated
+
+    def resolve(self, record: Dict[str, Any], fields: Iterable[str]) -> Dict[str, Any]:
+        """Blob referanslı alanları içerikleriyle doldurulmuş kopya döndürür (referans yoksa kaydın kendisi)"""
+        resolved = None
+        for field in fields:
+            ref = record.get(field + BLOB_SUFFIX)
+            if ref is None or field in record:
+                continue
+            if resolved is None:
+                resolved = dict(record)
+            try:
+                resolved[field] = self.get(ref)
+            except (KeyError, OSError, RuntimeError, zlib.error) as e:
+                print(f"[WARN] Blob okunamadı ({field}): {e}")
+                resolved[field] = None
+        return record if resolved is None else resolved
+
+    def resolve_task(self, task: Dict[str, Any]) -> Dict[str, Any]:
+        """Görev verisindeki doküman ve alt görev blob referanslarını içerikleriyle doldurur (dışa aktarma için)"""
+        return {
+            **task,
+            "documents": [self.resolve(document, DOCUMENT_BLOB_FIELDS) for document in task.get("documents") or []],
+            "subtasks": [self.resolve(subtask, SUBTASK_BLOB_FIELDS) for subtask in task.get("subtasks") or []],
+        }
+
+    def set_refs(self, owner: str, hashes: List[str]) -> None:
+        """Sahibin güncel blob referanslarını bildirir (boş liste sahibi siler)"""
+        with self._lock:
+            previous = self._owners.get(owner, [])
+            if sorted(previous) == sorted(hashes):
+                return
+            self._counts.subtract(previous)
+            self._counts.update(hashes)
+            if hashes:
+                self._owners[owner] = list(hashes)
+            else:
+                self._owners.pop(owner, None)
+            self._refs_dirty = True
+
+    def owners(self) -> List[str]:
+        with self._lock:
+            return list(self._owners)
+
+    def refcount(self, digest: str) -> int:
+        with self._lock:
+            return max(0, self._counts.get(digest, 0))
+
+    def save_refs(self) -> None:
+        """Değiştiyse referans sayımlarını diske yazar"""
+        with self._lock:
+            if not self._refs_dirty:
+                return
+            owners = {owner: list(hashes) for owner, hashes in self._owners.items()}
+            self._refs_dirty = False
+        try:
+            atomic_write_json(self.refs_path, owners)
+        except Exception:
+            with self._lock:
+                self._refs_dirty = True
+            raise
+
+    def gc(self) -> int:
+        """Referanssız blobları siler; silinen blob sayısını döndürür"""
+        if not os.path.isdir(self.directory):
+            return 0
+        removed = 0
+        cutoff = time.time() - self.gc_grace_seconds
+        for root, _, filenames in os.walk(self.directory):
+            for filename in filenames:
+                digest, _, codec = filename.partition(".")
+                if codec not in CODECS:
+                    continue
+                path = os.path.join(root, filename)
+                if self.refcount(digest) > 0 or os.path.getmtime(path) > cutoff:
+                    continue
+                os.remove(path)
+                with self._lock:
+                    self._cache.pop(digest, None)
+                removed += 1
+        self.counters["collected"] += removed
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            live = sum(1 for count in self._counts.values() if count > 0)
+            return {
+                **self.counters,
+                "codec": self.codec,
+                "min_bytes": self.min_bytes,
+                "referenced_blobs": live,
+                "owners": len(self._owners),
+                "cached": len(self._cache),
+            }
@@ -0,0 +1,233 @@
+import argparse
+import json
+import os
+import time
+from datetime import date, datetime
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+try:
+    import orjson
+except ImportError:  # isteğe bağlı hızlı kodlayıcı
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # isteğe bağlı hızlı kodlayıcı
+    msgspec = None
+
+CODECS = ("orjson", "msgspec", "json")
+
+
+def _default(value: Any) -> Any:
+    """Kodlayıcıların doğrudan desteklemediği tipler"""
+    if hasattr(value, "model_dump"):
+        return value.model_dump()
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    raise TypeError(f"JSON'a çevrilemeyen tip: {type(value).__name__}")
+
+
+class JSONCodec:
+    """orjson, msgspec veya standart json ile kodlama/çözme
+
+    dumps() her zaman UTF-8 bayt döndürür; loads() bayt veya metin kabul
+    eder. Üç kodlayıcının çıktısı aynı JSON'dur (Türkçe karakterler kaçışsız
+    yazılır), böylece dosyalar kodlayıcı değişse de okunabilir.
+    """
+
+    def __init__(self, name: str = "auto"):
+        if name == "auto":
+            name = "orjson" if orjson is not None else "msgspec" if msgspec is not None else "json"
+        if name == "orjson" and orjson is None or name == "msgspec" and msgspec is None:
+            print(f"[WARN] {name} kurulu değil, standart json kullanılıyor")
+            name = "json"
+        if name not in CODECS:
+            raise ValueError(f"Bilinmeyen JSON kodlayıcısı: {name}. Geçerli değerler: auto, {', '.join(CODECS)}")
+        self.name = name
+        if name == "msgspec":
+            self._encoder = msgspec.json.Encoder(enc_hook=_default)
+            self._sorted_encoder = msgspec.json.Encoder(enc_hook=_default, order="sorted")
+            self._decoder = msgspec.json.Decoder()
+
+    @classmethod
+    def from_env(cls) -> "JSONCodec":
+        return cls(os.getenv("JSON_CODEC", "auto").lower())
+
+    def dumps(self, value: Any, sort_keys: bool = False) -> bytes:
+        if self.name == "orjson":
+            option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            if sort_keys:
+                option |= orjson.OPT_SORT_KEYS
+            return orjson.dumps(value, default=_default, option=option)
+        if self.name == "msgspec":
+            return (self._sorted_encoder if sort_keys else self._encoder).encode(value)
+        return json.dumps(value, ensure_ascii=False, sort_keys=sort_keys, default=_default, separators=(",", ":")).encode("utf-8")
+
+    def dumps_str(self, value: Any, sort_keys: bool = False) -> str:
+        return self.dumps(value, sort_keys).decode("utf-8")
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        if self.name == "orjson":
+            return orjson.loads(data)
+        if self.name == "msgspec":
+            return self._decoder.decode(data.encode("utf-8") if isinstance(data, str) else data)
+        return json.loads(data)
+
+    def load_file(self, path: str) -> Any:
+        with open(path, "rb") as f:
+            return self.loads(f.read())
+
+
+# Uygulama genelinde kullanılan kodlayıcı (JSON_CODEC: auto, orjson, msgspec, json)
+codec = JSONCodec.from_env()
+
+
+def dumps(value: Any, sort_keys: bool = False) -> bytes:
+    return codec.dumps(value, sort_keys)
+
+
+def dumps_str(value: Any, sort_keys: bool = False) -> str:
+    return codec.dumps_str(value, sort_keys)
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    return codec.loads(data)
+
+
+def load_file(path: str) -> Any:
+    return codec.load_file(path)
+
+
+_stream_decoder = json.JSONDecoder()
+
+
+def iter_items(fp: IO[str], chunk_size: int = 1 << 16) -> Iterator[Tuple[Any, Any]]:
+    """Tek parça büyük bir JSON nesnesini veya dizisini eleman eleman ayrıştırır
+
+    Nesnede (anahtar, değer), dizide (sıra, değer) çiftleri üretir. Dosya
+    parça parça okunur; bellekte aynı anda yalnızca bir elemanın metni
+    tutulur. Böylece json.dump ile tek satıra yazılmış çok büyük dosyalar
+    (ör. eski tasks.json) belleğe sığmasa da okunabilir.
+    """
+    buffer = ""
+    pos = 0
+    eof = False
+
+    def fill() -> None:
+        nonlocal buffer, pos, eof
+        # Büyük elemanlarda okuma boyutu büyür; yarım eleman tekrar tekrar ayrıştırılmaz
+        chunk = fp.read(max(chunk_size, len(buffer) - pos))
+        eof = not chunk
+        buffer = buffer[pos:] + chunk
+        pos = 0
+
+    def peek() -> str:
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n":
+                pos += 1
+            if pos < len(buffer) or eof:
+                return buffer[pos] if pos < len(buffer) else ""
+            fill()
+
+    def expect(chars: str) -> str:
+        nonlocal pos
+        char = peek()
+        if not char or char not in chars:
+            raise ValueError(f"JSON akışında beklenmeyen karakter: {char!r} (beklenen: {chars})")
+        pos += 1
+        return char
+
+    def value() -> Any:
+        nonlocal pos
+        peek()
+        while True:
+            try:
+                result, end = _stream_decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                fill()
+                continue
+            # Parçanın sonunda biten sayı veya sabit yarım kalmış olabilir
+            if end == len(buffer) and not eof:
+                fill()
+                continue
+            pos = end
+            return result
+
+    closing = "}" if expect("{[") == "{" else "]"
+    index = 0
+    if peek() == closing:
+        return
+    while True:
+        if closing == "}":
+            key = value()
+            expect(":")
+        else:
+            key = index
+        yield key, value()
+        index += 1
+        if expect("," + closing) == closing:
+            return
+
+
+def _sample_payload(size: int) -> Dict[str, Any]:
+    """Yaklaşık size bayt büyüklüğünde görev benzeri veri"""
+    log = {"timestamp": datetime.now().isoformat(), "message": "Alt görev tamamlandı: Geliştirici çıktısı işlendi"}
+    document = {"id": "doc", "title": "main.py", "type": "code", "content": "print('merhaba dünya')\n" * 40}
+    task: Dict[str, Any] = {"id": "task", "title": "Örnek görev", "status": "completed", "progress": 100, "logs": [], "documents": []}
+    step = len(json.dumps(log, ensure_ascii=False)) + len(json.dumps(document, ensure_ascii=False))
+    for _ in range(max(1, size // step)):
+        task["logs"].append(dict(log))
+        task["documents"].append(dict(document))
+    return task
+
+
+def benchmark(sizes: List[int], repeat: int = 20, codecs: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """Kurulu kodlayıcıların yük boyutuna göre kodlama/çözme sürelerini ölçer"""
+    available = [name for name in (codecs or CODECS) if name == "json" or globals()[name] is not None]
+    results = []
+    for size in sizes:
+        payload = _sample_payload(size)
+        for name in available:
+            current = JSONCodec(name)
+            encoded = current.dumps(payload)
+            timings: Dict[str, Callable[[], Any]] = {
+                "encode": lambda: current.dumps(payload),
+                "decode": lambda: current.loads(encoded),
+            }
+            row: Dict[str, Any] = {"codec": name, "bytes": len(encoded)}
+            for label, operation in timings.items():
+                start = time.perf_counter()
+                for _ in range(repeat):
+                    operation()
+                row[f"{label}_ms"] = (time.perf_counter() - start) * 1000 / repeat
+            results.append(row)
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="JSON kodlayıcı bilgisi ve karşılaştırması")
+    parser.add_argument("--benchmark", action="store_true", help="Kodlayıcıların yük boyutuna göre kodlama/çözme sürelerini ölçer")
+    parser.add_argument("--sizes", default="1000,100000,1000000,10000000", help="Virgülle ayrılmış yaklaşık yük boyutları (bayt)")
+    parser.add_argument("--repeat", type=int, default=20, help="Her ölçümün tekrar sayısı")
+    args = parser.parse_args(argv)
+
+    print(f"Kullanılan kodlayıcı: {codec.name} (kurulu: {', '.join(name for name in CODECS if name == 'json' or globals()[name] is not None)})")
+    if not args.benchmark:
+        return
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    print(f"{'kodlayıcı':<10} {'boyut':>12} {'kodlama ms':>12} {'çözme ms':>12}")
+    for row in benchmark(sizes, args.repeat):
+        print(f"{row['codec']:<10} {row['bytes']:>12} {row['encode_ms']:>12.3f} {row['decode_ms']:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import os
+import zlib
+from typing import Any, Dict, Optional
+
+from src.utils import codec
+
+
+def freeze_min_bytes() -> int:
+    """Bu boyuttan (JSON bayt) küçük alanlar dondurulmaz (TASK_FREEZE_MIN_BYTES, 0 kapatır)"""
+    return int(os.getenv("TASK_FREEZE_MIN_BYTES", "1024"))
+
+
+class FrozenValue:
+    """zlib ile sıkıştırılmış JSON değeri"""
+
+    __slots__ = ("data", "size")
+
+    def __init__(self, data: bytes, size: int):
+        self.data = data
+        self.size = size  # Sıkıştırılmamış JSON boyutu
+
+    @classmethod
+    def pack(cls, value: Any, min_bytes: int, level: int = 6) -> Optional["FrozenValue"]:
+        """Değeri sıkıştırır; küçükse veya sıkıştırma kazandırmıyorsa None"""
+        raw = codec.dumps(value)
+        if len(raw) < min_bytes:
+            return None
+        data = zlib.compress(raw, level)
+        if len(data) >= len(raw):
+            return None
+        return cls(data, len(raw))
+
+    def thaw(self) -> Any:
+        return codec.loads(zlib.decompress(self.data))
+
+
+class FreezableField:
+    """Sıkıştırılabilen nesne özniteliği
+
+    Değer freeze() ile FrozenValue olarak saklanır; okunduğunda açılır.
+    Metinler her okumada açılır ve sıkıştırılmış kalır. Liste ve sözlükler
+    yerinde değiştirilebildiği için ilk okumada açılıp düz değer olarak
+    geri yazılır (yeniden dondurulana kadar). peek() değeri öznitelikte
+    açmadan döndürür (kaydetme ve boyut hesabı için).
+    """
+
+    def __set_name__(self, owner, name: str) -> None:
+        self.name = name
+        self.slot = f"_{name}"
+
+    def __get__(self, obj, objtype=None) -> Any:
+        if obj is None:
+            return self
+        value = obj.__dict__.get(self.slot)
+        if isinstance(value, FrozenValue):
+            value = value.thaw()
+            if not isinstance(value, str):
+                obj.__dict__[self.slot] = value
+        return value
+
+    def __set__(self, obj, value: Any) -> None:
+        obj.__dict__[self.slot] = value
+
+    def peek(self, obj) -> Any:
+        value = obj.__dict__.get(self.slot)
+        return value.thaw() if isinstance(value, FrozenValue) else value
+
+    def freeze(self, obj, min_bytes: int) -> bool:
+        """Değeri sıkıştırır; dondurulduysa True"""
+        value = obj.__dict__.get(self.slot)
+        if value is None or isinstance(value, FrozenValue) or min_bytes <= 0:
+            return False
+        frozen = FrozenValue.pack(value, min_bytes)
+        if frozen is None:
+            return False
+        obj.__dict__[self.slot] = frozen
+        return True
+
+    def stats(self, obj) -> Dict[str, int]:
+        value = obj.__dict__.get(self.slot)
+        if not isinstance(value, FrozenValue):
+            return {"fields": 0, "raw_bytes": 0, "bytes": 0}
+        return {"fields": 1, "raw_bytes": value.size, "bytes": len(value.data)}
@@ -0,0 +1,333 @@
+import copy
+import hashlib
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.utils import codec
+from src.utils.persistence import list_identity
+
+# Yalnızca sona eklenen listeler: yeni elemanlar sıra numarasıyla yazılır
+# (görev logları görev kaydında değil, ayrı log deposunda tutulur; iterasyonlar
+# tamamlanan görevlerde sıkıştırıldığı için liste kimliği izlenmez, değişince tamamı yazılır)
+APPEND_FIELDS = ("documents",)
+# Elemanları yerinde değişen listeler: değişen eleman sıra numarasıyla yeniden yazılır
+ITEM_FIELDS = ("subtasks",)
+
+
+def _digest(value: Any) -> bytes:
+    return hashlib.sha1(codec.dumps(value, sort_keys=True)).digest()
+
+
+class _Shadow:
+    """Bir görevin en son günlüğe yazılmış hali (karşılaştırma için)
+
+    Alanların kopyası yerine özeti tutulur; böylece bellekte sıkıştırılan
+    görevlerin büyük alanları burada açık halde kalmaz.
+    """
+
+    __slots__ = ("fields", "lists", "items")
+
+    def __init__(self, fields: Dict[str, Any], lists: Dict[str, Tuple[int, int]], items: Dict[str, List[Any]]):
+        self.fields = fields
+        # alan -> (liste nesnesinin id'si, uzunluk)
+        self.lists = lists
+        self.items = items
+
+
+def _apply(tasks: Dict[str, Dict[str, Any]], record: Dict[str, Any]) -> None:
+    """Tek bir günlük kaydını görev sözlüklerine uygular (kayıtlar idempotent)"""
+    op = record.get("op")
+    task_id = record.get("id")
+    if op == "put":
+        tasks[task_id] = record["task"]
+        return
+    if op == "del":
+        tasks.pop(task_id, None)
+        return
+    task = tasks.get(task_id)
+    if task is None:
+        return
+    if op == "set":
+        task.update(record["fields"])
+    elif op == "add":
+        values = task.setdefault(record["field"], [])
+        for offset, item in enumerate(record["items"]):
+            index = record["index"] + offset
+            if index < len(values):
+                values[index] = item
+            else:
+                values.append(item)
+    elif op == "item":
+        values = task.setdefault(record["field"], [])
+        index = record["index"]
+        if index < len(values):
+            values[index] = record["value"]
+        else:
+            values.append(record["value"])
+
+
+class TaskJournal:
+    """Görev değişiklikleri için yalnızca sona eklenen günlük (WAL) ve anlık görüntü
+
+    sync() verilen (değişen) görevleri en son yazılmış halleriyle
+    karşılaştırır ve yalnızca farkları küçük JSON satırları olarak WAL'a
+    ekler: yeni görevler, değişen alanlar (durum, ilerleme, sonuç...),
+    yeni log/doküman/iterasyon kayıtları ve değişen alt görevler. Böylece bir ilerleme
+    güncellemesinin yazım maliyeti tüm veri yerine kaydın boyutu kadardır.
+
+    WAL compact_bytes boyutunu veya son sıkıştırmadan bu yana
+    compact_seconds süreyi aşınca diskteki hal (anlık görüntü + WAL) akış
+    halinde yeni anlık görüntüye (tasks.json) yazılır ve WAL boşaltılır.
+    Açılışta anlık görüntü okunup WAL üzerine uygulanır; kayıtlar sıra
+    numaralı olduğu için iki adım arasında kesilen bir sıkıştırma sonrası
+    tekrar uygulanmaları güvenlidir.
+    """
+
+    def __init__(
+        self,
+        wal_path: str = "data/tasks.wal",
+        snapshot_path: str = "data/tasks.json",
+        compact_bytes: int = 64 * 1024 * 1024,
+        compact_seconds: float = 600.0,
+        fsync: bool = False
+    ):
+        self.wal_path = wal_path
+        self.snapshot_path = snapshot_path
+        self.compact_bytes = compact_bytes
+        self.compact_seconds = compact_seconds
+        self.fsync = fsync
+        self._shadows: Dict[str, _Shadow] = {}
+        self._lock = threading.Lock()
+        self._last_compaction = time.monotonic()
+        self.counters = {"syncs": 0, "records": 0, "bytes": 0, "compactions": 0, "replayed": 0, "corrupt": 0}
+
+    @classmethod
+    def from_env(cls, directory: str = "data") -> "TaskJournal":
+        return cls(
+            wal_path=os.path.join(directory, "tasks.wal"),
+            snapshot_path=os.path.join(directory, "tasks.json"),
+            compact_bytes=int(os.getenv("TASK_WAL_COMPACT_BYTES", str(64 * 1024 * 1024))),
+            compact_seconds=float(os.getenv("TASK_WAL_COMPACT_SECONDS", "600")),
+            fsync=os.getenv("TASK_WAL_FSYNC", "False").lower() == "true",
+        )
+
+    def _records(self) -> Iterator[Dict[str, Any]]:
+        if not os.path.exists(self.wal_path):
+            return
+        with open(self.wal_path, "rb") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    record = codec.loads(line)
+                except ValueError:
+                    # Çökme sırasında yarım kalmış son satır
+                    self.counters["corrupt"] += 1
+                    continue
+                yield record
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """Anlık görüntüyü okur ve WAL kayıtlarını üzerine uygular"""
+        tasks: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(self.snapshot_path):
+            tasks = codec.load_file(self.snapshot_path)
+        for record in self._records():
+            _apply(tasks, record)
+            self.counters["replayed"] += 1
+        return tasks
+
+    def iter_tasks(self) -> Iterator[Dict[str, Any]]:
+        """Görevleri anlık görüntüden tek tek okuyup WAL kayıtlarını uygulayarak üretir
+
+        Anlık görüntü akış halinde ayrıştırılır; bellekte yalnızca WAL
+        kayıtları (sıkıştırma eşiğiyle sınırlı) ve o anki görev tutulur.
+        """
+        pending: Dict[str, List[Dict[str, Any]]] = {}
+        for record in self._records():
+            pending.setdefault(record.get("id"), []).append(record)
+
+        def replay(task_id: str, task: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+            tasks = {} if task is None else {task_id: task}
+            for record in pending.pop(task_id, []):
+                _apply(tasks, record)
+            return tasks.get(task_id)
+
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                for task_id, task in codec.iter_items(f):
+                    task = replay(task_id, task)
+                    if task is not None:
+                        yield {**task, "id": task.get("id", task_id)}
+        # Son sıkıştırmadan sonra oluşturulan görevler
+        for task_id in list(pending):
+            task = replay(task_id, None)
+            if task is not None:
+                yield {**task, "id": task.get("id", task_id)}
+
+    @staticmethod
+    def _shadow(data: Dict[str, Any], lists: Dict[str, Tuple[int, int]]) -> _Shadow:
+        fields = {
+            key: _digest(value)
+            for key, value in data.items()
+            if key not in APPEND_FIELDS and key not in ITEM_FIELDS
+        }
+        items = {field: copy.deepcopy(data.get(field) or []) for field in ITEM_FIELDS}
+        return _Shadow(fields, lists, items)
+
+    @staticmethod
+    def _list_state(task: Any) -> Dict[str, Tuple[int, int]]:
+        return {field: (list_identity(task, field), len(getattr(task, field))) for field in APPEND_FIELDS}
+
+    def prime(self, tasks: Dict[str, Any]) -> None:
+        """Diskten yüklenen görevleri yazılmış kabul eder (açılışta çağrılır)"""
+        with self._lock:
+            self._shadows = {
+                task_id: self._shadow(task.to_dict(), self._list_state(task))
+                for task_id, task in list(tasks.items())
+            }
+
+    def _diff(self, task_id: str, task: Any, shadow: Optional[_Shadow]) -> Tuple[List[Dict[str, Any]], _Shadow]:
+        data = task.to_dict()
+        lists = self._list_state(task)
+        if shadow is None:
+            return [{"op": "put", "id": task_id, "task": data}], self._shadow(data, lists)
+
+        records: List[Dict[str, Any]] = []
+        changed = {
+            key: value for key, value in data.items()
+            if key not in APPEND_FIELDS and key not in ITEM_FIELDS and shadow.fields.get(key) != _digest(value)
+        }
+
+        for field in APPEND_FIELDS:
+            values = data[field]
+            list_id, length = shadow.lists[field]
+            if list_id != lists[field][0] or len(values) < length:
+                # Liste yeniden atanmış veya kısalmış: tamamı yazılır
+                changed[field] = values
+            elif len(values) > length:
+                records.append({"op": "add", "id": task_id, "field": field, "index": length, "items": values[length:]})
+
+        for field in ITEM_FIELDS:
+            values = data[field] or []
+            previous = shadow.items[field]
+            if len(values) < len(previous):
+                changed[field] = values
+                continue
+            for index, value in enumerate(values):
+                if index >= len(previous) or previous[index] != value:
+                    records.append({"op": "item", "id": task_id, "field": field, "index": index, "value": value})
+
+        if changed:
+            records.insert(0, {"op": "set", "id": task_id, "fields": changed})
+        if not records:
+            return records, shadow
+        return records, self._shadow(data, lists)
+
+    def _append(self, records: List[Dict[str, Any]]) -> None:
+        payload = b"".join(codec.dumps(record) + b"\n" for record in records)
+        os.makedirs(os.path.dirname(self.wal_path) or ".", exist_ok=True)
+        with open(self.wal_path, "ab") as f:
+            f.write(payload)
+            if self.fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        self.counters["records"] += len(records)
+        self.counters["bytes"] += len(payload)
+
+    def sync(self, tasks: Dict[str, Any], complete: bool = True) -> int:
+        """Verilen görevlerin son sync'ten bu yana değişen alanlarını WAL'a ekler; yazılan kayıt sayısını döndürür
+
+        Yalnızca verilen görevler karşılaştırılır. complete True ise
+        listede olmayan görevler silinmiş sayılır; False ise (yalnızca
+        değişen görevler verildiğinde) silme delete() ile yapılır.
+        Kayıtlar ve yeni karşılaştırma durumları önce hesaplanır, WAL'a
+        yazım başarılı olursa kaydedilir; böylece yarıda kalan bir sync
+        sonraki denemede aynı farkları yeniden üretir.
+        """
+        with self._lock:
+            records: List[Dict[str, Any]] = []
+            shadows: Dict[str, _Shadow] = {}
+            for task_id, task in list(tasks.items()):
+                task_records, shadow = self._diff(task_id, task, self._shadows.get(task_id))
+                records.extend(task_records)
+                shadows[task_id] = shadow
+            removed = [task_id for task_id in self._shadows if task_id not in shadows] if complete else []
+            records.extend({"op": "del", "id": task_id} for task_id in removed)
+
+            if records:
+                self._append(records)
+            self._shadows.update(shadows)
+            for task_id in removed:
+                del self._shadows[task_id]
+            self.counters["syncs"] += 1
+
+            if self._should_compact():
+                self._compact()
+            return len(records)
+
+    def delete(self, task_ids: Iterable[str]) -> None:
+        """Görevlerin silindiğini WAL'a ekler"""
+        with self._lock:
+            records = [{"op": "del", "id": task_id} for task_id in task_ids]
+            if not records:
+                return
+            self._append(records)
+            for record in records:
+                self._shadows.pop(record["id"], None)
+
+    def _should_compact(self) -> bool:
+        if not os.path.exists(self.wal_path):
+            return False
+        size = os.path.getsize(self.wal_path)
+        if size == 0:
+            return False
+        return size >= self.compact_bytes or time.monotonic() - self._last_compaction >= self.compact_seconds
+
+    def _write_snapshot(self, tasks_data: Iterable[Dict[str, Any]]) -> int:
+        """Görevleri geldikçe geçici dosyaya yazıp anlık görüntünün yerine taşır ve WAL'ı boşaltır"""
+        os.makedirs(os.path.dirname(self.snapshot_path) or ".", exist_ok=True)
+        tmp_path = f"{self.snapshot_path}.tmp"
+        count = 0
+        with open(tmp_path, "wb") as f:
+            f.write(b"{")
+            for task in tasks_data:
+                if count:
+                    f.write(b",")
+                f.write(codec.dumps(task["id"]) + b":" + codec.dumps(task))
+                count += 1
+            f.write(b"}")
+        # Önce anlık görüntü, sonra WAL boşaltılır; arada kesilirse WAL tekrar uygulanır
+        os.replace(tmp_path, self.snapshot_path)
+        with open(self.wal_path, "w"):
+            pass
+        self._last_compaction = time.monotonic()
+        return count
+
+    def _compact(self) -> None:
+        # Görevler bellekten değil diskteki halden (anlık görüntü + WAL) okunur
+        self._write_snapshot(self.iter_tasks())
+        self.counters["compactions"] += 1
+
+    def compact(self) -> None:
+        """WAL'ı anlık görüntüye uygular ve boşaltır"""
+        with self._lock:
+            self._compact()
+
+    def replace(self, tasks_data: Iterable[Dict[str, Any]]) -> int:
+        """Anlık görüntüyü düz görev verisiyle değiştirir ve WAL'ı boşaltır (taşıma için)
+
+        Görevler geldikçe geçici dosyaya yazılır; yazılan görev sayısını döndürür.
+        """
+        with self._lock:
+            count = self._write_snapshot(tasks_data)
+            self._shadows = {}
+            return count
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.counters,
+            "wal_bytes": os.path.getsize(self.wal_path) if os.path.exists(self.wal_path) else 0,
+            "tracked_tasks": len(self._shadows),
+        }
@@ -0,0 +1,345 @@
+import asyncio
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from src.utils import codec
+
+
+def atomic_write_json(path: str, data: Any) -> None:
+    """JSON dosyasını önce geçici dosyaya yazıp yerine taşır (yarım yazılmış dosya kalmaz)"""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(codec.dumps(data))
+    os.replace(tmp_path, path)
+
+
+class Snapshot:
+    """Nesnenin to_dict() verisinin kopyası
+
+    Kopya değişikliği yapan thread'de (olay döngüsü) alınır ve yazıcı
+    thread'ine verilir; böylece yazım sırasında canlı nesneler gezilmez.
+    Öznitelikler kopyadaki alanlardan okunur. Liste alanları için kaynak
+    listenin kimliği saklanır (list_identity), depolar listenin yeniden
+    atanıp atanmadığını kopya üzerinden de görebilir. size, verinin JSON
+    bayt boyutudur.
+    """
+
+    __slots__ = ("_data", "_ids", "size")
+
+    def __init__(self, entity: Any):
+        data = entity.to_dict()
+        self._ids = {key: id(value) for key, value in data.items()}
+        raw = codec.dumps(data)
+        self.size = len(raw)
+        self._data = codec.loads(raw)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self._data
+
+    def list_id(self, field: str) -> int:
+        return self._ids[field]
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            return self._data[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+
+def list_identity(entity: Any, field: str) -> int:
+    """Nesnenin (veya kopyasının) liste alanının kaynak liste kimliği"""
+    if isinstance(entity, Snapshot):
+        return entity.list_id(field)
+    return id(getattr(entity, field))
+
+
+def copy_json(value: Any) -> Any:
+    """JSON uyumlu verinin derin kopyası"""
+    return codec.loads(codec.dumps(value))
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+class DebouncedWriter:
+    """Kirli (değişmiş) veri parçalarını arka plan thread'inde toplu yazar
+
+    mark_dirty() yalnızca parçayı işaretler; parçanın verisi ilk işaretten
+    interval_seconds sonra veya batch_size işarete ulaşıldığında kopyalanır
+    ve kopya arka plan thread'inde yazılır. Aynı parça için aradaki tüm
+    işaretler tek yazımda birleşir. flush() bekleyen her şeyi yazılana
+    kadar bekler. interval_seconds 0 ise her işaret anında (çağıran
+    thread'de) yazılır.
+
+    writers: parça adı -> o parçayı diske yazan fonksiyon.
+    snapshots: parça adı -> parçanın verisini kopyalayan fonksiyon; sonucu
+    writers[ad](kopya) olarak yazıcıya verilir. Kopyalar veriyi değiştiren
+    thread'de alınır: işaretler bir olay döngüsünden geliyorsa döngü
+    thread'inde (zamanlayıcı döngüde kurulur), aksi halde işaretleyen
+    thread'de süre dolduktan sonraki ilk işarette veya flush()'ta.
+    Kopyası olmayan parçaların yazıcıları argümansız çağrılır ve kendi
+    kilitlerini kullanmalıdır. Yazım hata verirse parça tekrar kirli
+    işaretlenir.
+    """
+
+    def __init__(
+        self,
+        writers: Dict[str, Callable[..., None]],
+        snapshots: Optional[Dict[str, Callable[[], Any]]] = None,
+        interval_seconds: float = 1.0,
+        batch_size: int = 50,
+        name: str = "persistence-writer"
+    ):
+        self.writers = writers
+        self.snapshots = snapshots or {}
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self._dirty: Dict[str, None] = {}
+        self._captured: Dict[str, Any] = {}
+        self._marks = 0
+        self._first_mark: Optional[float] = None
+        self._writing = False
+        self._paused = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self.counters = {"marks": 0, "captures": 0, "writes": 0, "flushes": 0, "errors": 0}
+        self._thread: Optional[threading.Thread] = None
+        if interval_seconds > 0:
+            self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+            self._thread.start()
+
+    @classmethod
+    def from_env(
+        cls,
+        writers: Dict[str, Callable[..., None]],
+        snapshots: Optional[Dict[str, Callable[[], Any]]] = None
+    ) -> "DebouncedWriter":
+        """PERSIST_INTERVAL_SECONDS ve PERSIST_BATCH_SIZE çevre değişkenlerinden oluşturur"""
+        return cls(
+            writers,
+            snapshots,
+            interval_seconds=float(os.getenv("PERSIST_INTERVAL_SECONDS", "1.0")),
+            batch_size=int(os.getenv("PERSIST_BATCH_SIZE", "50")),
+        )
+
+    def mark_dirty(self, *names: str) -> None:
+        """Parçaları değişmiş olarak işaretler (parça verilmezse tümü)"""
+        names = names or tuple(self.writers)
+        if self._thread is None:
+            with self._cond:
+                if self._paused:
+                    self._dirty.update(dict.fromkeys(names))
+                    return
+            self._write(self._capture_parts(names))
+            return
+        with self._cond:
+            for name in names:
+                self._dirty[name] = None
+            self._marks += 1
+            self.counters["marks"] += 1
+            if self._first_mark is None:
+                self._first_mark = time.monotonic()
+            full = self._marks >= self.batch_size
+        self._schedule(full)
+
+    def is_pending(self, name: str) -> bool:
+        """Parçada henüz diske yazılmamış değişiklik olup olmadığını döndürür"""
+        with self._cond:
+            return name in self._dirty or name in self._captured or self._writing
+
+    def is_marked(self, name: str) -> bool:
+        """Parça son kopyadan sonra yeniden işaretlendiyse True (devam eden yazım hariç)"""
+        with self._cond:
+            return name in self._dirty or name in self._captured
+
+    def _schedule(self, now: bool = False) -> None:
+        """Kopyalamayı zamanlar; now True ise veya süre dolduysa hemen kopyalar"""
+        loop = _running_loop()
+        if loop is not None:
+            self._loop = loop
+            if now:
+                self._capture()
+            elif self._timer is None:
+                with self._cond:
+                    if self._first_mark is None:
+                        return
+                    delay = max(0.0, self.interval_seconds - (time.monotonic() - self._first_mark))
+                self._timer = loop.call_later(delay, self._capture)
+        elif self._loop is not None and self._loop.is_running():
+            # Döngü dışından gelen işaret: kopya döngü thread'inde alınır
+            self._loop.call_soon_threadsafe(self._schedule, now)
+        else:
+            with self._cond:
+                due = self._first_mark is not None and time.monotonic() - self._first_mark >= self.interval_seconds
+            if now or due:
+                self._capture()
+
+    def _capture_parts(self, names: Iterable[str]) -> Dict[str, Any]:
+        """Parçaların verisini kopyalar; kopyalanamayanlar tekrar kirli işaretlenir"""
+        captured: Dict[str, Any] = {}
+        for name in names:
+            try:
+                snapshot = self.snapshots.get(name)
+                captured[name] = snapshot() if snapshot is not None else None
+            except Exception as e:
+                self.counters["errors"] += 1
+                print(f"[WARN] {name} verisi kopyalanamadı: {e}")
+                with self._cond:
+                    self._dirty.setdefault(name, None)
+        return captured
+
+    def _capture(self) -> None:
+        """Kirli parçaları kopyalayıp yazıcı thread'ine verir (veriyi değiştiren thread'de çalışır)"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        with self._cond:
+            names = list(self._dirty)
+            self._dirty.clear()
+            self._marks = 0
+            self._first_mark = None
+        if not names:
+            return
+        captured = self._capture_parts(names)
+        with self._cond:
+            # Yazılmamış eski kopyanın yerini yenisi alır
+            self._captured.update(captured)
+            self.counters["captures"] += 1
+            if self._dirty and self._first_mark is None:
+                self._first_mark = time.monotonic()
+            self._cond.notify_all()
+
+    def _write(self, captured: Dict[str, Any]) -> Dict[str, None]:
+        """Kopyaları yazar; yazılamayan parçaları döndürür"""
+        failed: Dict[str, None] = {}
+        for name, snapshot in captured.items():
+            try:
+                if name in self.snapshots:
+                    self.writers[name](snapshot)
+                else:
+                    self.writers[name]()
+                self.counters["writes"] += 1
+            except Exception as e:
+                self.counters["errors"] += 1
+                failed[name] = None
+                print(f"[WARN] {name} verisi kaydedilemedi: {e}")
+        return failed
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._captured or self._paused:
+                    if self._closed:
+                        return
+                    self._cond.wait()
+                captured, self._captured = self._captured, {}
+                self._writing = True
+
+            failed = self._write(captured)
+
+            with self._cond:
+                self._writing = False
+                if failed:
+                    # Bir sonraki aralıkta yeni kopyayla yeniden dene
+                    for name in failed:
+                        self._dirty.setdefault(name, None)
+                    self._first_mark = self._first_mark or time.monotonic()
+                self._cond.notify_all()
+            if failed and self._loop is not None and self._loop.is_running():
+                self._loop.call_soon_threadsafe(self._schedule)
+
+    def flush(self, timeout: Optional[float] = 30.0) -> bool:
+        """Bekleyen yazımlar bitene kadar bekler; süre dolarsa False döner"""
+        self.counters["flushes"] += 1
+        if self._thread is None or not self._thread.is_alive():
+            with self._cond:
+                names = list(self._dirty)
+                self._dirty.clear()
+                captured, self._captured = self._captured, {}
+            captured.update(self._capture_parts(names))
+            self._write(captured)
+            return True
+        loop = self._loop
+        # Döngü başka bir thread'de çalışıyorsa kopyayı o alır, aksi halde bu thread
+        capture_here = loop is None or not loop.is_running() or _running_loop() is loop
+        if capture_here:
+            self._capture()
+        else:
+            loop.call_soon_threadsafe(self._capture)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._cond:
+                if not (self._dirty or self._captured or self._writing):
+                    return True
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                # Yazılamayıp tekrar işaretlenen parçalar bir aralık sonra yeniden kopyalanır
+                retry = capture_here and not self._captured and not self._writing
+                if retry:
+                    remaining = self.interval_seconds if remaining is None else min(remaining, self.interval_seconds)
+                self._cond.wait(remaining)
+            if retry:
+                self._capture()
+
+    def pause(self) -> None:
+        """Yazımları resume() çağrılana kadar durdurur; devam eden yazımın bitmesini bekler
+
+        İşaretler ve kopyalar birikmeye devam eder. Depo başka bir işlemle
+        (ör. içe aktarma) değiştirilirken eski verinin yazılmasını önler.
+        """
+        with self._cond:
+            self._paused += 1
+            while self._writing:
+                self._cond.wait()
+
+    def resume(self) -> None:
+        """pause() ile durdurulan yazımları sürdürür"""
+        with self._cond:
+            self._paused -= 1
+            self._cond.notify_all()
+            inline = self._thread is None and not self._paused and self._dirty
+        if inline:
+            self.flush()
+
+    def discard(self) -> None:
+        """Bekleyen işaretleri ve yazılmamış kopyaları atar (veri depodan yeniden yüklendiğinde)"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        with self._cond:
+            self._dirty.clear()
+            self._captured.clear()
+            self._marks = 0
+            self._first_mark = None
+            self._cond.notify_all()
+
+    def close(self, timeout: Optional[float] = 30.0) -> None:
+        """Bekleyenleri yazar ve thread'i durdurur"""
+        self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                **self.counters,
+                "pending": sorted({*self._dirty, *self._captured}),
+                "interval_seconds": self.interval_seconds,
+                "batch_size": self.batch_size,
+            }
@@ -0,0 +1,273 @@
+import hashlib
+import os
+import shutil
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.utils import codec
+from src.utils.persistence import atomic_write_json
+from src.utils.storage import RECORD_PARTS, Storage, data_records, empty_data
+from src.utils.task_logs import FileLogStore, LogBatcher
+from src.utils.task_cache import SUMMARY_FIELDS
+
+# İndekste tutulan özet alanları
+TASK_INDEX_FIELDS = SUMMARY_FIELDS
+TEAM_INDEX_FIELDS = ("name",)
+# Değiştiğinde indeksin yeniden yazıldığı alanlar; tarihler bu yazımlarla birlikte güncellenir
+INDEX_KEY_FIELDS = ("title", "status", "team_id", "name")
+
+
+def _fingerprint(data: Dict[str, Any]) -> str:
+    return hashlib.sha1(codec.dumps(data, sort_keys=True)).hexdigest()
+
+
+class ShardedJsonStorage(Storage):
+    """Her görevi ve takımı ayrı JSON dosyasında tutan depolama
+
+    data/tasks/<görev id>.json ve data/teams/<takım id>.json dosyalarına
+    yalnızca içeriği (özeti) son yazımdan beri değişen varlıklar geçici
+    dosya + yeniden adlandırma ile yazılır; bir görevin ilerlemesi diğer
+    görevlerin dokümanlarını yeniden yazdırmaz. data/index.json id, başlık,
+    durum ve takım bilgilerini tutar. Hatalar ve mesajlar tek dosyada kalır.
+
+    Görev dosyaları tek tek okunabildiği için görev gövdelerinin ilk
+    erişimde yüklenmesini (TASK_LAZY_LOAD) destekler.
+    """
+
+    name = "sharded"
+    supports_lazy = True
+
+    def __init__(self, directory: str = "data"):
+        self.directory = directory
+        self.index_path = os.path.join(directory, "index.json")
+        self._lock = threading.Lock()
+        # Tür ("tasks"/"teams") -> id -> son yazılan içeriğin özeti
+        self._versions: Dict[str, Dict[str, str]] = {"tasks": {}, "teams": {}}
+        self._index: Dict[str, Dict[str, Dict[str, Any]]] = {"tasks": {}, "teams": {}}
+        self.log_store = FileLogStore(os.path.join(directory, "logs"))
+        self.counters = {"entity_writes": 0, "entity_deletes": 0, "skipped": 0, "index_writes": 0}
+
+    def _dir(self, kind: str) -> str:
+        return os.path.join(self.directory, kind)
+
+    def _entity_path(self, kind: str, entity_id: str) -> str:
+        return os.path.join(self._dir(kind), f"{entity_id}.json")
+
+    def _read(self, path: str, default: Any) -> Any:
+        if not os.path.exists(path):
+            return default
+        try:
+            return codec.load_file(path)
+        except Exception as e:
+            print(f"[WARN] {path} okunamadı: {e}")
+            return default
+
+    def _read_entities(self, kind: str) -> Dict[str, Dict[str, Any]]:
+        directory = self._dir(kind)
+        if not os.path.isdir(directory):
+            return {}
+        entities = []
+        for filename in os.listdir(directory):
+            if not filename.endswith(".json"):
+                continue
+            data = self._read(os.path.join(directory, filename), None)
+            if data is not None:
+                entities.append((filename[:-len(".json")], data))
+        # Oluşturulma sırası korunur
+        entities.sort(key=lambda item: (item[1].get("created_at") or "", item[0]))
+        return dict(entities)
+
+    def load(self, include_tasks: bool = True) -> Dict[str, Any]:
+        data = empty_data()
+        data["teams"] = self._read_entities("teams")
+        if include_tasks:
+            data["tasks"] = self._read_entities("tasks")
+        data["bugs"] = self._read(os.path.join(self.directory, "bugs.json"), [])
+        data["messages"] = self._read(os.path.join(self.directory, "messages.json"), [])
+        return data
+
+    @staticmethod
+    def _summary(kind: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        fields = TASK_INDEX_FIELDS if kind == "tasks" else TEAM_INDEX_FIELDS
+        return {field: data.get(field) for field in fields}
+
+    @staticmethod
+    def _index_key(summary: Dict[str, Any]) -> tuple:
+        return tuple(summary.get(field) for field in INDEX_KEY_FIELDS)
+
+    def load_index(self) -> Dict[str, Dict[str, Any]]:
+        """index.json'daki görev özetlerini döndürür; dosyalarla uyuşmayan kayıtları düzeltir"""
+        stored = self._read(self.index_path, {})
+        index = stored.get("tasks", {}) if isinstance(stored, dict) else {}
+        directory = self._dir("tasks")
+        files = set()
+        if os.path.isdir(directory):
+            files = {filename[:-len(".json")] for filename in os.listdir(directory) if filename.endswith(".json")}
+        # İndeks yazılmadan önce kesilen yazımlar: dosyası olup indekste olmayan görevler okunur
+        repaired = {task_id: summary for task_id, summary in index.items() if task_id in files}
+        for task_id in files - set(repaired):
+            data = self._read(self._entity_path("tasks", task_id), None)
+            if data is not None:
+                repaired[task_id] = self._summary("tasks", data)
+        with self._lock:
+            self._index["tasks"] = dict(sorted(repaired.items(), key=lambda item: (item[1].get("created_at") or "", item[0])))
+            self._index["teams"] = stored.get("teams", {}) if isinstance(stored, dict) else {}
+            if repaired.keys() != index.keys():
+                self._write_index()
+            return dict(self._index["tasks"])
+
+    def load_task(self, task_id: str) -> Optional[Dict[str, Any]]:
+        return self._read(self._entity_path("tasks", task_id), None)
+
+    def prime_task(self, task_id: str, task: Any) -> None:
+        with self._lock:
+            self._versions["tasks"][task_id] = _fingerprint(task.to_dict())
+
+    def evict_task(self, task_id: str) -> None:
+        with self._lock:
+            self._versions["tasks"].pop(task_id, None)
+
+    def delete_tasks(self, task_ids: Iterable[str]) -> None:
+        with self._lock:
+            for task_id in task_ids:
+                path = self._entity_path("tasks", task_id)
+                if os.path.exists(path):
+                    os.remove(path)
+                self._versions["tasks"].pop(task_id, None)
+                self._index["tasks"].pop(task_id, None)
+                self.counters["entity_deletes"] += 1
+            self._write_index()
+
+    def prime(self, teams, tasks, bugs, messages) -> None:
+        with self._lock:
+            for kind, entities in (("teams", teams), ("tasks", tasks)):
+                snapshot = {entity_id: entity.to_dict() for entity_id, entity in list(entities.items())}
+                # Tembel yüklemede yalnızca bellekteki görevler gelir; load_index() ile okunan indeks korunur
+                self._versions[kind].update((entity_id, _fingerprint(data)) for entity_id, data in snapshot.items())
+                self._index[kind].update((entity_id, self._summary(kind, data)) for entity_id, data in snapshot.items())
+
+    def _write_entities(self, kind: str, entities: Dict[str, Any], complete: bool = True) -> None:
+        with self._lock:
+            versions: Dict[str, str] = {}
+            index: Dict[str, Dict[str, Any]] = {} if complete else dict(self._index[kind])
+            for entity_id, entity in list(entities.items()):
+                data = entity.to_dict()
+                version = _fingerprint(data)
+                if self._versions[kind].get(entity_id) != version:
+                    atomic_write_json(self._entity_path(kind, entity_id), data)
+                    self.counters["entity_writes"] += 1
+                else:
+                    self.counters["skipped"] += 1
+                # Yazılan varlık hemen kaydedilir; sonraki hata onu tekrar yazdırmaz
+                self._versions[kind][entity_id] = version
+                versions[entity_id] = version
+                index[entity_id] = self._summary(kind, data)
+
+            removed = [entity_id for entity_id in self._versions[kind] if entity_id not in versions] if complete else []
+            for entity_id in removed:
+                path = self._entity_path(kind, entity_id)
+                if os.path.exists(path):
+                    os.remove(path)
+                del self._versions[kind][entity_id]
+                self.counters["entity_deletes"] += 1
+
+            previous = self._index[kind]
+            changed = index.keys() != previous.keys() or any(
+                self._index_key(summary) != self._index_key(previous[entity_id]) for entity_id, summary in index.items()
+            )
+            self._index[kind] = index
+            if changed:
+                self._write_index()
+
+    def _write_index(self) -> None:
+        atomic_write_json(self.index_path, self._index)
+        self.counters["index_writes"] += 1
+
+    def write_teams(self, teams: Dict[str, Any]) -> None:
+        self._write_entities("teams", teams)
+
+    def write_tasks(self, tasks: Dict[str, Any], complete: bool = True) -> None:
+        self._write_entities("tasks", tasks, complete)
+
+    def write_bugs(self, bugs: List[Dict]) -> None:
+        atomic_write_json(os.path.join(self.directory, "bugs.json"), list(bugs))
+
+    def write_messages(self, messages: List[Dict]) -> None:
+        atomic_write_json(os.path.join(self.directory, "messages.json"), list(messages))
+
+    def import_data(self, data: Dict[str, Any]) -> None:
+        self.import_records(data_records(data))
+
+    def import_records(self, records: Iterable[Tuple[str, Dict[str, Any]]]) -> Dict[str, int]:
+        # Takım ve görev dosyaları geldikçe geçici klasörlere yazılır, aktarım bitince eskilerinin yerine taşınır;
+        # hatalar ve mesajlar tek dosyada olduğu için toplanır
+        counts = dict.fromkeys(RECORD_PARTS, 0)
+        lists: Dict[str, List[Dict]] = {"bugs": [], "messages": []}
+        index: Dict[str, Dict[str, Dict[str, Any]]] = {"teams": {}, "tasks": {}}
+        with self._lock:
+            staging = {kind: f"{self._dir(kind)}.import" for kind in index}
+            for directory in staging.values():
+                shutil.rmtree(directory, ignore_errors=True)
+                os.makedirs(directory)
+            log_staging = self.log_store.staging()
+            logs = LogBatcher(log_staging.append)
+            try:
+                for part, record in records:
+                    if part in lists:
+                        lists[part].append(record)
+                    elif part == "logs":
+                        logs.add(record["task_id"], record["entry"])
+                    else:
+                        atomic_write_json(os.path.join(staging[part], f"{record['id']}.json"), record)
+                        index[part][record["id"]] = self._summary(part, record)
+                    counts[part] += 1
+                logs.flush()
+            except Exception:
+                # Yarım kalan aktarım mevcut veriye dokunmaz
+                for directory in list(staging.values()) + [log_staging.directory]:
+                    shutil.rmtree(directory, ignore_errors=True)
+                raise
+            self.log_store.replace_with(log_staging)
+            for kind, directory in staging.items():
+                previous = f"{self._dir(kind)}.old"
+                shutil.rmtree(previous, ignore_errors=True)
+                if os.path.isdir(self._dir(kind)):
+                    os.replace(self._dir(kind), previous)
+                os.replace(directory, self._dir(kind))
+                shutil.rmtree(previous, ignore_errors=True)
+                self._versions[kind] = {}
+            self._index = index
+            self._write_index()
+        self.write_bugs(lists["bugs"])
+        self.write_messages(lists["messages"])
+        return counts
+
+    def iter_tasks(self, task_ids: Optional[Iterable[str]] = None) -> Iterator[Dict[str, Any]]:
+        if task_ids is not None:
+            ordered = list(task_ids)
+        else:
+            # Sıra diskteki indeksten alınır; indekste olmayan dosyalar sona eklenir
+            directory = self._dir("tasks")
+            if not os.path.isdir(directory):
+                return
+            files = {filename[:-len(".json")] for filename in os.listdir(directory) if filename.endswith(".json")}
+            stored = self._read(self.index_path, {})
+            ordered = [task_id for task_id in (stored.get("tasks", {}) if isinstance(stored, dict) else {}) if task_id in files]
+            ordered += sorted(files - set(ordered))
+        for task_id in ordered:
+            task = self.load_task(task_id)
+            if task is not None:
+                yield task
+
+    def team_task_ids(self, team_id: str) -> Optional[List[str]]:
+        return [task_id for task_id, summary in self._index["tasks"].items() if summary.get("team_id") == team_id]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": self.name,
+            "directory": self.directory,
+            **self.counters,
+            "tasks": len(self._versions["tasks"]),
+            "teams": len(self._versions["teams"]),
+            "logs": self.log_store.stats(),
+        }
@@ -0,0 +1,523 @@
+import hashlib
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from src.utils import codec
+from src.utils.persistence import list_identity
+from src.utils.storage import RECORD_PARTS, Storage, data_records, empty_data
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS teams (
+    id TEXT PRIMARY KEY,
+    name TEXT,
+    created_at TEXT,
+    updated_at TEXT,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS agents (
+    id TEXT PRIMARY KEY,
+    team_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    role TEXT,
+    model TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_agents_team ON agents(team_id);
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    team_id TEXT,
+    status TEXT,
+    created_at TEXT,
+    updated_at TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_team ON tasks(team_id);
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status);
+CREATE TABLE IF NOT EXISTS subtasks (
+    task_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    id TEXT,
+    status TEXT,
+    assigned_agent_id TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (task_id, position)
+);
+CREATE INDEX IF NOT EXISTS idx_subtasks_status ON subtasks(status);
+CREATE TABLE IF NOT EXISTS task_logs (
+    task_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (task_id, position)
+);
+CREATE TABLE IF NOT EXISTS documents (
+    task_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    id TEXT,
+    title TEXT,
+    type TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (task_id, position)
+);
+CREATE INDEX IF NOT EXISTS idx_documents_id ON documents(id);
+CREATE TABLE IF NOT EXISTS bugs (
+    position INTEGER PRIMARY KEY,
+    id TEXT,
+    team_id TEXT,
+    status TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_bugs_team ON bugs(team_id);
+CREATE INDEX IF NOT EXISTS idx_bugs_status ON bugs(status);
+CREATE TABLE IF NOT EXISTS messages (
+    position INTEGER PRIMARY KEY,
+    id TEXT,
+    team_id TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_messages_team ON messages(team_id);
+"""
+
+# Satır karşılaştırmasıyla yazılan tablolar: tablo -> (sütunlar, anahtar sütun sayısı)
+TABLES: Dict[str, Tuple[Tuple[str, ...], int]] = {
+    "teams": (("id", "name", "created_at", "updated_at", "data"), 1),
+    "agents": (("id", "team_id", "position", "role", "model", "data"), 1),
+    "tasks": (("id", "team_id", "status", "created_at", "updated_at", "data"), 1),
+    "subtasks": (("task_id", "position", "id", "status", "assigned_agent_id", "data"), 2),
+    "bugs": (("position", "id", "team_id", "status", "data"), 1),
+    "messages": (("position", "id", "team_id", "data"), 1),
+}
+
+# Yalnızca sona eklenen görev listeleri: tablo -> görev alanı
+# (task_logs görev kaydından bağımsız log deposudur; append_logs ile yazılır)
+LIST_TABLES = {"documents": "documents"}
+
+# Görev satırının data sütununa yazılmayan (ayrı tablolarda tutulan) alanlar
+_TASK_CHILD_FIELDS = ("subtasks", "documents")
+
+
+def _dumps(value: Any) -> str:
+    return codec.dumps_str(value)
+
+
+def _digest(row: Tuple) -> bytes:
+    return hashlib.sha1(codec.dumps(row)).digest()
+
+
+def _digests(rows: Dict[Tuple, Tuple]) -> Dict[Tuple, bytes]:
+    return {key: _digest(row) for key, row in rows.items()}
+
+
+def _team_rows(team: Dict[str, Any]) -> Tuple[Tuple, List[Tuple]]:
+    data = {key: value for key, value in team.items() if key != "agents"}
+    row = (team["id"], team.get("name"), team.get("created_at"), team.get("updated_at"), _dumps(data))
+    agents = [
+        (agent["id"], team["id"], position, agent.get("role"), agent.get("model"), _dumps(agent))
+        for position, agent in enumerate(team.get("agents") or [])
+    ]
+    return row, agents
+
+
+def _task_rows(task: Dict[str, Any]) -> Tuple[Tuple, List[Tuple]]:
+    data = {key: value for key, value in task.items() if key not in _TASK_CHILD_FIELDS}
+    row = (task["id"], task.get("team_id"), task.get("status"), task.get("created_at"), task.get("updated_at"), _dumps(data))
+    subtasks = [
+        (task["id"], position, subtask.get("id"), subtask.get("status"), subtask.get("assigned_agent_id"), _dumps(subtask))
+        for position, subtask in enumerate(task.get("subtasks") or [])
+    ]
+    return row, subtasks
+
+
+def _list_row(table: str, task_id: str, position: int, item: Dict[str, Any]) -> Tuple:
+    if table == "documents":
+        return (task_id, position, item.get("id"), item.get("title"), item.get("type"), _dumps(item))
+    return (task_id, position, _dumps(item))
+
+
+def _bug_row(position: int, bug: Dict[str, Any]) -> Tuple:
+    return (position, bug.get("id"), bug.get("team_id"), bug.get("status"), _dumps(bug))
+
+
+def _message_row(position: int, message: Dict[str, Any]) -> Tuple:
+    return (position, message.get("id"), message.get("team_id"), _dumps(message))
+
+
+class SqliteStorage(Storage):
+    """SQLite (WAL kipi) depolama
+
+    Takımlar, ajanlar, görevler, alt görevler, görev logları, dokümanlar,
+    hatalar ve mesajlar ayrı tablolarda tutulur. Her yazımda satırlar en son
+    yazılmış halleriyle karşılaştırılır ve yalnızca değişen satırlar
+    upsert edilir; loglar ve dokümanlar sona eklendiği için yalnızca yeni
+    elemanlar eklenir. Yazımlar tek bağlantıdan, sorgular thread başına
+    açılan okuma bağlantılarından yapılır (WAL kipinde yazım okumayı
+    bekletmez). Görevler tek tek okunabildiği için ilk erişimde yükleme
+    (TASK_LAZY_LOAD) desteklenir.
+    """
+
+    name = "sqlite"
+    supports_lazy = True
+
+    def __init__(self, path: str = "data/agentic.db"):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = self._connect()
+        self._conn.executescript(SCHEMA)
+        self._local = threading.local()
+        self._readers: List[sqlite3.Connection] = []
+        # Tablo -> anahtar -> en son yazılan satırın özeti (satırın kopyası bellekte tutulmaz)
+        self._rows: Dict[str, Dict[Tuple, bytes]] = {table: {} for table in TABLES}
+        # (tablo, görev id) -> (liste nesnesinin id'si, yazılan eleman sayısı)
+        self._lists: Dict[Tuple[str, str], Tuple[int, int]] = {}
+        self.counters = {"writes": 0, "upserts": 0, "deletes": 0, "queries": 0}
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _reader(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            with self._lock:
+                self._readers.append(conn)
+        self.counters["queries"] += 1
+        return conn
+
+    def load(self, include_tasks: bool = True) -> Dict[str, Any]:
+        data = empty_data()
+        with self._lock:
+            conn = self._conn
+            agents: Dict[str, List[Dict]] = {}
+            for team_id, row in conn.execute("SELECT team_id, data FROM agents ORDER BY team_id, position"):
+                agents.setdefault(team_id, []).append(codec.loads(row))
+            for team_id, row in conn.execute("SELECT id, data FROM teams ORDER BY created_at, id"):
+                team = codec.loads(row)
+                team["agents"] = agents.get(team_id, [])
+                data["teams"][team_id] = team
+
+            children: Dict[str, Dict[str, List[Dict]]] = {}
+            task_queries = () if not include_tasks else (
+                ("subtasks", "SELECT task_id, data FROM subtasks ORDER BY task_id, position"),
+                ("documents", "SELECT task_id, data FROM documents ORDER BY task_id, position"),
+            )
+            for field, query in task_queries:
+                for task_id, row in conn.execute(query):
+                    children.setdefault(task_id, {}).setdefault(field, []).append(codec.loads(row))
+            if include_tasks:
+                for task_id, row in conn.execute("SELECT id, data FROM tasks ORDER BY created_at, id"):
+                    task = codec.loads(row)
+                    for field in _TASK_CHILD_FIELDS:
+                        task[field] = children.get(task_id, {}).get(field, [])
+                    data["tasks"][task_id] = task
+
+            data["bugs"] = [codec.loads(row) for (row,) in conn.execute("SELECT data FROM bugs ORDER BY position")]
+            data["messages"] = [codec.loads(row) for (row,) in conn.execute("SELECT data FROM messages ORDER BY position")]
+        return data
+
+    def load_index(self) -> Dict[str, Dict[str, Any]]:
+        query = (
+            "SELECT id, json_extract(data, '$.title'), team_id, status, created_at, updated_at "
+            "FROM tasks ORDER BY created_at, id"
+        )
+        with self._lock:
+            return {
+                task_id: {"title": title, "team_id": team_id, "status": status, "created_at": created_at, "updated_at": updated_at}
+                for task_id, title, team_id, status, created_at, updated_at in self._conn.execute(query)
+            }
+
+    def load_task(self, task_id: str) -> Optional[Dict[str, Any]]:
+        conn = self._reader()
+        row = conn.execute("SELECT data FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        if row is None:
+            return None
+        task = codec.loads(row[0])
+        for field, table in (("subtasks", "subtasks"), ("documents", "documents")):
+            rows = conn.execute(f"SELECT data FROM {table} WHERE task_id = ? ORDER BY position", (task_id,))
+            task[field] = [codec.loads(item) for (item,) in rows]
+        return task
+
+    def prime_task(self, task_id: str, task: Any) -> None:
+        data = task.to_dict()
+        rows = self._task_tables([(task_id, data)])
+        with self._lock:
+            for table, desired in rows.items():
+                self._rows[table].update(_digests(desired))
+            for table, field in LIST_TABLES.items():
+                self._lists[(table, task_id)] = (list_identity(task, field), len(data[field]))
+
+    def _forget_task(self, task_id: str) -> None:
+        self._rows["tasks"].pop((task_id,), None)
+        for key in [key for key in self._rows["subtasks"] if key[0] == task_id]:
+            del self._rows["subtasks"][key]
+        for table in LIST_TABLES:
+            self._lists.pop((table, task_id), None)
+
+    def evict_task(self, task_id: str) -> None:
+        with self._lock:
+            self._forget_task(task_id)
+
+    def delete_tasks(self, task_ids: Iterable[str]) -> None:
+        task_ids = [(task_id,) for task_id in task_ids]
+        with self._lock:
+            with self._conn:
+                for table in ("tasks", "subtasks", "task_logs", "documents"):
+                    column = "id" if table == "tasks" else "task_id"
+                    self._conn.executemany(f"DELETE FROM {table} WHERE {column} = ?", task_ids)
+            for (task_id,) in task_ids:
+                self._forget_task(task_id)
+            self.counters["deletes"] += len(task_ids)
+
+    def _team_tables(self, teams: Dict[str, Any]) -> Dict[str, Dict[Tuple, Tuple]]:
+        rows: Dict[str, Dict[Tuple, Tuple]] = {"teams": {}, "agents": {}}
+        for team in list(teams.values()):
+            team_row, agent_rows = _team_rows(team.to_dict())
+            rows["teams"][team_row[:1]] = team_row
+            for agent_row in agent_rows:
+                rows["agents"][agent_row[:1]] = agent_row
+        return rows
+
+    def _task_tables(self, current: List[Tuple[str, Dict[str, Any]]]) -> Dict[str, Dict[Tuple, Tuple]]:
+        rows: Dict[str, Dict[Tuple, Tuple]] = {"tasks": {}, "subtasks": {}}
+        for _, data in current:
+            task_row, subtask_rows = _task_rows(data)
+            rows["tasks"][task_row[:1]] = task_row
+            for subtask_row in subtask_rows:
+                rows["subtasks"][subtask_row[:2]] = subtask_row
+        return rows
+
+    def prime(self, teams, tasks, bugs, messages) -> None:
+        entities = list(tasks.items())
+        current = [(task_id, task.to_dict()) for task_id, task in entities]
+        with self._lock:
+            for rows in (self._team_tables(teams), self._task_tables(current)):
+                self._rows.update((table, _digests(desired)) for table, desired in rows.items())
+            self._rows["bugs"] = {(position,): _digest(_bug_row(position, bug)) for position, bug in enumerate(bugs)}
+            self._rows["messages"] = {(position,): _digest(_message_row(position, message)) for position, message in enumerate(messages)}
+            self._lists = {
+                (table, task_id): (list_identity(task, field), len(data[field]))
+                for (task_id, task), (_, data) in zip(entities, current)
+                for table, field in LIST_TABLES.items()
+            }
+
+    def _sync(
+        self,
+        conn: sqlite3.Connection,
+        table: str,
+        desired: Dict[Tuple, Tuple],
+        scope: Optional[Set[str]] = None
+    ) -> Dict[Tuple, bytes]:
+        """Tabloyu istenen satırlara getirir: değişenleri upsert eder, kalkanları siler; satır özetlerini döndürür
+
+        scope verilirse yalnızca ilk anahtar sütunu (görev id) bu kümede olan satırlar silinebilir.
+        """
+        columns, key_size = TABLES[table]
+        previous = self._rows[table]
+        digests = _digests(desired)
+        changed = [row for key, row in desired.items() if previous.get(key) != digests[key]]
+        removed = [key for key in previous if key not in desired and (scope is None or key[0] in scope)]
+        if changed:
+            placeholders = ", ".join("?" for _ in columns)
+            conn.executemany(f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}) VALUES ({placeholders})", changed)
+            self.counters["upserts"] += len(changed)
+        if removed:
+            where = " AND ".join(f"{column} = ?" for column in columns[:key_size])
+            conn.executemany(f"DELETE FROM {table} WHERE {where}", removed)
+            self.counters["deletes"] += len(removed)
+        return digests
+
+    def _sync_list(self, conn: sqlite3.Connection, table: str, task_id: str, items: List[Dict], identity: int) -> Tuple[int, int]:
+        """Görev listesinin yalnızca yeni elemanlarını ekler (liste değiştirildiyse tamamını yazar)
+
+        identity: kaynak listenin kimliği (list_identity)
+        """
+        list_id, length = self._lists.get((table, task_id), (None, 0))
+        start = length
+        if list_id != identity or len(items) < length:
+            if list_id is not None:
+                conn.execute(f"DELETE FROM {table} WHERE task_id = ?", (task_id,))
+                self.counters["deletes"] += 1
+            start = 0
+        if len(items) > start:
+            rows = [_list_row(table, task_id, position, items[position]) for position in range(start, len(items))]
+            placeholders = ", ".join("?" for _ in rows[0])
+            conn.executemany(f"INSERT OR REPLACE INTO {table} VALUES ({placeholders})", rows)
+            self.counters["upserts"] += len(rows)
+        return (identity, len(items))
+
+    def write_teams(self, teams: Dict[str, Any]) -> None:
+        rows = self._team_tables(teams)
+        with self._lock:
+            with self._conn:
+                digests = {table: self._sync(self._conn, table, desired) for table, desired in rows.items()}
+            self._rows.update(digests)
+            self.counters["writes"] += 1
+
+    def write_tasks(self, tasks: Dict[str, Any], complete: bool = True) -> None:
+        entities = list(tasks.items())
+        current = [(task_id, task.to_dict()) for task_id, task in entities]
+        rows = self._task_tables(current)
+        scope = None if complete else {task_id for task_id, _ in current}
+        with self._lock:
+            lists: Dict[Tuple[str, str], Tuple[int, int]] = {}
+            with self._conn:
+                digests = {table: self._sync(self._conn, table, desired, scope) for table, desired in rows.items()}
+                for (task_id, task), (_, data) in zip(entities, current):
+                    for table, field in LIST_TABLES.items():
+                        items = data.get(field) or []
+                        lists[(table, task_id)] = self._sync_list(self._conn, table, task_id, items, list_identity(task, field))
+                # Silinen görevlerin dokümanları
+                for table, task_id in self._lists if complete else ():
+                    if (table, task_id) not in lists:
+                        self._conn.execute(f"DELETE FROM {table} WHERE task_id = ?", (task_id,))
+                        self.counters["deletes"] += 1
+            if complete:
+                self._rows.update(digests)
+                self._lists = lists
+            else:
+                for table, desired in digests.items():
+                    kept = {key: digest for key, digest in self._rows[table].items() if key[0] not in scope}
+                    self._rows[table] = {**kept, **desired}
+                self._lists.update(lists)
+            self.counters["writes"] += 1
+
+    def write_bugs(self, bugs: List[Dict]) -> None:
+        desired = {(position,): _bug_row(position, bug) for position, bug in enumerate(list(bugs))}
+        with self._lock:
+            with self._conn:
+                digests = self._sync(self._conn, "bugs", desired)
+            self._rows["bugs"] = digests
+            self.counters["writes"] += 1
+
+    def write_messages(self, messages: List[Dict]) -> None:
+        desired = {(position,): _message_row(position, message) for position, message in enumerate(list(messages))}
+        with self._lock:
+            with self._conn:
+                digests = self._sync(self._conn, "messages", desired)
+            self._rows["messages"] = digests
+            self.counters["writes"] += 1
+
+    def import_data(self, data: Dict[str, Any]) -> None:
+        self.import_records(data_records(data))
+
+    def import_records(self, records: Iterable[Tuple[str, Dict[str, Any]]]) -> Dict[str, int]:
+        # Tek işlemde, kayıtlar geldikçe eklenir; yarıda kesilen aktarım eski veriyi bozmaz
+        counts = dict.fromkeys(RECORD_PARTS, 0)
+        log_positions: Dict[str, int] = {}
+        with self._lock:
+            conn = self._conn
+            with conn:
+                for table in list(TABLES) + list(LIST_TABLES) + ["task_logs"]:
+                    conn.execute(f"DELETE FROM {table}")
+                for part, record in records:
+                    if part == "teams":
+                        team_row, agent_rows = _team_rows(record)
+                        conn.execute("INSERT OR REPLACE INTO teams VALUES (?, ?, ?, ?, ?)", team_row)
+                        conn.executemany("INSERT OR REPLACE INTO agents VALUES (?, ?, ?, ?, ?, ?)", agent_rows)
+                    elif part == "tasks":
+                        task_row, subtask_rows = _task_rows(record)
+                        conn.execute("INSERT OR REPLACE INTO tasks VALUES (?, ?, ?, ?, ?, ?)", task_row)
+                        conn.executemany("INSERT OR REPLACE INTO subtasks VALUES (?, ?, ?, ?, ?, ?)", subtask_rows)
+                        for table, field in LIST_TABLES.items():
+                            for position, item in enumerate(record.get(field) or []):
+                                row = _list_row(table, record["id"], position, item)
+                                conn.execute(f"INSERT OR REPLACE INTO {table} VALUES ({', '.join('?' for _ in row)})", row)
+                    elif part == "logs":
+                        position = log_positions.get(record["task_id"], 0)
+                        conn.execute("INSERT INTO task_logs VALUES (?, ?, ?)", (record["task_id"], position, _dumps(record["entry"])))
+                        log_positions[record["task_id"]] = position + 1
+                    elif part == "bugs":
+                        conn.execute("INSERT OR REPLACE INTO bugs VALUES (?, ?, ?, ?, ?)", _bug_row(counts[part], record))
+                    else:
+                        conn.execute("INSERT OR REPLACE INTO messages VALUES (?, ?, ?, ?)", _message_row(counts[part], record))
+                    counts[part] += 1
+            self._rows = {table: {} for table in TABLES}
+            self._lists = {}
+        return counts
+
+    def iter_tasks(self, task_ids: Optional[Iterable[str]] = None) -> Iterator[Dict[str, Any]]:
+        if task_ids is None:
+            task_ids = [task_id for (task_id,) in self._reader().execute("SELECT id FROM tasks ORDER BY created_at, id")]
+        for task_id in task_ids:
+            task = self.load_task(task_id)
+            if task is not None:
+                yield task
+
+    # Görev log deposu: task_logs tablosu, imleç sıra numarasıdır
+    def append_logs(self, task_id: str, entries: List[Dict[str, Any]]) -> None:
+        if not entries:
+            return
+        with self._lock:
+            conn = self._conn
+            with conn:
+                (start,) = conn.execute("SELECT COALESCE(MAX(position) + 1, 0) FROM task_logs WHERE task_id = ?", (task_id,)).fetchone()
+                conn.executemany(
+                    "INSERT INTO task_logs VALUES (?, ?, ?)",
+                    [(task_id, start + offset, _dumps(entry)) for offset, entry in enumerate(entries)]
+                )
+
+    def read_logs(self, task_id: str, cursor: int = 0, limit: int = 100) -> Tuple[List[Dict[str, Any]], int]:
+        rows = self._reader().execute(
+            "SELECT position, data FROM task_logs WHERE task_id = ? AND position >= ? ORDER BY position LIMIT ?",
+            (task_id, cursor, limit)
+        ).fetchall()
+        if not rows:
+            return [], cursor
+        return [codec.loads(data) for _, data in rows], rows[-1][0] + 1
+
+    def tail_logs(self, task_id: str, limit: int) -> List[Dict[str, Any]]:
+        rows = self._reader().execute(
+            "SELECT data FROM task_logs WHERE task_id = ? ORDER BY position DESC LIMIT ?", (task_id, limit)
+        ).fetchall()
+        return [codec.loads(data) for (data,) in reversed(rows)]
+
+    def count_logs(self, task_id: str) -> int:
+        return self._reader().execute("SELECT COUNT(*) FROM task_logs WHERE task_id = ?", (task_id,)).fetchone()[0]
+
+    def delete_logs(self, task_ids: Iterable[str]) -> None:
+        with self._lock:
+            with self._conn:
+                self._conn.executemany("DELETE FROM task_logs WHERE task_id = ?", [(task_id,) for task_id in task_ids])
+
+    def compact(self, tasks: Dict[str, Any]) -> None:
+        """WAL dosyasını ana veritabanına aktarır ve boşaltır"""
+        with self._lock:
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    # İndeksli sorgular
+    def team_task_ids(self, team_id: str) -> Optional[List[str]]:
+        rows = self._reader().execute("SELECT id FROM tasks WHERE team_id = ? ORDER BY created_at, id", (team_id,))
+        return [task_id for (task_id,) in rows]
+
+    def team_bugs(self, team_id: str) -> Optional[List[Dict]]:
+        rows = self._reader().execute("SELECT data FROM bugs WHERE team_id = ? ORDER BY position", (team_id,))
+        return [codec.loads(row) for (row,) in rows]
+
+    def team_messages(self, team_id: str) -> Optional[List[Dict]]:
+        rows = self._reader().execute("SELECT data FROM messages WHERE team_id = ? ORDER BY position", (team_id,))
+        return [codec.loads(row) for (row,) in rows]
+
+    def task_documents(self, task_id: str) -> Optional[List[Dict]]:
+        rows = self._reader().execute("SELECT data FROM documents WHERE task_id = ? ORDER BY position", (task_id,))
+        return [codec.loads(row) for (row,) in rows]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": self.name,
+            "path": self.path,
+            **self.counters,
+            "rows": {table: len(rows) for table, rows in self._rows.items()},
+            "size_bytes": os.path.getsize(self.path) if os.path.exists(self.path) else 0,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            for conn in self._readers:
+                conn.close()
+            self._readers = []
+            self._conn.close()
@@ -0,0 +1,404 @@
+import argparse
+import os
+import shutil
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.utils import codec
+from src.utils.journal import TaskJournal
+from src.utils.persistence import atomic_write_json
+from src.utils.task_logs import MAX_PAGE_SIZE, FileLogStore, LogBatcher
+
+# Depolama katmanının okuduğu/yazdığı parçalar
+PARTS = ("teams", "tasks", "bugs", "messages")
+# Aktarım kayıtlarının parçaları: görev logları {"task_id", "entry"} kayıtları olarak taşınır
+RECORD_PARTS = PARTS + ("logs",)
+
+BACKENDS = ("json", "sharded", "sqlite")
+
+
+def empty_data() -> Dict[str, Any]:
+    return {"teams": {}, "tasks": {}, "bugs": [], "messages": []}
+
+
+def data_records(data: Dict[str, Any]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Düz veriyi (parça, kayıt) çiftlerine çevirir; takım ve görev kayıtları id'lerini içerir"""
+    for part in ("teams", "tasks"):
+        for entity_id, entity in data.get(part, {}).items():
+            yield part, {**entity, "id": entity.get("id", entity_id)}
+    for part in ("bugs", "messages"):
+        for item in data.get(part, []):
+            yield part, item
+
+
+def collect_records(records: Iterable[Tuple[str, Dict[str, Any]]]) -> Dict[str, Any]:
+    """(parça, kayıt) çiftlerini düz veriye toplar"""
+    data = empty_data()
+    for part, record in records:
+        if part == "logs":
+            continue
+        if part in ("teams", "tasks"):
+            data[part][record["id"]] = record
+        else:
+            data[part].append(record)
+    return data
+
+
+class Storage(ABC):
+    """TeamManager verilerinin kalıcı depolaması
+
+    load() tüm veriyi düz sözlükler olarak döndürür:
+    {"teams": {id: takım}, "tasks": {id: görev}, "bugs": [...], "messages": [...]}
+    (takım sözlükleri ajanlarını "agents" listesinde içerir). write_*
+    metotları arka plan yazıcı thread'inden çağrılır ve yalnızca değişen
+    kısmı yazmaya çalışır. Sorgu metotları (team_task_ids, team_bugs...)
+    None döndürürse TeamManager bellekteki veriyi tarar.
+
+    Görevleri tek tek okuyabilen depolar (supports_lazy) load_index() ve
+    load_task() ile görev gövdelerinin ilk erişimde yüklenmesini destekler.
+
+    Görev logları görev kaydından ayrı, yalnızca sona eklenen log
+    deposunda tutulur (varsayılan: log_store, görev başına NDJSON dosyası).
+    """
+
+    name = "storage"
+    supports_lazy = False
+    log_store: Optional[FileLogStore] = None
+
+    @abstractmethod
+    def load(self, include_tasks: bool = True) -> Dict[str, Any]:
+        """Kayıtlı tüm veriyi okur (include_tasks False ise görevler boş döner)"""
+
+    def prime(self, teams: Dict[str, Any], tasks: Dict[str, Any], bugs: List[Dict], messages: List[Dict]) -> None:
+        """Yüklenen nesneleri yazılmış kabul eder (açılışta çağrılır)"""
+
+    def load_index(self) -> Dict[str, Dict[str, Any]]:
+        """Görev özetlerini (başlık, takım, durum, tarihler) oluşturulma sırasıyla döndürür"""
+        raise NotImplementedError(f"{self.name} deposu görevleri tek tek yüklemeyi desteklemiyor")
+
+    def load_task(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Tek görevin verisini okur"""
+        raise NotImplementedError(f"{self.name} deposu görevleri tek tek yüklemeyi desteklemiyor")
+
+    def prime_task(self, task_id: str, task: Any) -> None:
+        """Sonradan yüklenen görevi yazılmış kabul eder"""
+
+    def evict_task(self, task_id: str) -> None:
+        """Bellekten atılan görevin karşılaştırma durumunu bırakır (görev silinmez)"""
+
+    def delete_tasks(self, task_ids: Iterable[str]) -> None:
+        """Görevleri depodan siler (write_tasks complete=False ile kullanılırken)"""
+
+    @abstractmethod
+    def write_teams(self, teams: Dict[str, Any]) -> None:
+        """Takımları (ve ajanlarını) yazar"""
+
+    @abstractmethod
+    def write_tasks(self, tasks: Dict[str, Any], complete: bool = True) -> None:
+        """Görevleri yazar
+
+        complete False ise tasks yalnızca değişen görevlerdir; listede
+        olmayan görevler silinmiş sayılmaz (silme delete_tasks ile yapılır).
+        """
+
+    @abstractmethod
+    def write_bugs(self, bugs: List[Dict]) -> None:
+        """Hataları yazar"""
+
+    @abstractmethod
+    def write_messages(self, messages: List[Dict]) -> None:
+        """Mesajları yazar"""
+
+    @abstractmethod
+    def import_data(self, data: Dict[str, Any]) -> None:
+        """Depodaki tüm veriyi verilen düz veriyle değiştirir (taşıma için)"""
+
+    def iter_tasks(self, task_ids: Optional[Iterable[str]] = None) -> Iterator[Dict[str, Any]]:
+        """Görevleri oluşturulma sırasıyla tek tek okur
+
+        task_ids verilirse yalnızca bu görevler (bu sırayla, depoda
+        olanlar) okunur. Varsayılan gerçekleme tüm görevleri yükler;
+        görevleri tek tek okuyabilen depolar bellek kullanımını bir görevle
+        sınırlar.
+        """
+        tasks = self.load()["tasks"]
+        if task_ids is None:
+            yield from tasks.values()
+            return
+        for task_id in task_ids:
+            if task_id in tasks:
+                yield tasks[task_id]
+
+    def iter_records(self, task_ids: Optional[Iterable[str]] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Tüm veriyi (parça, kayıt) çiftleri olarak okur (dışa aktarma ve taşıma için)
+
+        Her görevin ardından logları {"task_id", "entry"} kayıtları olarak gelir.
+        Eski kayıtlarda görev içinde tutulan loglar da ayrı kayıtlara çevrilir.
+        task_ids verilirse yalnızca bu görevler okunur (ör. dışa aktarma
+        başladığında var olan görevler).
+        """
+        data = self.load(include_tasks=False)
+        for team in data["teams"].values():
+            yield "teams", team
+        for task in self.iter_tasks(task_ids):
+            entries: Iterable[Dict[str, Any]] = self.iter_logs(task["id"])
+            if "log_count" not in task:
+                task = dict(task)
+                legacy = task.pop("logs", None) or []
+                task["log_count"] = self.count_logs(task["id"])
+                if legacy and not task["log_count"]:
+                    entries = legacy
+                    task["log_count"] = len(legacy)
+            yield "tasks", task
+            for entry in entries:
+                yield "logs", {"task_id": task["id"], "entry": entry}
+        for part in ("bugs", "messages"):
+            for item in data[part]:
+                yield part, item
+
+    def import_records(self, records: Iterable[Tuple[str, Dict[str, Any]]]) -> Dict[str, int]:
+        """Depodaki tüm veriyi (parça, kayıt) çiftleriyle değiştirir; parça başına kayıt sayısını döndürür
+
+        Varsayılan gerçekleme kayıtları belleğe toplayıp import_data() çağırır
+        (loglar aktarılmaz); görevleri tek tek yazabilen depolar görevleri
+        geldikçe yazar.
+        """
+        data = collect_records(records)
+        self.import_data(data)
+        return {part: len(data.get(part, [])) for part in RECORD_PARTS}
+
+    # Görev log deposu
+    def _logs(self) -> FileLogStore:
+        if self.log_store is None:
+            raise NotImplementedError(f"{self.name} deposunda log deposu yok")
+        return self.log_store
+
+    def append_logs(self, task_id: str, entries: List[Dict[str, Any]]) -> None:
+        """Görevin log deposunun sonuna kayıt ekler"""
+        self._logs().append(task_id, entries)
+
+    def read_logs(self, task_id: str, cursor: int = 0, limit: int = 100) -> Tuple[List[Dict[str, Any]], int]:
+        """cursor'dan itibaren en fazla limit log kaydını ve sonraki sayfanın imlecini döndürür"""
+        return self._logs().read(task_id, cursor, limit)
+
+    def tail_logs(self, task_id: str, limit: int) -> List[Dict[str, Any]]:
+        """Görevin son limit log kaydı"""
+        return self._logs().tail(task_id, limit)
+
+    def count_logs(self, task_id: str) -> int:
+        return self._logs().count(task_id)
+
+    def delete_logs(self, task_ids: Iterable[str]) -> None:
+        self._logs().delete(task_ids)
+
+    def iter_logs(self, task_id: str) -> Iterator[Dict[str, Any]]:
+        cursor = 0
+        while True:
+            entries, cursor = self.read_logs(task_id, cursor, MAX_PAGE_SIZE)
+            if not entries:
+                return
+            yield from entries
+
+    def compact(self, tasks: Dict[str, Any]) -> None:
+        """Depolamayı sıkıştırır (desteklenmiyorsa bir şey yapmaz)"""
+
+    def team_task_ids(self, team_id: str) -> Optional[List[str]]:
+        return None
+
+    def team_bugs(self, team_id: str) -> Optional[List[Dict]]:
+        return None
+
+    def team_messages(self, team_id: str) -> Optional[List[Dict]]:
+        return None
+
+    def task_documents(self, task_id: str) -> Optional[List[Dict]]:
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": self.name}
+
+    def close(self) -> None:
+        """Açık bağlantıları kapatır"""
+
+
+class JsonStorage(Storage):
+    """JSON dosyalarına yazan varsayılan depolama
+
+    Takımlar, hatalar ve mesajlar tek dosyaya atomik olarak yazılır;
+    görevler TaskJournal ile değişiklik günlüğüne eklenir.
+    """
+
+    name = "json"
+
+    def __init__(self, directory: str = "data", journal: Optional[TaskJournal] = None):
+        self.directory = directory
+        self.journal = journal or TaskJournal.from_env(directory)
+        self.log_store = FileLogStore(os.path.join(directory, "logs"))
+
+    def _path(self, part: str) -> str:
+        return os.path.join(self.directory, f"{part}.json")
+
+    def _read(self, part: str, default: Any) -> Any:
+        path = self._path(part)
+        if not os.path.exists(path):
+            return default
+        try:
+            return codec.load_file(path)
+        except Exception as e:
+            print(f"[WARN] {path} okunamadı: {e}")
+            return default
+
+    def load(self, include_tasks: bool = True) -> Dict[str, Any]:
+        os.makedirs(self.directory, exist_ok=True)
+        data = empty_data()
+        data["teams"] = self._read("teams", {})
+        if include_tasks:
+            try:
+                data["tasks"] = self.journal.load()
+            except Exception as e:
+                print(f"[WARN] Görevler okunamadı: {e}")
+        data["bugs"] = self._read("bugs", [])
+        data["messages"] = self._read("messages", [])
+        return data
+
+    def prime(self, teams, tasks, bugs, messages) -> None:
+        self.journal.prime(tasks)
+
+    def write_teams(self, teams: Dict[str, Any]) -> None:
+        atomic_write_json(self._path("teams"), {team_id: team.to_dict() for team_id, team in list(teams.items())})
+
+    def write_tasks(self, tasks: Dict[str, Any], complete: bool = True) -> None:
+        self.journal.sync(tasks, complete)
+
+    def delete_tasks(self, task_ids: Iterable[str]) -> None:
+        self.journal.delete(task_ids)
+
+    def write_bugs(self, bugs: List[Dict]) -> None:
+        atomic_write_json(self._path("bugs"), list(bugs))
+
+    def write_messages(self, messages: List[Dict]) -> None:
+        atomic_write_json(self._path("messages"), list(messages))
+
+    def import_data(self, data: Dict[str, Any]) -> None:
+        self.import_records(data_records(data))
+
+    def iter_tasks(self, task_ids: Optional[Iterable[str]] = None) -> Iterator[Dict[str, Any]]:
+        if task_ids is None:
+            return self.journal.iter_tasks()
+        # Anlık görüntü akış halinde okunduğu için görevler diskteki sırayla gelir
+        wanted = set(task_ids)
+        return (task for task in self.journal.iter_tasks() if task["id"] in wanted)
+
+    def import_records(self, records: Iterable[Tuple[str, Dict[str, Any]]]) -> Dict[str, int]:
+        # Görevler anlık görüntüye, loglar geçici log deposuna geldikçe yazılır;
+        # takımlar, hatalar ve mesajlar küçük olduğu için toplanır
+        rest = empty_data()
+        counts = dict.fromkeys(RECORD_PARTS, 0)
+        staging = self.log_store.staging()
+        logs = LogBatcher(staging.append)
+
+        def tasks() -> Iterator[Dict[str, Any]]:
+            for part, record in records:
+                counts[part] += 1
+                if part == "tasks":
+                    yield record
+                elif part == "logs":
+                    logs.add(record["task_id"], record["entry"])
+                elif part == "teams":
+                    rest["teams"][record["id"]] = record
+                else:
+                    rest[part].append(record)
+            logs.flush()
+
+        try:
+            self.journal.replace(tasks())
+        except Exception:
+            shutil.rmtree(staging.directory, ignore_errors=True)
+            raise
+        self.log_store.replace_with(staging)
+        atomic_write_json(self._path("teams"), rest["teams"])
+        atomic_write_json(self._path("bugs"), rest["bugs"])
+        atomic_write_json(self._path("messages"), rest["messages"])
+        return counts
+
+    def compact(self, tasks: Dict[str, Any]) -> None:
+        self.journal.compact()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": self.name, "directory": self.directory, "journal": self.journal.stats(), "logs": self.log_store.stats()}
+
+
+def create_storage(backend: Optional[str] = None, directory: str = "data") -> Storage:
+    """STORAGE_BACKEND çevre değişkenine göre depolamayı oluşturur (json, sharded veya sqlite)"""
+    backend = (backend or os.getenv("STORAGE_BACKEND", "json")).lower()
+    if backend == "json":
+        return JsonStorage(directory)
+    if backend == "sharded":
+        from src.utils.sharded_storage import ShardedJsonStorage
+        return ShardedJsonStorage(directory)
+    if backend == "sqlite":
+        from src.utils.sqlite_storage import SqliteStorage
+        return SqliteStorage(os.getenv("SQLITE_PATH") or os.path.join(directory, "agentic.db"))
+    raise ValueError(f"Bilinmeyen depolama türü: {backend}. Geçerli türler: {', '.join(BACKENDS)}")
+
+
+def migrate(source: Storage, target: Storage) -> Dict[str, int]:
+    """Kaynak depodaki tüm veriyi hedef depoya kopyalar; parça başına kayıt sayısını döndürür
+
+    Görevler tek tek okunup yazılır; taşıma sırasında bellekte tüm görevler tutulmaz.
+    """
+    return target.import_records(source.iter_records())
+
+
+def _format_counts(counts: Dict[str, int]) -> str:
+    return ", ".join(f"{count} {part}" for part, count in counts.items())
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Agentic Teams verilerini depolama türleri arasında taşır, dışa ve içe aktarır")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    migrate_parser = subparsers.add_parser("migrate", help="Verileri bir depodan diğerine kopyalar")
+    migrate_parser.add_argument("--from", dest="source", choices=BACKENDS, default="json")
+    migrate_parser.add_argument("--to", dest="target", choices=BACKENDS, default="sqlite")
+    migrate_parser.add_argument("--data-dir", default="data", help="Veri klasörü (varsayılan: data)")
+    export_parser = subparsers.add_parser("export", help="Tüm veriyi NDJSON dosyasına yazar (.gz uzantısında sıkıştırılır)")
+    export_parser.add_argument("output", help="Çıktı dosyası (ör. yedek.ndjson.gz)")
+    export_parser.add_argument("--from", dest="source", choices=BACKENDS, default=None, help="Varsayılan: STORAGE_BACKEND")
+    export_parser.add_argument("--data-dir", default="data", help="Veri klasörü (varsayılan: data)")
+    import_parser = subparsers.add_parser("import", help="NDJSON dışa aktarımını veya eski JSON veri klasörünü depoya aktarır")
+    import_parser.add_argument("input", help="NDJSON(.gz) dosyası veya eski veri klasörü")
+    import_parser.add_argument("--to", dest="target", choices=BACKENDS, default=None, help="Varsayılan: STORAGE_BACKEND")
+    import_parser.add_argument("--data-dir", default="data", help="Veri klasörü (varsayılan: data)")
+    args = parser.parse_args(argv)
+
+    if args.command in ("export", "import"):
+        from src.utils.blobs import BlobStore
+        from src.utils.transfer import export_to_file, import_from
+
+        storage = create_storage(args.source if args.command == "export" else args.target, args.data_dir)
+        try:
+            if args.command == "export":
+                counts = export_to_file(storage.iter_records(), args.output, BlobStore.from_env(args.data_dir).resolve_task)
+                print(f"Dışa aktarma tamamlandı ({storage.name} -> {args.output}): {_format_counts(counts)}")
+            else:
+                counts = import_from(storage, args.input)
+                print(f"İçe aktarma tamamlandı ({args.input} -> {storage.name}): {_format_counts(counts)}")
+        finally:
+            storage.close()
+        return
+
+    if args.source == args.target:
+        parser.error("Kaynak ve hedef depolama türü aynı olamaz")
+    source = create_storage(args.source, args.data_dir)
+    target = create_storage(args.target, args.data_dir)
+    try:
+        counts = migrate(source, target)
+    finally:
+        source.close()
+        target.close()
+    print(f"Taşıma tamamlandı ({args.source} -> {args.target}): {_format_counts(counts)}")
+    print(f"Yeni depolamayı kullanmak için STORAGE_BACKEND={args.target} ayarlayın")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# Görev özetinde (indeks) tutulan alanlar
+SUMMARY_FIELDS = ("title", "team_id", "status", "created_at", "updated_at")
+
+
+def task_summary(task: Any) -> Dict[str, Any]:
+    return {field: getattr(task, field, None) for field in SUMMARY_FIELDS}
+
+
+class LazyTaskMap(MutableMapping):
+    """Görev gövdelerini ilk erişimde yükleyen, soğuk görevleri bellekten atan görev sözlüğü
+
+    Açılışta yalnızca görev özetleri (id, başlık, takım, durum, tarihler)
+    yüklenir. `task_id in tasks`, len() ve id üzerinde gezinme gövde
+    yüklemez; tasks[task_id] görevi loader ile depodan yükler ve son
+    erişim sırasına göre bellekte tutar. evict_cold() bellekteki görevlerin
+    tahmini boyutu max_bytes'ı aşarken en uzun süredir erişilmemiş soğuk
+    görevleri (çağıranın belirlediği) bellekten atar; atılan görev bir
+    sonraki erişimde yeniden yüklenir. Görev nesnesini uzun süre elinde
+    tutan kod pinned() bloğu içinde çalışmalıdır: atılan nesneye yapılan
+    değişiklikler kaydedilmez.
+
+    loader(task_id) -> (görev, tahmini bayt) veya None
+    sizer(görev) -> tahmini bayt (oturumda oluşturulan görevler için)
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[str], Optional[Tuple[Any, int]]],
+        sizer: Callable[[Any], int],
+        max_bytes: int = 64 * 1024 * 1024,
+        idle_seconds: float = 60.0
+    ):
+        self.loader = loader
+        self.sizer = sizer
+        self.max_bytes = max_bytes
+        self.idle_seconds = idle_seconds
+        self._lock = threading.RLock()
+        self._index: Dict[str, Dict[str, Any]] = {}
+        self._resident: "OrderedDict[str, Any]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._last_access: Dict[str, float] = {}
+        self._pins: Dict[str, int] = {}
+        self.counters = {"hydrations": 0, "evictions": 0, "misses": 0}
+
+    def set_index(self, index: Dict[str, Dict[str, Any]]) -> None:
+        with self._lock:
+            self._index = dict(index)
+
+    def __getitem__(self, task_id: str) -> Any:
+        with self._lock:
+            task = self._resident.get(task_id)
+            if task is None:
+                if task_id not in self._index:
+                    raise KeyError(task_id)
+                loaded = self.loader(task_id)
+                if loaded is None:
+                    self.counters["misses"] += 1
+                    raise KeyError(task_id)
+                task, size = loaded
+                self._resident[task_id] = task
+                self._sizes[task_id] = size
+                self.counters["hydrations"] += 1
+            self._resident.move_to_end(task_id)
+            self._last_access[task_id] = time.monotonic()
+            return task
+
+    def __setitem__(self, task_id: str, task: Any) -> None:
+        with self._lock:
+            self._resident[task_id] = task
+            self._resident.move_to_end(task_id)
+            self._sizes.pop(task_id, None)
+            self._last_access[task_id] = time.monotonic()
+            self._index[task_id] = task_summary(task)
+
+    def __delitem__(self, task_id: str) -> None:
+        with self._lock:
+            if task_id not in self._index:
+                raise KeyError(task_id)
+            del self._index[task_id]
+            self._resident.pop(task_id, None)
+            self._sizes.pop(task_id, None)
+            self._last_access.pop(task_id, None)
+
+    def __contains__(self, task_id: object) -> bool:
+        return task_id in self._index
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            return iter(list(self._index))
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def summary(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Görevi yüklemeden özetini döndürür"""
+        with self._lock:
+            task = self._resident.get(task_id)
+            if task is not None:
+                return task_summary(task)
+            return self._index.get(task_id)
+
+    def ids_for_team(self, team_id: str) -> List[str]:
+        with self._lock:
+            return [task_id for task_id in self._index if (self.summary(task_id) or {}).get("team_id") == team_id]
+
+    @contextmanager
+    def pinned(self, task_id: str) -> Iterator[None]:
+        """Blok süresince görevi bellekten atılmaz yapar (iç içe kullanılabilir)"""
+        with self._lock:
+            self._pins[task_id] = self._pins.get(task_id, 0) + 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                count = self._pins.pop(task_id) - 1
+                if count:
+                    self._pins[task_id] = count
+                self._last_access[task_id] = time.monotonic()
+
+    def peek(self, task_id: str) -> Optional[Any]:
+        """Görev bellekteyse döndürür (yüklemez, erişim sırasını değiştirmez)"""
+        with self._lock:
+            return self._resident.get(task_id)
+
+    def resident(self) -> Dict[str, Any]:
+        """Bellekteki görevlerin anlık kopyası"""
+        with self._lock:
+            return dict(self._resident)
+
+    def evict_cold(self, is_cold: Callable[[str, Any], bool], sizes: Optional[Dict[str, int]] = None) -> List[str]:
+        """Bütçe aşılıyorsa soğuk görevleri en eskiden başlayarak bellekten atar; atılan id'leri döndürür
+
+        sizes: görevlerin güncel tahmini boyutları (ör. yazılan kopyalardan);
+        verilirse görevler sizer ile yeniden ölçülmez, boyutu bilinmeyenler
+        sayılmaz.
+        """
+        evicted: List[str] = []
+        with self._lock:
+            for task_id, task in self._resident.items():
+                if sizes is not None:
+                    self._sizes[task_id] = sizes.get(task_id, self._sizes.get(task_id, 0))
+                elif task_id not in self._sizes:
+                    self._sizes[task_id] = self.sizer(task)
+            total = sum(self._sizes.values())
+            if total <= self.max_bytes:
+                return evicted
+            now = time.monotonic()
+            for task_id, task in list(self._resident.items()):
+                if total <= self.max_bytes:
+                    break
+                if task_id in self._pins or now - self._last_access.get(task_id, 0.0) < self.idle_seconds or not is_cold(task_id, task):
+                    continue
+                self._index[task_id] = task_summary(task)
+                del self._resident[task_id]
+                total -= self._sizes.pop(task_id, 0)
+                self._last_access.pop(task_id, None)
+                evicted.append(task_id)
+            self.counters["evictions"] += len(evicted)
+        return evicted
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self.counters,
+                "tasks": len(self._index),
+                "resident": len(self._resident),
+                "pinned": len(self._pins),
+                "resident_bytes": sum(self._sizes.values()),
+                "max_bytes": self.max_bytes,
+            }
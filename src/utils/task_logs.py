@@ -0,0 +1,214 @@
+import os
+import shutil
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.utils import codec
+
+# Sayfalı okumada varsayılan ve en fazla kayıt sayısı
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def buffer_size() -> int:
+    """Görev başına bellekte tutulan son log sayısı (TASK_LOG_BUFFER_SIZE)"""
+    return max(1, int(os.getenv("TASK_LOG_BUFFER_SIZE", "50")))
+
+
+class TaskLog:
+    """Görev loglarının bellekteki son kayıtları (halka tampon)
+
+    Görev nesnesinde liste gibi kullanılır (append, len, gezinme, dilim)
+    ancak yalnızca son maxlen kaydı tutar; len() görevin toplam log
+    sayısını verir. Eklenen kayıtlar kaydedilene kadar ayrıca bekletilir
+    ve sink(task_id, log) ile bildirilir; tüm geçmiş depodaki log deposuna
+    (görev başına dosya veya tablo) sona eklenerek yazılır ve sayfalı
+    okunur. Böylece görev kaydı ve durum sorguları log sayısından bağımsız
+    boyutta kalır.
+    """
+
+    def __init__(self, entries: Iterable[Dict[str, Any]] = (), total: Optional[int] = None, maxlen: Optional[int] = None):
+        self._lock = threading.Lock()
+        self._recent: "deque[Dict[str, Any]]" = deque(entries, maxlen=max(1, maxlen or buffer_size()))
+        self.total = len(self._recent) if total is None else max(total, len(self._recent))
+        self._unsaved: List[Dict[str, Any]] = []
+        self.task_id: Optional[str] = None
+        self._sink: Optional[Callable[[str, "TaskLog"], None]] = None
+
+    def bind(self, task_id: str, sink: Callable[[str, "TaskLog"], None]) -> None:
+        """Eklenen kayıtların bildirileceği yeri ayarlar (kaydedilmemiş kayıt varsa hemen bildirilir)"""
+        with self._lock:
+            self.task_id = task_id
+            self._sink = sink
+            pending = bool(self._unsaved)
+        if pending:
+            sink(task_id, self)
+
+    def append(self, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._recent.append(entry)
+            self._unsaved.append(entry)
+            self.total += 1
+            sink = self._sink
+        if sink is not None:
+            sink(self.task_id, self)
+
+    def extend(self, entries: Iterable[Dict[str, Any]]) -> None:
+        for entry in entries:
+            self.append(entry)
+
+    def recent(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Son kayıtlar (en eskiden en yeniye)"""
+        with self._lock:
+            entries = list(self._recent)
+        return entries if limit is None else entries[-limit:] if limit > 0 else []
+
+    def take_unsaved(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            entries, self._unsaved = self._unsaved, []
+            return entries
+
+    def restore_unsaved(self, entries: List[Dict[str, Any]]) -> None:
+        """Yazılamayan kayıtları bir sonraki yazımda yeniden denemek üzere geri koyar"""
+        with self._lock:
+            self._unsaved[:0] = entries
+
+    def __len__(self) -> int:
+        return self.total
+
+    def __bool__(self) -> bool:
+        return self.total > 0
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self.recent())
+
+    def __getitem__(self, index):
+        return self.recent()[index]
+
+    def __repr__(self) -> str:
+        return f"TaskLog(total={self.total}, recent={len(self._recent)})"
+
+
+class FileLogStore:
+    """Görev başına NDJSON dosyasına sona eklenen log deposu: <klasör>/<görev id>.ndjson
+
+    Sayfalama imleci dosyadaki bayt konumudur; bir sayfa okumak dosyanın
+    o noktasından yalnızca istenen satırları okur.
+    """
+
+    def __init__(self, directory: str = "data/logs"):
+        self.directory = directory
+        self._lock = threading.Lock()
+
+    def _path(self, task_id: str) -> str:
+        return os.path.join(self.directory, f"{task_id}.ndjson")
+
+    def append(self, task_id: str, entries: List[Dict[str, Any]]) -> None:
+        if not entries:
+            return
+        payload = b"".join(codec.dumps(entry) + b"\n" for entry in entries)
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(self._path(task_id), "ab") as f:
+                f.write(payload)
+
+    def read(self, task_id: str, cursor: int = 0, limit: int = DEFAULT_PAGE_SIZE) -> Tuple[List[Dict[str, Any]], int]:
+        """cursor'dan itibaren en fazla limit kaydı ve sonraki sayfanın imlecini döndürür"""
+        path = self._path(task_id)
+        if not os.path.exists(path):
+            return [], cursor
+        entries: List[Dict[str, Any]] = []
+        with open(path, "rb") as f:
+            f.seek(cursor)
+            while len(entries) < limit:
+                line = f.readline()
+                if not line.endswith(b"\n"):
+                    # Dosya sonu veya yazımı süren son satır
+                    break
+                cursor += len(line)
+                if line.strip():
+                    entries.append(codec.loads(line))
+        return entries, cursor
+
+    def tail(self, task_id: str, limit: int) -> List[Dict[str, Any]]:
+        """Son limit kaydı dosyanın sonundan geriye okuyarak döndürür"""
+        path = self._path(task_id)
+        if limit <= 0 or not os.path.exists(path):
+            return []
+        with open(path, "rb") as f:
+            end = f.seek(0, os.SEEK_END)
+            data = b""
+            position = end
+            while position > 0 and data.count(b"\n") <= limit:
+                step = min(position, 64 * 1024)
+                position -= step
+                f.seek(position)
+                data = f.read(step) + data
+        # Yazımı süren son satır atlanır
+        data = data[:data.rfind(b"\n") + 1]
+        lines = [line for line in data.split(b"\n") if line.strip()]
+        if position > 0:
+            # İlk satır yarım okunmuş olabilir
+            lines = lines[1:]
+        return [codec.loads(line) for line in lines[-limit:]]
+
+    def count(self, task_id: str) -> int:
+        path = self._path(task_id)
+        if not os.path.exists(path):
+            return 0
+        with open(path, "rb") as f:
+            return sum(1 for line in f if line.strip())
+
+    def delete(self, task_ids: Iterable[str]) -> None:
+        with self._lock:
+            for task_id in task_ids:
+                path = self._path(task_id)
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def staging(self) -> "FileLogStore":
+        """Aktarım için boş geçici depo (<klasör>.import); replace_with() ile devreye alınır"""
+        directory = f"{self.directory}.import"
+        shutil.rmtree(directory, ignore_errors=True)
+        return FileLogStore(directory)
+
+    def replace_with(self, staging: "FileLogStore") -> None:
+        """Geçici depodaki dosyaları mevcut logların yerine taşır"""
+        with self._lock:
+            previous = f"{self.directory}.old"
+            shutil.rmtree(previous, ignore_errors=True)
+            if os.path.isdir(self.directory):
+                os.replace(self.directory, previous)
+            if os.path.isdir(staging.directory):
+                os.replace(staging.directory, self.directory)
+            shutil.rmtree(previous, ignore_errors=True)
+
+    def stats(self) -> Dict[str, Any]:
+        files = [name for name in os.listdir(self.directory) if name.endswith(".ndjson")] if os.path.isdir(self.directory) else []
+        return {
+            "directory": self.directory,
+            "files": len(files),
+            "bytes": sum(os.path.getsize(os.path.join(self.directory, name)) for name in files),
+        }
+
+
+class LogBatcher:
+    """Aktarımda art arda gelen aynı göreve ait log kayıtlarını toplu yazar"""
+
+    def __init__(self, append: Callable[[str, List[Dict[str, Any]]], None], batch_size: int = 1000):
+        self.append = append
+        self.batch_size = batch_size
+        self.task_id: Optional[str] = None
+        self.entries: List[Dict[str, Any]] = []
+
+    def add(self, task_id: str, entry: Dict[str, Any]) -> None:
+        if task_id != self.task_id or len(self.entries) >= self.batch_size:
+            self.flush()
+            self.task_id = task_id
+        self.entries.append(entry)
+
+    def flush(self) -> None:
+        if self.task_id is not None and self.entries:
+            self.append(self.task_id, self.entries)
+        self.entries = []
@@ -0,0 +1,113 @@
+import gzip
+import os
+import zlib
+from datetime import datetime
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from src.utils import codec
+from src.utils.storage import RECORD_PARTS, JsonStorage, Storage
+
+EXPORT_FORMAT = "agentic-teams"
+EXPORT_VERSION = 1
+
+# Parça -> NDJSON satırındaki "type" değeri
+RECORD_TYPES = {"teams": "team", "tasks": "task", "bugs": "bug", "messages": "message", "logs": "log"}
+_PARTS_BY_TYPE = {record_type: part for part, record_type in RECORD_TYPES.items()}
+
+_GZIP_MAGIC = b"\x1f\x8b"
+
+Record = Tuple[str, Dict[str, Any]]
+
+
+def export_lines(records: Iterable[Record], resolve_task: Optional[Callable[[Dict], Dict]] = None) -> Iterator[bytes]:
+    """Kayıtları NDJSON satırları olarak üretir (ilk satır biçim başlığıdır)
+
+    resolve_task verilirse görevlerdeki blob referansları içerikleriyle
+    doldurulur; böylece dışa aktarılan dosya blob deposu olmadan da taşınabilir.
+    """
+    header = {"type": "header", "format": EXPORT_FORMAT, "version": EXPORT_VERSION, "created_at": datetime.now().isoformat()}
+    yield codec.dumps(header) + b"\n"
+    for part, record in records:
+        if part == "tasks" and resolve_task is not None:
+            record = resolve_task(record)
+        yield codec.dumps({"type": RECORD_TYPES[part], "data": record}) + b"\n"
+
+
+def gzip_lines(lines: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Satırları akış halinde gzip ile sıkıştırır (HTTP yanıtları için)"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for line in lines:
+        chunk = compressor.compress(line)
+        if chunk:
+            yield chunk
+    yield compressor.flush()
+
+
+def export_to_file(
+    records: Iterable[Record],
+    path: str,
+    resolve_task: Optional[Callable[[Dict], Dict]] = None
+) -> Dict[str, int]:
+    """Kayıtları NDJSON dosyasına yazar (.gz uzantısında gzip ile); parça başına kayıt sayısını döndürür"""
+    counts = dict.fromkeys(RECORD_PARTS, 0)
+
+    def counted() -> Iterator[Record]:
+        for part, record in records:
+            counts[part] += 1
+            yield part, record
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(tmp_path, "wb") as f:
+        for line in export_lines(counted(), resolve_task):
+            f.write(line)
+    os.replace(tmp_path, path)
+    return counts
+
+
+def read_export(fp: IO[bytes]) -> Iterator[Record]:
+    """NDJSON dışa aktarımını (gzip'li veya düz) satır satır okur"""
+    head = fp.peek(2)[:2] if hasattr(fp, "peek") else b""
+    if head == _GZIP_MAGIC:
+        fp = gzip.GzipFile(fileobj=fp)
+    header = None
+    for number, line in enumerate(fp, 1):
+        if not line.strip():
+            continue
+        try:
+            item = codec.loads(line)
+        except ValueError as e:
+            raise ValueError(f"Dışa aktarım dosyasının {number}. satırı okunamadı: {e}")
+        if header is None:
+            if item.get("type") != "header" or item.get("format") != EXPORT_FORMAT:
+                raise ValueError("Dosya bir Agentic Teams dışa aktarımı değil (başlık satırı yok)")
+            if item.get("version", 0) > EXPORT_VERSION:
+                raise ValueError(f"Desteklenmeyen dışa aktarım sürümü: {item.get('version')}")
+            header = item
+            continue
+        part = _PARTS_BY_TYPE.get(item.get("type"))
+        if part is None:
+            print(f"[WARN] Bilinmeyen kayıt türü atlandı ({number}. satır): {item.get('type')}")
+            continue
+        yield part, item["data"]
+    if header is None:
+        raise ValueError("Dışa aktarım dosyası boş")
+
+
+def read_source(path: str) -> Iterator[Record]:
+    """Aktarım kaynağını okur: NDJSON dışa aktarımı (.ndjson / .ndjson.gz) veya eski JSON veri klasörü
+
+    Eski veri klasöründeki tek parça tasks.json akış halinde ayrıştırılır
+    (WAL kayıtları uygulanır); büyük geçmişler belleğe tamamen yüklenmez.
+    """
+    if os.path.isdir(path):
+        yield from JsonStorage(path).iter_records()
+        return
+    with open(path, "rb") as f:
+        yield from read_export(f)
+
+
+def import_from(storage: Storage, path: str) -> Dict[str, int]:
+    """Kaynağın tüm verisini depoya aktarır (depodaki mevcut verinin yerini alır)"""
+    return storage.import_records(read_source(path))
@@ -0,0 +1,39 @@
+from typing import Callable, Dict
+
+import httpx
+import pytest
+
+from src.models.ollama import OllamaAdapter, OllamaConfig
+from src.models.tracing import Tracer
+
+Handler = Callable[[httpx.Request], httpx.Response]
+
+
+def mock_client(base_url: str, handler: Handler) -> httpx.AsyncClient:
+    """Gerçek sunucu yerine handler'a giden httpx istemcisi"""
+    return httpx.AsyncClient(base_url=base_url, transport=httpx.MockTransport(handler))
+
+
+@pytest.fixture
+def ollama_adapter() -> Callable[..., OllamaAdapter]:
+    """Sunucu adresi -> handler eşlemesiyle çalışan OllamaAdapter oluşturur
+
+    Yeniden denemeler beklemeden yapılır; izler dosyaya yazılmaz.
+    """
+    def make(handlers: Dict[str, Handler], **config) -> OllamaAdapter:
+        urls = list(handlers)
+        settings = dict(
+            base_url=urls[0],
+            base_urls=urls,
+            retry_backoff_base=0.0,
+            retry_backoff_max=0.0,
+            ps_poll_interval=0.0,
+            embed_cache_dir=None,
+        )
+        settings.update(config)
+        adapter = OllamaAdapter(config=OllamaConfig(**settings), tracer=Tracer(sink=None))
+        for backend in adapter.pool.backends:
+            backend.client = mock_client(backend.base_url, handlers[backend.base_url])
+        return adapter
+
+    return make
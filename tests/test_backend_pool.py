@@ -0,0 +1,157 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from src.models.errors import CircuitOpenError
+from src.models.resilience import CircuitBreaker
+
+URL_A = "http://ollama-a"
+URL_B = "http://ollama-b"
+
+
+def recording_handler(name, calls):
+    def handler(request):
+        calls.append(name)
+        return httpx.Response(200, json={"response": f"yanıt {name}", "done": True})
+    return handler
+
+
+def down_handler(name, calls):
+    def handler(request):
+        calls.append(name)
+        raise httpx.ConnectError("bağlantı reddedildi")
+    return handler
+
+
+def test_routes_to_backend_with_model_loaded(ollama_adapter):
+    calls = []
+    adapter = ollama_adapter({URL_A: recording_handler("a", calls), URL_B: recording_handler("b", calls)})
+    adapter.pool.backends[1].loaded_models.add("m1:latest")
+
+    async def run():
+        for _ in range(4):
+            assert await adapter.generate("m1", "selam") == "yanıt b"
+
+    asyncio.run(run())
+    assert calls == ["b"] * 4
+
+
+def test_success_marks_model_loaded(ollama_adapter):
+    calls = []
+    adapter = ollama_adapter({URL_A: recording_handler("a", calls), URL_B: recording_handler("b", calls)})
+
+    async def run():
+        await adapter.generate("m1", "selam")
+        # İlk çağrıdan sonra model o sunucuda yüklü kabul edilir ve sonraki çağrılar ona gider
+        for _ in range(3):
+            await adapter.generate("m1", "selam")
+
+    asyncio.run(run())
+    assert len(set(calls)) == 1
+    served = adapter.pool.backends[0 if calls[0] == "a" else 1]
+    assert "m1:latest" in served.loaded_models
+
+
+def test_least_outstanding_without_affinity(ollama_adapter):
+    calls = []
+    adapter = ollama_adapter({URL_A: recording_handler("a", calls), URL_B: recording_handler("b", calls)})
+    adapter.pool.backends[0].outstanding = 5
+    assert adapter.pool.select("m1") is adapter.pool.backends[1]
+
+
+def test_fails_over_when_backend_is_down(ollama_adapter):
+    calls = []
+    adapter = ollama_adapter(
+        {URL_A: down_handler("a", calls), URL_B: recording_handler("b", calls)},
+        backend_failure_threshold=1,
+    )
+    adapter.pool.backends[0].loaded_models.add("m1:latest")
+
+    async def run():
+        # İlk çağrı yüklü modeli olan A'ya gider, bağlantı hatası A'yı devre dışı bırakır ve yeniden deneme B'ye gider
+        results = [await adapter.generate("m1", "selam") for _ in range(3)]
+        assert results == ["yanıt b"] * 3
+
+    asyncio.run(run())
+    assert calls == ["a", "b", "b", "b"]
+    backend_a = adapter.pool.backends[0]
+    assert not backend_a.is_healthy()
+    assert backend_a.loaded_models == set()
+
+
+def test_all_backends_down_raises_circuit_open(ollama_adapter):
+    calls = []
+    adapter = ollama_adapter(
+        {URL_A: down_handler("a", calls), URL_B: down_handler("b", calls)},
+        backend_failure_threshold=1,
+        retry_attempts=3,
+    )
+
+    async def run():
+        with pytest.raises(CircuitOpenError):
+            await adapter.generate("m1", "selam")
+        calls.clear()
+        # Devreler açıkken sunuculara istek gönderilmez
+        with pytest.raises(CircuitOpenError):
+            await adapter.generate("m1", "selam")
+
+    asyncio.run(run())
+    assert calls == []
+
+
+def test_breaker_opens_after_threshold():
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=30)
+    assert breaker.state() == CircuitBreaker.CLOSED
+    assert not breaker.record_failure()
+    assert breaker.available()
+    assert breaker.record_failure()
+    assert breaker.state() == CircuitBreaker.OPEN
+    assert not breaker.available()
+    assert breaker.retry_after() > 29
+
+
+def test_breaker_half_open_allows_single_probe():
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0.05)
+    breaker.record_failure()
+    assert breaker.state() == CircuitBreaker.OPEN
+    time.sleep(0.06)
+    assert breaker.state() == CircuitBreaker.HALF_OPEN
+    assert breaker.available()
+    assert breaker.on_dispatch()
+    # Deneme isteği sürerken başka çağrıya izin verilmez
+    assert not breaker.available()
+    breaker.record_success()
+    assert breaker.state() == CircuitBreaker.CLOSED
+
+
+def test_breaker_half_open_failure_reopens():
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.on_dispatch()
+    assert breaker.record_failure()
+    assert breaker.state() == CircuitBreaker.OPEN
+
+
+def test_pool_probes_half_open_backend(ollama_adapter):
+    calls = []
+    adapter = ollama_adapter(
+        {URL_A: recording_handler("a", calls)},
+        backend_failure_threshold=1,
+        backend_ejection_seconds=0.05,
+    )
+    backend = adapter.pool.backends[0]
+    backend.breaker.record_failure()
+
+    async def run():
+        with pytest.raises(CircuitOpenError):
+            await adapter.generate("m1", "selam")
+        await asyncio.sleep(0.06)
+        # Süre dolunca deneme isteği gönderilir; başarılı olunca devre kapanır
+        assert await adapter.generate("m1", "selam") == "yanıt a"
+
+    asyncio.run(run())
+    assert calls == ["a"]
+    assert backend.breaker.state() == CircuitBreaker.CLOSED
@@ -0,0 +1,52 @@
+import httpx
+import pytest
+
+from src.team_manager import TeamManager
+from src.utils.blobs import DOCUMENT_BLOB_FIELDS, BlobStore
+
+OLLAMA_URL = "http://ollama"
+CONTENT = "aynı içerik " * 200
+
+
+def ollama_handler(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, json={"models": [{"name": "m1:latest"}]})
+
+
+def test_same_content_is_stored_once_and_resolved(tmp_path):
+    store = BlobStore(str(tmp_path), codec="zz", min_bytes=10)
+    first = store.externalize({"id": "d1", "content": CONTENT}, DOCUMENT_BLOB_FIELDS)
+    second = store.externalize({"id": "d2", "content": CONTENT}, DOCUMENT_BLOB_FIELDS)
+    small = {"id": "d3", "content": "kısa"}
+
+    assert "content" not in first and first["content_blob"] == second["content_blob"]
+    assert store.externalize(small, DOCUMENT_BLOB_FIELDS) is small
+    assert store.counters["dedup"] == 1
+    assert BlobStore(str(tmp_path)).resolve(first, DOCUMENT_BLOB_FIELDS)["content"] == CONTENT
+
+
+@pytest.mark.parametrize("backend", ("json", "sqlite"))
+def test_deleting_tasks_releases_blob_references(backend, monkeypatch, tmp_path, ollama_adapter):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("STORAGE_BACKEND", backend)
+    monkeypatch.setenv("PERSIST_INTERVAL_SECONDS", "0")
+    monkeypatch.setenv("BLOB_GC_GRACE_SECONDS", "0")
+    adapter = ollama_adapter({OLLAMA_URL: ollama_handler})
+    manager = TeamManager(adapter)
+    team_id = manager.create_team("Takım", "açıklama")
+    task_ids = [manager.create_task(title, "açıklama", team_id) for title in ("Bir", "İki")]
+    for task_id in task_ids:
+        manager.upload_document(task_id, "Doküman", CONTENT)
+    manager.flush()
+    digest = manager.tasks[task_ids[0]].documents[0]["content_blob"]["hash"]
+    assert manager.blobs.refcount(digest) == 2
+
+    manager.delete_task(task_ids[0])
+    # Başka görev hâlâ referans verdiği için silinmez
+    assert manager.gc_blobs() == 0
+    assert manager.blobs.refcount(digest) == 1
+    assert TeamManager(adapter).blobs.refcount(digest) == 1
+
+    manager.delete_task(task_ids[1])
+    assert manager.gc_blobs() == 1
+    assert manager.blobs.refcount(digest) == 0
+    assert manager.blobs.stats()["owners"] == 0
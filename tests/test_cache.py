@@ -0,0 +1,71 @@
+import asyncio
+
+import httpx
+
+from src.models import cache as cache_module
+from src.models.cache import ResponseCache, make_cache_key
+
+URL = "http://ollama"
+
+
+def test_cache_key_ignores_stream_flag_only():
+    payload = {"model": "m1:latest", "prompt": "selam", "options": {"temperature": 0}}
+    key = make_cache_key("/api/generate", payload)
+    assert make_cache_key("/api/generate", {**payload, "stream": True}) == key
+    assert make_cache_key("/api/generate", {**payload, "prompt": "merhaba"}) != key
+    assert make_cache_key("/api/generate", {**payload, "options": {"temperature": 0, "seed": 1}}) != key
+    assert make_cache_key("/api/chat", payload) != key
+
+
+def test_expired_entries_are_misses_in_both_tiers(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "time", lambda: now[0])
+    cache = ResponseCache(directory=str(tmp_path), ttl_seconds=10)
+    cache.set("k", "yanıt")
+    now[0] += 5
+    assert cache.get("k") == "yanıt"
+
+    now[0] += 10
+    assert cache.get("k") is None
+    # Bellekteki kayıt düşünce disktekinin de süresi dolmuş olmalı
+    assert cache.counters["expired"] == 2
+    assert cache.stats()["disk_entries"] == 0
+
+
+def test_memory_eviction_falls_back_to_disk_and_disk_is_bounded(tmp_path):
+    cache = ResponseCache(directory=str(tmp_path), max_memory_entries=1, max_disk_bytes=10 ** 6)
+    cache.set("a", "bir")
+    cache.set("b", "iki")
+    assert cache.counters["memory_evictions"] == 1
+    assert cache.get("a") == "bir"
+    assert cache.counters["disk_hits"] == 1
+
+    small = ResponseCache(directory=str(tmp_path / "small"), max_disk_bytes=1)
+    small.set("a", "bir")
+    small.set("b", "iki")
+    # En eski kayıt silinir, son yazılan her zaman kalır
+    assert small.stats()["disk_entries"] == 1
+    assert small.counters["disk_evictions"] == 1
+    assert ResponseCache(directory=str(tmp_path / "small")).get("b") == "iki"
+
+
+def test_only_deterministic_generations_are_cached(ollama_adapter, tmp_path):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(200, json={"response": f"yanıt {len(calls)}", "done": True})
+
+    adapter = ollama_adapter({URL: handler}, cache_enabled=True, cache_dir=str(tmp_path))
+
+    async def main():
+        sampled = [await adapter.generate("m1", "selam", temperature=0.7) for _ in range(2)]
+        greedy = [await adapter.generate("m1", "selam", temperature=0) for _ in range(2)]
+        seeded = [await adapter.generate("m1", "selam", temperature=0.7, seed=7) for _ in range(2)]
+        return sampled, greedy, seeded
+
+    sampled, greedy, seeded = asyncio.run(main())
+    assert sampled == ["yanıt 1", "yanıt 2"]
+    assert greedy == ["yanıt 3", "yanıt 3"]
+    assert seeded == ["yanıt 4", "yanıt 4"]
+    assert len(calls) == 4
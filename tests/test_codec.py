@@ -0,0 +1,42 @@
+import io
+from datetime import datetime
+
+import pytest
+
+from src.utils import codec as codec_module
+from src.utils.codec import CODECS, JSONCodec, iter_items
+
+SAMPLE = {"başlık": "Görev", "sayı": 3, "liste": [1, 2.5, None, True], "iç": {"ğüşıöç": "ĞÜŞİÖÇ"}}
+INSTALLED = [name for name in CODECS if name == "json" or getattr(codec_module, name) is not None]
+
+
+def test_missing_codec_falls_back_to_json(monkeypatch, capsys):
+    monkeypatch.setattr(codec_module, "orjson", None)
+    monkeypatch.setattr(codec_module, "msgspec", None)
+
+    assert JSONCodec("auto").name == "json"
+    fallback = JSONCodec("orjson")
+    assert fallback.name == "json"
+    assert "[WARN] orjson kurulu değil" in capsys.readouterr().out
+    assert fallback.loads(fallback.dumps(SAMPLE)) == SAMPLE
+    with pytest.raises(ValueError):
+        JSONCodec("yaml")
+
+
+@pytest.mark.parametrize("name", INSTALLED)
+def test_installed_codecs_write_the_same_json(name):
+    current, reference = JSONCodec(name), JSONCodec("json")
+    encoded = current.dumps(SAMPLE, sort_keys=True)
+    assert encoded == reference.dumps(SAMPLE, sort_keys=True)
+    assert "ğüşıöç".encode("utf-8") in encoded
+    assert current.loads(encoded.decode("utf-8")) == reference.loads(encoded) == SAMPLE
+    moment = datetime(2024, 1, 2, 3, 4, 5)
+    assert current.loads(current.dumps({"zaman": moment, "küme": (1, 2)})) == {"zaman": moment.isoformat(), "küme": [1, 2]}
+
+
+def test_iter_items_streams_objects_and_arrays_across_chunks():
+    data = {f"görev{i}": {"id": i, "metin": "x" * i, "sayı": 12345} for i in range(50)}
+    text = JSONCodec("json").dumps_str(data)
+    assert dict(iter_items(io.StringIO(text), chunk_size=7)) == data
+    assert list(iter_items(io.StringIO(" [10, 2.5, {\"a\": []}] "), chunk_size=3)) == [(0, 10), (1, 2.5), (2, {"a": []})]
+    assert list(iter_items(io.StringIO("{}"))) == []
@@ -0,0 +1,69 @@
+import httpx
+
+from src.models.task import Task
+from src.team_manager import TeamManager
+from src.utils.frozen import FrozenValue
+
+OLLAMA_URL = "http://ollama"
+RESULT = "uzun sonuç metni " * 500
+
+
+def ollama_handler(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, json={"models": [{"name": "m1:latest"}]})
+
+
+def completed_task():
+    task = Task("Görev", "açıklama", "t1")
+    task.status = "completed"
+    task.result = RESULT
+    task.subtask_results = {"s1": "alt sonuç " * 300}
+    task.iterations = [{"feedback": "geri bildirim " * 200, "result": RESULT}]
+    task.team_evaluation = {"puan": 7}
+    return task
+
+
+def test_freeze_thaw_round_trip_keeps_task_data():
+    task = completed_task()
+    expected = task.to_dict()
+
+    assert task.freeze(min_bytes=1024) == 3
+    stats = task.frozen_stats()
+    assert stats["fields"] == 3 and stats["bytes"] < stats["raw_bytes"]
+    # Küçük alan sıkıştırılmaz; dondurulmuş alanlar öznitelikte açılmadan kaydedilir
+    assert not isinstance(task.__dict__["_team_evaluation"], FrozenValue)
+    assert task.to_dict() == expected
+    assert task.frozen_stats() == stats
+
+    # Metin her okumada açılır ama sıkıştırılmış kalır
+    assert task.result == RESULT
+    assert isinstance(task.__dict__["_result"], FrozenValue)
+
+
+def test_thawed_collections_accept_mutations_until_refrozen():
+    task = completed_task()
+    task.freeze(min_bytes=1024)
+    task.iterations.append({"feedback": "yeni"})
+    task.subtask_results["s2"] = "ek"
+
+    assert task.frozen_stats()["fields"] == 1
+    assert task.iterations[-1] == {"feedback": "yeni"}
+    assert task.freeze(min_bytes=1024) == 2
+    assert task.iterations[-1] == {"feedback": "yeni"} and task.subtask_results["s2"] == "ek"
+    assert Task("Görev", "açıklama", "t1").freeze(min_bytes=0) == 0
+
+
+def test_completed_tasks_are_frozen_and_reload_intact(monkeypatch, tmp_path, ollama_adapter):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("PERSIST_INTERVAL_SECONDS", "0")
+    adapter = ollama_adapter({OLLAMA_URL: ollama_handler})
+    manager = TeamManager(adapter)
+    task_id = manager.create_task("Görev", "açıklama", manager.create_team("Takım", "açıklama"))
+    manager.complete_task(task_id, RESULT)
+    manager.flush()
+
+    task = manager.tasks[task_id]
+    assert task.frozen_stats()["fields"] == 1
+    reloaded = TeamManager(adapter).tasks[task_id]
+    assert reloaded.frozen_stats()["fields"] == 1
+    assert reloaded.result == RESULT
+    assert reloaded.to_dict() == task.to_dict()
@@ -0,0 +1,84 @@
+import os
+
+from src.models.task import Task
+from src.utils import codec
+from src.utils.journal import TaskJournal
+
+
+def make_journal(tmp_path, **options):
+    return TaskJournal(
+        wal_path=str(tmp_path / "tasks.wal"),
+        snapshot_path=str(tmp_path / "tasks.json"),
+        **options
+    )
+
+
+def wal_records(journal):
+    with open(journal.wal_path, "rb") as f:
+        return [codec.loads(line) for line in f if line.strip()]
+
+
+def test_sync_writes_only_changes_of_given_tasks(tmp_path):
+    journal = make_journal(tmp_path)
+    first, second = Task("Bir", "açıklama", "t1"), Task("İki", "açıklama", "t1")
+    journal.sync({first.id: first, second.id: second})
+
+    first.status = "in_progress"
+    first.add_subtask("s1", "Alt", "açıklama")
+    first.add_document("Doküman", "içerik")
+    second.status = "failed"
+    # Yalnızca değiştiği bildirilen görev karşılaştırılır; diğeri silinmiş sayılmaz
+    journal.sync({first.id: first}, complete=False)
+
+    records = wal_records(journal)[2:]
+    assert {record["id"] for record in records} == {first.id}
+    assert [record["op"] for record in records] == ["set", "add", "item"]
+    assert "subtasks" not in records[0]["fields"] and "documents" not in records[0]["fields"]
+
+    tasks = make_journal(tmp_path).load()
+    assert tasks[first.id] == first.to_dict()
+    assert tasks[second.id]["status"] == "new"
+
+
+def test_wal_replays_on_top_of_compacted_snapshot(tmp_path):
+    journal = make_journal(tmp_path)
+    kept, removed = Task("Kalan", "açıklama", "t1"), Task("Silinen", "açıklama", "t1")
+    journal.sync({kept.id: kept, removed.id: removed})
+    kept.progress = 50
+    journal.sync({kept.id: kept}, complete=False)
+    journal.compact()
+    assert os.path.getsize(journal.wal_path) == 0
+
+    # Sıkıştırmadan sonraki değişiklikler ve silme yalnızca WAL'da
+    kept.progress = 100
+    kept.result = "sonuç"
+    journal.sync({kept.id: kept}, complete=False)
+    journal.delete([removed.id])
+    added = Task("Yeni", "açıklama", "t1")
+    journal.sync({added.id: added}, complete=False)
+
+    reopened = make_journal(tmp_path)
+    assert reopened.load() == {kept.id: kept.to_dict(), added.id: added.to_dict()}
+    assert [task["id"] for task in reopened.iter_tasks()] == [kept.id, added.id]
+
+    # Diskteki halden sıkıştırma aynı sonucu verir
+    reopened.compact()
+    assert make_journal(tmp_path).load() == {kept.id: kept.to_dict(), added.id: added.to_dict()}
+
+
+def test_interrupted_compaction_and_torn_tail_are_safe(tmp_path):
+    journal = make_journal(tmp_path)
+    task = Task("Görev", "açıklama", "t1")
+    journal.sync({task.id: task})
+    task.status = "completed"
+    journal.sync({task.id: task}, complete=False)
+    wal = open(journal.wal_path, "rb").read()
+
+    journal.compact()
+    # Anlık görüntü yazıldıktan sonra WAL boşaltılmadan kesilmiş gibi
+    with open(journal.wal_path, "wb") as f:
+        f.write(wal + b'{"op": "set", "id"')
+
+    reopened = make_journal(tmp_path)
+    assert reopened.load() == {task.id: task.to_dict()}
+    assert reopened.counters["corrupt"] == 1
@@ -0,0 +1,92 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src.team_manager import TeamManager
+
+OLLAMA_URL = "http://ollama"
+
+
+def ollama_handler(request: httpx.Request) -> httpx.Response:
+    if request.url.path == "/api/tags":
+        return httpx.Response(200, json={"models": [{"name": "m1:latest"}]})
+    if request.url.path == "/api/chat":
+        return httpx.Response(200, json={"message": {"role": "assistant", "content": "Tamam."}, "done": True})
+    return httpx.Response(200, json={"response": "Tamam.", "done": True})
+
+
+@pytest.fixture
+def lazy_env(monkeypatch, tmp_path):
+    """Her yazımda görevlerin bellekten atıldığı tembel yüklemeli sharded depo"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("STORAGE_BACKEND", "sharded")
+    monkeypatch.setenv("TASK_LAZY_LOAD", "True")
+    monkeypatch.setenv("TASK_CACHE_MAX_BYTES", "1")
+    monkeypatch.setenv("TASK_CACHE_IDLE_SECONDS", "0")
+    monkeypatch.setenv("TASK_LOG_BUFFER_SIZE", "5")
+    # Yazımlar (ve bellekten atmalar) her değişiklikte hemen yapılır
+    monkeypatch.setenv("PERSIST_INTERVAL_SECONDS", "0")
+
+
+def test_running_task_is_not_evicted(lazy_env, ollama_adapter):
+    adapter = ollama_adapter({OLLAMA_URL: ollama_handler})
+
+    async def run():
+        manager = TeamManager(adapter)
+        team_id = manager.create_team("Takım", "açıklama")
+        manager.add_agent_to_team(team_id, "Lider", "leader", "m1")
+        manager.add_agent_to_team(team_id, "Test", "tester", "m1")
+        task_id = manager.create_task("Görev", "açıklama", team_id)
+        held = manager.tasks[task_id]
+        await manager.execute_task(task_id)
+        manager.flush()
+        return manager, task_id, held
+
+    _, task_id, held = asyncio.run(run())
+    assert held.status == "completed"
+
+    # Çalışma sırasında görev atılsaydı sonraki değişiklikler kopuk nesnede kalırdı
+    reloaded = TeamManager(adapter)
+    assert reloaded.storage.load_task(task_id)["log_count"] == reloaded.storage.count_logs(task_id) == held.logs.total
+    assert reloaded.tasks[task_id].to_dict() == held.to_dict()
+
+
+def test_mutation_after_eviction_survives_reload(lazy_env, ollama_adapter):
+    adapter = ollama_adapter({OLLAMA_URL: ollama_handler})
+    manager = TeamManager(adapter)
+    team_id = manager.create_team("Takım", "açıklama")
+    task_id = manager.create_task("Görev", "açıklama", team_id)
+    manager.complete_task(task_id, "sonuç")
+    manager.flush()
+    assert manager.tasks.stats()["resident"] == 0
+
+    # Atılan görev yeniden yüklenir, değişiklik yeni nesneye yazılır
+    manager.upload_document(task_id, "not", "içerik")
+    manager.flush()
+
+    reloaded = TeamManager(adapter)
+    assert [document["title"] for document in reloaded.list_documents(task_id)] == ["not"]
+    assert reloaded.tasks[task_id].status == "completed"
+
+
+def test_iteration_and_evaluation_survive_reload(lazy_env, ollama_adapter):
+    adapter = ollama_adapter({OLLAMA_URL: ollama_handler})
+    manager = TeamManager(adapter)
+    team_id = manager.create_team("Takım", "açıklama")
+    manager.add_agent_to_team(team_id, "Lider", "leader", "m1")
+    task_id = manager.create_task("Görev", "açıklama", team_id)
+    manager.complete_task(task_id, "ilk sonuç")
+    document_id = manager.upload_document(task_id, "not", "içerik")
+
+    async def run():
+        await manager.iterate_task(task_id, "geliştir")
+        await manager.evaluate_document(task_id, document_id)
+
+    asyncio.run(run())
+    manager.flush()
+
+    reloaded = TeamManager(adapter).tasks[task_id]
+    assert [iteration["new_result"] for iteration in reloaded.iterations] == ["Tamam."]
+    assert reloaded.result == "Tamam."
+    assert list(reloaded.document_evaluations) == [document_id]
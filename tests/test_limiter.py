@@ -0,0 +1,54 @@
+import asyncio
+
+import pytest
+
+from src.models.errors import ModelOverloadedError
+from src.models.limiter import ModelConcurrencyLimiter
+
+
+def test_full_queue_rejects_immediately_with_429():
+    limiter = ModelConcurrencyLimiter(default_limit=1, max_queue=0)
+
+    async def main():
+        async with limiter.acquire("m1"):
+            with pytest.raises(ModelOverloadedError) as info:
+                async with limiter.acquire("m1"):
+                    pass
+        return info.value
+
+    error = asyncio.run(main())
+    assert error.status_code == 429
+    assert error.retry_after is not None
+    stats = limiter.stats()["m1:latest"]
+    assert stats["rejected"] == 1
+    assert stats["admitted"] == 1
+    assert stats["active"] == 0
+
+
+def test_queue_timeout_rejects_waiting_call():
+    limiter = ModelConcurrencyLimiter(default_limit=1, max_queue=4, queue_timeout=0.01)
+
+    async def main():
+        async with limiter.acquire("m1"):
+            with pytest.raises(ModelOverloadedError):
+                async with limiter.acquire("m1"):
+                    pass
+
+    asyncio.run(main())
+    stats = limiter.stats()["m1:latest"]
+    assert stats["rejected"] == 1
+    assert stats["queue_depth"] == 0
+
+
+def test_tag_variants_share_one_slot():
+    limiter = ModelConcurrencyLimiter(default_limit=4, model_limits={"m1": 1}, max_queue=0)
+
+    async def main():
+        async with limiter.acquire("m1:latest"):
+            with pytest.raises(ModelOverloadedError):
+                async with limiter.acquire("m1"):
+                    pass
+
+    asyncio.run(main())
+    assert list(limiter.stats()) == ["m1:latest"]
+    assert limiter.stats()["m1:latest"]["limit"] == 1
@@ -0,0 +1,68 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from src.models.errors import LLMConnectionError
+
+URL = "http://ollama-a"
+
+
+def ndjson(*chunks) -> bytes:
+    return b"".join(json.dumps(chunk).encode() + b"\n" for chunk in chunks)
+
+
+class BrokenStream(httpx.AsyncByteStream):
+    """Birkaç satır gönderdikten sonra bağlantısı kopan yanıt gövdesi"""
+
+    def __init__(self, data: bytes):
+        self.data = data
+
+    async def __aiter__(self):
+        yield self.data
+        raise httpx.ReadError("bağlantı koptu")
+
+
+def test_stream_emits_tokens_once(ollama_adapter):
+    def handler(request):
+        body = ndjson({"response": "Mer"}, {"response": "haba"}, {"response": "", "done": True, "eval_count": 2})
+        return httpx.Response(200, content=body)
+
+    adapter = ollama_adapter({URL: handler})
+    tokens = []
+    result = asyncio.run(adapter.generate("m1", "selam", stream=True, on_token=tokens.append))
+    assert result == "Merhaba"
+    assert tokens == ["Mer", "haba"]
+
+
+def test_stream_broken_after_tokens_is_not_retried(ollama_adapter):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(200, stream=BrokenStream(ndjson({"response": "Mer"})))
+
+    adapter = ollama_adapter({URL: handler})
+    tokens = []
+    with pytest.raises(LLMConnectionError):
+        asyncio.run(adapter.generate("m1", "selam", stream=True, on_token=tokens.append))
+    assert len(calls) == 1
+    assert tokens == ["Mer"]
+
+
+def test_stream_broken_before_tokens_is_retried(ollama_adapter):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            raise httpx.ConnectError("bağlantı reddedildi")
+        return httpx.Response(200, content=ndjson({"response": "tamam", "done": True}))
+
+    adapter = ollama_adapter({URL: handler})
+    tokens = []
+    result = asyncio.run(adapter.generate("m1", "selam", stream=True, on_token=tokens.append))
+    assert result == "tamam"
+    assert tokens == ["tamam"]
+    assert len(calls) == 2
@@ -0,0 +1,190 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from conftest import mock_client
+from src.models.errors import LLMConnectionError, LLMResponseError, LLMTimeoutError, ModelNotFoundError
+from src.models.llm_backend import BackendRouter
+from src.models.openai_compat import OpenAICompatAdapter, OpenAICompatConfig
+from src.models.profiles import GenerationProfile
+from src.models.tracing import Tracer
+
+BASE_URL = "http://llama-cpp/v1"
+OLLAMA_URL = "http://ollama-a"
+
+
+def openai_adapter(handler, **config) -> OpenAICompatAdapter:
+    settings = dict(base_url=BASE_URL, name="llamacpp", retry_backoff_base=0.0, retry_backoff_max=0.0, embed_cache_dir=None)
+    settings.update(config)
+    adapter = OpenAICompatAdapter(OpenAICompatConfig(**settings), tracer=Tracer(sink=None))
+    adapter.client = mock_client(BASE_URL, handler)
+    return adapter
+
+
+def sse(*chunks) -> bytes:
+    lines = [f"data: {json.dumps(chunk)}\n\n" for chunk in chunks]
+    return ("".join(lines) + "data: [DONE]\n\n").encode()
+
+
+def completion(text, prompt_tokens=5, completion_tokens=2):
+    return {
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": text}}],
+        "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens},
+    }
+
+
+def test_chat_completions_request_mapping():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json=completion("merhaba"))
+
+    adapter = openai_adapter(handler)
+    profile = GenerationProfile(name="test", num_predict=64, temperature=0.2, stop=["###"], seed=7)
+    usage = []
+    result = asyncio.run(adapter.generate("qwen", "selam", system_prompt="kısa yaz", profile=profile, on_usage=usage.append))
+
+    assert result == "merhaba"
+    request = requests[0]
+    assert request.url.path == "/v1/chat/completions"
+    body = json.loads(request.content)
+    assert body["model"] == "qwen"
+    assert body["messages"] == [{"role": "system", "content": "kısa yaz"}, {"role": "user", "content": "selam"}]
+    assert body["max_tokens"] == 64
+    assert body["temperature"] == 0.2
+    assert body["stop"] == ["###"]
+    assert body["seed"] == 7
+    assert body["stream"] is False
+    assert "num_ctx" not in body and "options" not in body
+    assert usage[0]["prompt_tokens"] == 5 and usage[0]["completion_tokens"] == 2
+
+
+def test_sse_stream_parsing():
+    def handler(request):
+        body = json.loads(request.content)
+        assert body["stream"] is True
+        assert body["stream_options"] == {"include_usage": True}
+        content = sse(
+            {"choices": [{"delta": {"role": "assistant"}}]},
+            {"choices": [{"delta": {"content": "Mer"}}]},
+            {"choices": [{"delta": {"content": "haba"}}]},
+            {"choices": [], "usage": {"prompt_tokens": 3, "completion_tokens": 2}},
+        )
+        return httpx.Response(200, content=b": keepalive\n\n" + content, headers={"content-type": "text/event-stream"})
+
+    adapter = openai_adapter(handler)
+    tokens = []
+    usage = []
+    result = asyncio.run(adapter.generate("qwen", "selam", stream=True, on_token=tokens.append, on_usage=usage.append))
+    assert result == "Merhaba"
+    assert tokens == ["Mer", "haba"]
+    assert usage[0]["completion_tokens"] == 2
+
+    async def collect():
+        return [token async for token in adapter.generate_stream("qwen", "selam")]
+
+    assert asyncio.run(collect()) == ["Mer", "haba"]
+
+
+def test_error_inside_stream_raises_typed_error():
+    def handler(request):
+        return httpx.Response(200, content=sse({"error": {"message": "model 'yok' not found"}}))
+
+    adapter = openai_adapter(handler)
+    with pytest.raises(ModelNotFoundError):
+        asyncio.run(adapter.generate("yok", "selam", stream=True))
+
+
+@pytest.mark.parametrize("response,error_type", [
+    (httpx.Response(404, json={"error": {"message": "model not found"}}), ModelNotFoundError),
+    (httpx.Response(400, json={"error": {"message": "bad request"}}), LLMResponseError),
+    (httpx.Response(503, json={"error": {"message": "overloaded"}}), LLMResponseError),
+])
+def test_http_errors_map_to_llm_errors(response, error_type):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return response
+
+    adapter = openai_adapter(handler)
+    with pytest.raises(error_type) as info:
+        asyncio.run(adapter.generate("qwen", "selam"))
+    # Yalnızca sunucu tarafı hatalar tekrar denenir
+    assert len(calls) == (3 if info.value.retryable else 1)
+
+
+@pytest.mark.parametrize("exception,error_type", [
+    (httpx.ConnectError("bağlantı reddedildi"), LLMConnectionError),
+    (httpx.ReadTimeout("zaman aşımı"), LLMTimeoutError),
+])
+def test_transport_errors_map_to_llm_errors(exception, error_type):
+    def handler(request):
+        raise exception
+
+    adapter = openai_adapter(handler, retry_attempts=1)
+    with pytest.raises(error_type):
+        asyncio.run(adapter.generate("qwen", "selam"))
+
+
+def test_stream_broken_after_tokens_is_not_retried():
+    calls = []
+
+    class BrokenStream(httpx.AsyncByteStream):
+        async def __aiter__(self):
+            yield b'data: {"choices": [{"delta": {"content": "Mer"}}]}\n\n'
+            raise httpx.ReadError("bağlantı koptu")
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(200, stream=BrokenStream())
+
+    adapter = openai_adapter(handler)
+    tokens = []
+    with pytest.raises(LLMConnectionError):
+        asyncio.run(adapter.generate("qwen", "selam", stream=True, on_token=tokens.append))
+    assert tokens == ["Mer"]
+    assert len(calls) == 1
+
+
+def test_router_selects_backend_per_agent(ollama_adapter):
+    seen = {}
+
+    def ollama_handler(request):
+        seen["ollama"] = json.loads(request.content)["model"]
+        return httpx.Response(200, json={"response": "ollama yanıtı", "done": True})
+
+    def openai_handler(request):
+        seen["llamacpp"] = json.loads(request.content)["model"]
+        return httpx.Response(200, json=completion("llama.cpp yanıtı"))
+
+    default = ollama_adapter({OLLAMA_URL: ollama_handler})
+    router = BackendRouter(default, {"llamacpp": openai_adapter(openai_handler)})
+
+    assert router.get(None) is default
+    assert router.get("") is default
+    assert router.get("ollama") is default
+    assert router.get("llamacpp").name == "llamacpp"
+    with pytest.raises(ValueError):
+        router.get("vllm")
+
+    async def run():
+        return (
+            await router.get(None).generate("llama3.2", "selam"),
+            await router.get("llamacpp").generate("qwen2.5", "selam"),
+        )
+
+    assert asyncio.run(run()) == ("ollama yanıtı", "llama.cpp yanıtı")
+    assert seen == {"ollama": "llama3.2", "llamacpp": "qwen2.5"}
+
+
+def test_router_from_env_adds_openai_backend(monkeypatch, ollama_adapter):
+    monkeypatch.setenv("OPENAI_COMPAT_BASE_URL", BASE_URL)
+    monkeypatch.setenv("OPENAI_COMPAT_NAME", "vllm")
+    default = ollama_adapter({OLLAMA_URL: lambda request: httpx.Response(200)})
+    router = BackendRouter.from_env(default)
+    assert router.names() == ["ollama", "vllm"]
+    assert router.get("vllm").config.base_url == BASE_URL
@@ -0,0 +1,94 @@
+import asyncio
+import threading
+
+from src.utils.persistence import DebouncedWriter, Snapshot, list_identity
+
+
+class Record:
+    def __init__(self):
+        self.items = []
+        self.meta = {"count": 0}
+
+    def to_dict(self):
+        return {"items": self.items, "meta": self.meta}
+
+
+def test_snapshot_copies_data_and_keeps_list_identity():
+    record = Record()
+    record.items.append({"n": 1})
+    snapshot = Snapshot(record)
+    record.items.append({"n": 2})
+    record.meta["count"] = 5
+
+    assert snapshot.items == [{"n": 1}]
+    assert snapshot.to_dict()["meta"] == {"count": 0}
+    assert list_identity(snapshot, "items") == list_identity(record, "items")
+    record.items = []
+    assert list_identity(snapshot, "items") != list_identity(record, "items")
+
+
+def test_snapshot_taken_on_loop_thread_and_written_in_background():
+    data = {"a": 1}
+    captured_on = []
+    written = []
+    release = threading.Event()
+
+    def snapshot():
+        captured_on.append(threading.get_ident())
+        return dict(data)
+
+    def write(copy):
+        release.wait(5)
+        written.append((threading.get_ident(), copy))
+
+    writer = DebouncedWriter({"data": write}, {"data": snapshot}, interval_seconds=0.01)
+
+    async def main():
+        writer.mark_dirty("data")
+        await asyncio.sleep(0.1)
+        # Yazıcı kopyayı yazarken canlı veri değişir
+        for i in range(1000):
+            data[f"key{i}"] = i
+        release.set()
+        assert writer.flush(5)
+
+    asyncio.run(main())
+    writer.close()
+    assert captured_on == [threading.get_ident()]
+    assert len(written) == 1
+    thread_id, copy = written[0]
+    assert thread_id != threading.get_ident()
+    assert copy == {"a": 1}
+
+
+def test_marks_without_loop_are_captured_on_flush():
+    data = []
+    written = []
+    writer = DebouncedWriter({"data": written.append}, {"data": lambda: list(data)}, interval_seconds=60)
+    data.append(1)
+    writer.mark_dirty("data")
+    assert writer.is_pending("data")
+    data.append(2)
+    assert writer.flush(5)
+    writer.close()
+    assert written == [[1, 2]]
+    assert not writer.is_pending("data")
+
+
+def test_failed_write_is_retried_with_fresh_snapshot():
+    data = [1]
+    written = []
+
+    def write(copy):
+        if not written:
+            written.append(None)
+            raise OSError("disk dolu")
+        written.append(copy)
+
+    writer = DebouncedWriter({"data": write}, {"data": lambda: list(data)}, interval_seconds=0.01)
+    writer.mark_dirty("data")
+    data.append(2)
+    assert writer.flush(5)
+    writer.close()
+    assert written == [None, [1, 2]]
+    assert writer.counters["errors"] == 1
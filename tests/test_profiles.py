@@ -0,0 +1,29 @@
+import pytest
+
+from src.models.profiles import is_ui_role, profile_for_role
+
+
+@pytest.mark.parametrize("role", ["ui", "ui_designer", "UX/UI uzmanı", "frontend ui", "designer"])
+def test_ui_roles(role):
+    assert profile_for_role(role).name == "ui"
+
+
+@pytest.mark.parametrize("role", ["builder", "build engineer", "guide", "quality"])
+def test_roles_containing_ui_letters_are_not_ui(role):
+    assert profile_for_role(role).name != "ui"
+
+
+@pytest.mark.parametrize("role,name", [
+    ("team lead", "leader"),
+    ("backend developer", "developer"),
+    ("software architect", "architect"),
+    ("tester", "tester"),
+    ("analyst", "reviewer"),
+])
+def test_keyword_roles(role, name):
+    assert profile_for_role(role).name == name
+
+
+@pytest.mark.parametrize("role,expected", [("UX araştırmacısı", True), ("ui developer", True), ("linux admin", False), ("build", False)])
+def test_is_ui_role(role, expected):
+    assert is_ui_role(role) is expected
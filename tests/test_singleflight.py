@@ -0,0 +1,95 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src.models.singleflight import SingleFlight
+
+URL = "http://ollama"
+
+
+def test_cancelled_leader_does_not_cancel_shared_call():
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def upstream():
+        await release.wait()
+        return "sonuç"
+
+    async def main():
+        leader = asyncio.ensure_future(flight.do("k", upstream))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.do("k", upstream))
+        await asyncio.sleep(0)
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(main()) == ("sonuç", True)
+    assert flight.counters == {"leaders": 1, "coalesced": 1, "abandoned": 0}
+
+
+def test_last_waiter_cancelling_abandons_upstream():
+    flight = SingleFlight()
+    cancelled = []
+
+    async def upstream():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def main():
+        waiters = [asyncio.ensure_future(flight.do("k", upstream)) for _ in range(2)]
+        await asyncio.sleep(0)
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        await asyncio.sleep(0)
+
+    asyncio.run(main())
+    assert cancelled == [True]
+    assert flight.counters["abandoned"] == 1
+    assert flight.stats()["in_flight"] == 0
+
+
+def slow_handler(calls):
+    async def handler(request):
+        calls.append(request)
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json={"response": "Tamam.", "done": True, "eval_count": 3})
+
+    return handler
+
+
+def test_identical_calls_share_one_request_with_separate_spans(ollama_adapter):
+    calls = []
+    adapter = ollama_adapter({URL: slow_handler(calls)}, cache_enabled=False)
+
+    async def main():
+        return await asyncio.gather(*(adapter.generate("m1", "selam") for _ in range(3)))
+
+    assert asyncio.run(main()) == ["Tamam."] * 3
+    assert len(calls) == 1
+    records = list(adapter.tracer.recent)
+    assert len(records) == 3
+    assert sum(1 for record in records if record.get("coalesced")) == 2
+    leader = next(record for record in records if not record.get("coalesced"))
+    assert leader["backend"] == URL
+
+
+def test_streaming_calls_are_not_coalesced(ollama_adapter):
+    calls = []
+    adapter = ollama_adapter({URL: slow_handler(calls)}, cache_enabled=False)
+    tokens = [[], []]
+
+    async def main():
+        await asyncio.gather(*(adapter.generate("m1", "selam", stream=True, on_token=sink.append) for sink in tokens))
+
+    asyncio.run(main())
+    assert len(calls) == 2
+    assert tokens == [["Tamam."], ["Tamam."]]
@@ -0,0 +1,98 @@
+import httpx
+import pytest
+
+from src.team_manager import TeamManager
+from src.utils.storage import create_storage, migrate
+
+OLLAMA_URL = "http://ollama"
+BACKEND_NAMES = ("json", "sharded", "sqlite")
+
+
+def ollama_handler(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, json={"models": [{"name": "m1:latest"}]})
+
+
+@pytest.fixture
+def data_dir(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("PERSIST_INTERVAL_SECONDS", "0")
+    return tmp_path / "data"
+
+
+def populate(manager):
+    team_id = manager.create_team("Takım", "açıklama")
+    manager.add_agent_to_team(team_id, "Lider", "leader", "m1")
+    task_id = manager.create_task("Görev", "açıklama", team_id)
+    manager.add_subtask(task_id, "Alt görev açıklaması", title="Alt görev")
+    document_id = manager.upload_document(task_id, "Doküman", "içerik " * 100)
+    manager.complete_task(task_id, "sonuç")
+    manager.add_bug({"team_id": team_id, "title": "Hata", "status": "open"})
+    manager.add_message({"team_id": team_id, "content": "Merhaba"})
+    manager.flush()
+    return team_id, task_id, document_id
+
+
+def state(manager, team_id, task_id, document_id):
+    return {
+        # Ajan zaman damgaları yüklemede yeniden üretildiği için karşılaştırılmaz
+        "teams": {
+            key: {**team.to_dict(), "agents": [(agent.id, agent.name, agent.role, agent.model) for agent in team.agents]}
+            for key, team in manager.teams.items()
+        },
+        "tasks": {key: task.to_dict() for key, task in manager.tasks.items()},
+        "team_tasks": [task["id"] for task in manager.get_team_tasks(team_id)],
+        "bugs": manager.get_team_bugs(team_id),
+        "messages": manager.get_team_messages(team_id),
+        "document": manager.get_document(task_id, document_id),
+    }
+
+
+@pytest.mark.parametrize("backend", BACKEND_NAMES)
+def test_data_survives_reload(backend, data_dir, monkeypatch, ollama_adapter):
+    monkeypatch.setenv("STORAGE_BACKEND", backend)
+    adapter = ollama_adapter({OLLAMA_URL: ollama_handler})
+    manager = TeamManager(adapter)
+    ids = populate(manager)
+    expected = state(manager, *ids)
+    manager.storage.close()
+
+    reloaded = TeamManager(adapter)
+    assert state(reloaded, *ids) == expected
+    assert expected["document"]["content"] == "içerik " * 100
+    assert expected["team_tasks"] == [ids[1]]
+
+
+@pytest.mark.parametrize("source,target", [(a, b) for a in BACKEND_NAMES for b in BACKEND_NAMES if a != b])
+def test_migrate_copies_all_data(source, target, data_dir, monkeypatch, ollama_adapter):
+    monkeypatch.setenv("STORAGE_BACKEND", source)
+    adapter = ollama_adapter({OLLAMA_URL: ollama_handler})
+    manager = TeamManager(adapter)
+    ids = populate(manager)
+    expected = state(manager, *ids)
+    manager.storage.close()
+
+    source_storage, target_storage = create_storage(source, str(data_dir)), create_storage(target, str(data_dir))
+    try:
+        counts = migrate(source_storage, target_storage)
+    finally:
+        source_storage.close()
+        target_storage.close()
+    assert (counts["teams"], counts["tasks"], counts["bugs"], counts["messages"]) == (1, 1, 1, 1)
+
+    monkeypatch.setenv("STORAGE_BACKEND", target)
+    assert state(TeamManager(adapter), *ids) == expected
+
+
+def test_sharded_rewrites_only_changed_tasks(data_dir, monkeypatch, ollama_adapter):
+    monkeypatch.setenv("STORAGE_BACKEND", "sharded")
+    manager = TeamManager(ollama_adapter({OLLAMA_URL: ollama_handler}))
+    team_id = manager.create_team("Takım", "açıklama")
+    changed, untouched = (manager.create_task(title, "açıklama", team_id) for title in ("Bir", "İki"))
+    manager.flush()
+    untouched_path = data_dir / "tasks" / f"{untouched}.json"
+    before = untouched_path.stat().st_mtime_ns, manager.storage.counters["entity_writes"]
+
+    manager.complete_task(changed, "sonuç")
+    manager.flush()
+    assert untouched_path.stat().st_mtime_ns == before[0]
+    assert manager.storage.counters["entity_writes"] == before[1] + 1
@@ -0,0 +1,87 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src.team_manager import TeamManager
+from src.utils.task_logs import FileLogStore, TaskLog
+
+OLLAMA_URL = "http://ollama"
+
+
+def ollama_handler(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, json={"models": [{"name": "m1:latest"}]})
+
+
+def entries(start, stop):
+    return [{"message": f"log {i}"} for i in range(start, stop)]
+
+
+def test_ring_buffer_keeps_recent_entries_and_total():
+    sunk = []
+    log = TaskLog(maxlen=3)
+    log.bind("t1", lambda task_id, current: sunk.append(task_id))
+    log.extend(entries(0, 5))
+
+    assert len(log) == 5
+    assert [entry["message"] for entry in log] == ["log 2", "log 3", "log 4"]
+    assert log[-1] == {"message": "log 4"}
+    assert log.take_unsaved() == entries(0, 5) and log.take_unsaved() == []
+    assert sunk == ["t1"] * 5
+
+
+def test_file_store_pages_by_byte_cursor_and_skips_torn_tail(tmp_path):
+    store = FileLogStore(str(tmp_path))
+    store.append("t1", entries(0, 7))
+    page, cursor = store.read("t1", 0, 3)
+    assert page == entries(0, 3)
+    page, cursor = store.read("t1", cursor, 10)
+    assert page == entries(3, 7)
+
+    # Yazımı süren satır okunmaz; imleç tamamlanınca aynı yerden devam eder
+    with open(tmp_path / "t1.ndjson", "ab") as f:
+        f.write(b'{"message": "log')
+    assert store.read("t1", cursor, 10) == ([], cursor)
+    assert store.tail("t1", 2) == entries(5, 7)
+    with open(tmp_path / "t1.ndjson", "ab") as f:
+        f.write(b' 7"}\n')
+    assert store.read("t1", cursor, 10)[0] == entries(7, 8)
+    assert store.count("t1") == 8
+
+
+@pytest.mark.parametrize("backend", ("json", "sqlite"))
+def test_task_logs_are_paginated_and_survive_reload(backend, monkeypatch, tmp_path, ollama_adapter):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("STORAGE_BACKEND", backend)
+    monkeypatch.setenv("PERSIST_INTERVAL_SECONDS", "0")
+    monkeypatch.setenv("TASK_LOG_BUFFER_SIZE", "5")
+    adapter = ollama_adapter({OLLAMA_URL: ollama_handler})
+    manager = TeamManager(adapter)
+    task_id = manager.create_task("Görev", "açıklama", manager.create_team("Takım", "açıklama"))
+    task = manager.tasks[task_id]
+    start = len(task.logs)
+    task.logs.extend(entries(0, 25))
+
+    async def read_all(cursor=0):
+        pages = []
+        while True:
+            page = await manager.get_task_logs(task_id, cursor, 10)
+            pages.append(page["logs"])
+            cursor = page["next_cursor"]
+            if not page["has_more"]:
+                return pages, cursor
+
+    pages, cursor = asyncio.run(read_all())
+    logs = [entry for page in pages for entry in page][start:]
+    assert logs == entries(0, 25)
+    assert [len(page) for page in pages][-1] < 10
+
+    # Son imleç sonradan eklenen logları okur
+    task.logs.append({"message": "yeni"})
+    assert asyncio.run(manager.get_task_logs(task_id, cursor, 10))["logs"] == [{"message": "yeni"}]
+
+    manager.flush()
+    reloaded = TeamManager(adapter).tasks[task_id]
+    assert len(reloaded.logs) == start + 26
+    assert list(reloaded.logs) == entries(21, 25) + [{"message": "yeni"}]
+    assert reloaded.to_dict()["log_count"] == start + 26
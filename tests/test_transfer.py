@@ -0,0 +1,64 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src.team_manager import TeamManager
+from src.utils.transfer import gzip_lines, read_source
+
+OLLAMA_URL = "http://ollama"
+CONTENT = "doküman içeriği " * 200
+
+
+def ollama_handler(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, json={"models": [{"name": "m1:latest"}]})
+
+
+@pytest.fixture
+def adapter(monkeypatch, ollama_adapter):
+    monkeypatch.setenv("PERSIST_INTERVAL_SECONDS", "0")
+    return ollama_adapter({OLLAMA_URL: ollama_handler})
+
+
+def test_export_import_round_trip_replaces_data(adapter, monkeypatch, tmp_path):
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    monkeypatch.chdir(tmp_path / "a")
+    source = TeamManager(adapter)
+    team_id = source.create_team("Takım", "açıklama")
+    task_id = source.create_task("Görev", "açıklama", team_id)
+    document_id = source.upload_document(task_id, "Doküman", CONTENT)
+    source.complete_task(task_id, "sonuç")
+    source.add_bug({"team_id": team_id, "title": "Hata"})
+    export_path = tmp_path / "yedek.ndjson.gz"
+    export_path.write_bytes(b"".join(gzip_lines(asyncio.run(source.export_data()))))
+
+    # Dışa aktarılan dosya blob deposu olmadan okunabilir
+    records = list(read_source(str(export_path)))
+    assert [part for part, _ in records].count("tasks") == 1
+    exported_task = next(record for part, record in records if part == "tasks")
+    assert exported_task["documents"][0]["content"] == CONTENT
+
+    monkeypatch.chdir(tmp_path / "b")
+    monkeypatch.setenv("STORAGE_BACKEND", "sqlite")
+    target = TeamManager(adapter)
+    stale_team = target.create_team("Eski", "silinecek")
+    counts = asyncio.run(target.import_data(str(export_path)))
+    assert (counts["teams"], counts["tasks"], counts["bugs"]) == (1, 1, 1)
+    assert list(target.teams) == [team_id] and stale_team not in target.teams
+    assert target.tasks[task_id].result == "sonuç"
+    assert target.get_document(task_id, document_id)["content"] == CONTENT
+
+    # İçe aktarılan veri yeniden açılışta da aynıdır
+    target.flush()
+    reloaded = TeamManager(adapter)
+    assert reloaded.tasks[task_id].to_dict() == target.tasks[task_id].to_dict()
+    assert reloaded.get_team_bugs(team_id) == target.get_team_bugs(team_id)
+
+
+def test_import_is_refused_while_tasks_run(adapter, monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    manager = TeamManager(adapter)
+    manager.active_tasks["t1"] = {}
+    with pytest.raises(ValueError):
+        asyncio.run(manager.import_data(str(tmp_path / "yok.ndjson")))